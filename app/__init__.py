@@ -15,12 +15,14 @@ from flask_login import current_user
 from flask_wtf.csrf import generate_csrf
 
 from app.extensions import db
+from app.init.activity_index import setup_activity_index
 from app.init.admin_bootstrap import enforce_admin_bootstrap
 from app.init.base_url import setup_base_url
 from app.init.blueprints import register_blueprints
 # from app.init.config import configure_app - File was removed
 from app.init.context_processors import register_context_processors
 from app.init.database import setup_database
+from app.init.decrypt_cache import setup_decrypt_cache
 from app.init.errors import register_error_handlers
 from app.init.i18n import setup_i18n
 from app.init.login_manager import setup_login_manager
@@ -163,6 +165,8 @@ def create_app(config_overrides=None):
         setup_i18n(app)
         setup_base_url(app)
         setup_database(app)  # This now uses the imported db instance
+        setup_activity_index(app)
+        setup_decrypt_cache(app)
         configure_session(app)
         setup_login_manager(app)
         register_context_processors(app)
@@ -63,6 +63,28 @@ BACKUP_RETENTION_DAYS = 7
 TOKEN_EXPIRATION_SECONDS = 600
 PERMANENT_SESSION_LIFETIME = timedelta(days=7)
 
+# Cipher for new writes: "aesgcm" (compact "v2:" AES-256-GCM envelope) or
+# "fernet". Both are always readable; the re-encryption job converts old rows
+# and, after a key rotation (FERRET_KEYS_PREVIOUS), rows under an old key.
+ENCRYPTION_CIPHER = "aesgcm"
+REENCRYPT_BATCH_SIZE = 200  # Rows per column per run
+REENCRYPT_INTERVAL_MINUTES = 1
+REENCRYPT_THROTTLE_SECONDS = 0.05  # Pause between column batches
+REENCRYPT_CHECKPOINT_PATH = os.path.join(DATA_DIR, "reencrypt_checkpoint.json")
+
+# Decrypted field values are memoised per request / scheduler tick only
+DECRYPT_CACHE_MAX_ENTRIES = 512
+DECRYPT_CACHE_TTL_SECONDS = 60
+
+# system_config snapshot: reloaded at once after a local commit, and at least
+# this often so changes made by other workers are picked up
+SETTINGS_CACHE_TTL_SECONDS = 5
+
+# Per-user due check-in badge count: dropped at once by check-in, toggle and
+# edit routes in this process, recounted at least this often otherwise (items
+# fall due with time and the scheduler executes them)
+DUE_CHECKIN_CACHE_SECONDS = 30
+
 # ---------------------------------------------------------------------
 # SCHEDULER CONFIGURATION
 # ---------------------------------------------------------------------
@@ -73,6 +95,65 @@ SCHEDULER_REMINDER_INTERVAL_MINUTES = 10
 SCHEDULER_FILE_INTEGRITY_INTERVAL_MINUTES = 10
 SCHEDULER_VERSION_CHECK_INTERVAL_MINUTES = 60
 
+# Event-driven mode: arm a single one-shot wake-up at the earliest check-in,
+# expiry or reminder deadline instead of polling on the intervals above.
+SCHEDULER_EVENT_DRIVEN = True
+SCHEDULER_WAKEUP_MAX_SLEEP_MINUTES = 60  # Safety sweep when nothing is due sooner
+SCHEDULER_WAKEUP_RETRY_SECONDS = 30  # Back-off for items still overdue after a run
+SCHEDULER_CHECKIN_DIGEST = False  # Opt-in: one check-in reminder per user listing all due items
+
+# ---------------------------------------------------------------------
+# SCHEDULER DELIVERY CONFIGURATION
+# ---------------------------------------------------------------------
+DELIVERY_MAX_WORKERS = 8  # Global cap on concurrent outbound deliveries
+DELIVERY_MAX_PER_HOST = 2  # Concurrent deliveries to any single host
+DELIVERY_WEBHOOK_TIMEOUT_SECONDS = 5
+DELIVERY_APPRISE_TIMEOUT_SECONDS = 30
+DELIVERY_SMTP_TIMEOUT_SECONDS = 30
+
+# Ready-to-notify Apprise objects reused across deliveries (LRU)
+APPRISE_NOTIFIER_CACHE_MAX_ENTRIES = 128  # Cached destination sets
+APPRISE_NOTIFIER_CACHE_MAX_URLS = 512  # Parsed Apprise URLs held across all entries
+
+# Pooled SMTP connections, keyed by (host, port, username, TLS mode)
+SMTP_POOL_IDLE_SECONDS = 60  # Close connections unused for this long
+SMTP_POOL_MAX_MESSAGES = 100  # Recycle a connection after this many messages
+SMTP_POOL_NOOP_AFTER_SECONDS = 15  # NOOP-check connections idle longer than this
+SMTP_POOL_MAX_IDLE_PER_KEY = 4
+
+# ---------------------------------------------------------------------
+# OUTBOUND HTTP CONFIGURATION
+# ---------------------------------------------------------------------
+# Shared keep-alive session used for webhooks and API calls
+HTTP_POOL_CONNECTIONS = 10  # Hosts with a cached connection pool
+HTTP_POOL_MAXSIZE = 4  # Keep-alive connections kept per host
+HTTP_CONNECT_TIMEOUT_SECONDS = 5
+HTTP_READ_TIMEOUT_SECONDS = 10
+DELIVERY_WAIT_GRACE_SECONDS = 5  # Extra wait beyond the slowest timeout before giving up
+
+# Webhooks are fanned out on a single asyncio loop thread instead of the
+# delivery thread pool, so large fan-outs don't need one thread per request.
+WEBHOOK_ASYNC_ENABLED = True
+WEBHOOK_ASYNC_MAX_CONCURRENCY = 500  # In-flight webhook POSTs across all hosts
+WEBHOOK_ASYNC_MAX_PER_HOST = 16  # In-flight webhook POSTs to any single host
+WEBHOOK_ASYNC_MAX_IDLE_PER_HOST = 16  # Keep-alive connections kept per host
+WEBHOOK_ASYNC_IDLE_SECONDS = 30  # Drop keep-alive connections idle longer than this
+
+# Webhooks in batch mode collect events per endpoint for up to the linger time
+# and POST them as one JSON array of at most WEBHOOK_BATCH_MAX_SIZE items.
+WEBHOOK_BATCH_MAX_SIZE = 100
+WEBHOOK_BATCH_LINGER_SECONDS = 10
+
+# Durable outbox drained by its own job; failed sends retry with exponential
+# backoff (plus jitter) and are dead-lettered after OUTBOX_MAX_ATTEMPTS.
+OUTBOX_DRAIN_INTERVAL_SECONDS = 30
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE_SECONDS = 30
+OUTBOX_BACKOFF_MAX_SECONDS = 3600
+OUTBOX_LEASE_SECONDS = 300  # A claimed row is reclaimed after this if never finished
+OUTBOX_RETENTION_DAYS = 30  # Delivered rows are pruned after this
+
 # ---------------------------------------------------------------------
 # FILE UPLOAD VALIDATION
 # ---------------------------------------------------------------------
@@ -192,11 +273,70 @@ SUPPORTED_LANGUAGES = {
 # config.py
 LOG_FILE_PATH = os.environ.get("GRYLLI_LOG_FILE", os.path.join(PROJECT_ROOT, "data", "grylli.log"))
 
+# Log records are queued and written by one thread per process
+LOG_QUEUE_MAX_SIZE = 10000
+LOG_BATCH_MAX_RECORDS = 500  # Records written per flush, at most
+# When the queue is full: "block", "drop-debug" or "sample" (keep 1 in
+# LOG_QUEUE_SAMPLE_RATE records below WARNING). Never drops warnings or errors.
+LOG_QUEUE_OVERFLOW_POLICY = os.environ.get("LOG_QUEUE_OVERFLOW_POLICY", "drop-debug")
+LOG_QUEUE_SAMPLE_RATE = 10
+
+# Structured JSON-lines audit log (user actions, access, scheduler jobs) kept
+# alongside the human log; the activity index is backfilled from it
+AUDIT_LOG_ENABLED = os.environ.get("AUDIT_LOG_ENABLED", "true").lower() in ("true", "1", "yes")
+AUDIT_LOG_PATH = os.environ.get(
+    "GRYLLI_AUDIT_LOG_FILE", os.path.join(os.path.dirname(LOG_FILE_PATH), "grylli.audit.jsonl")
+)
+
 # Number of lines to display in the UI log viewer
 UI_LOG_LINE_LIMIT = 2000
 
-# Limit for scheduler log lines displayed in the UI
-SCHEDULER_LOG_DISPLAY_LIMIT = 1000
+# Log views read files backwards from EOF in blocks of this size
+LOG_READER_BLOCK_SIZE = 64 * 1024
+
+# Log rotation: segments past LOG_MAX_BYTES are gzipped in the background
+# (grylli.log.1.gz ... grylli.log.<LOG_BACKUP_COUNT>.gz), and searches run over
+# up to LOG_SEARCH_WORKERS segments at once
+LOG_MAX_BYTES = 10_000_000
+LOG_BACKUP_COUNT = 7
+LOG_SEARCH_WORKERS = 4
+
+# Gunicorn runs gthread workers: every request of the app shares these threads
+GUNICORN_THREADS = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# Live log tail (Server-Sent Events) in the admin Logs tab. Each viewer holds a
+# Gunicorn thread for as long as it watches, so viewers are capped to leave
+# LOG_STREAM_RESERVED_THREADS for normal traffic (with 4 or fewer threads the
+# live tail is off); lines a slow viewer cannot take beyond
+# LOG_STREAM_QUEUE_SIZE are dropped and reported
+LOG_STREAM_RESERVED_THREADS = 4
+LOG_STREAM_MAX_SUBSCRIBERS = max(0, min(4, GUNICORN_THREADS - LOG_STREAM_RESERVED_THREADS))
+LOG_STREAM_QUEUE_SIZE = 1000
+LOG_STREAM_BATCH_LINES = 200
+LOG_STREAM_POLL_SECONDS = 0.5
+LOG_STREAM_HEARTBEAT_SECONDS = 15
+
+# Dashboard Activity tab: entries per page, and how long the activity_events
+# index keeps them (the log files themselves rotate independently)
+ACTIVITY_PAGE_SIZE = 50
+ACTIVITY_RETENTION_DAYS = 90
+
+# Activity index writes run on their own thread, never on the log writer's.
+# Up to ACTIVITY_INDEX_QUEUE_SIZE batches wait while the database is busy; a
+# batch that still fails after ACTIVITY_INDEX_RETRY_ATTEMPTS (or finds the
+# queue full) leaves a marker, and that span is re-read from the audit log
+ACTIVITY_INDEX_QUEUE_SIZE = 1000
+ACTIVITY_INDEX_RETRY_ATTEMPTS = 5
+ACTIVITY_INDEX_RETRY_SECONDS = 0.5  # First retry delay, doubled each attempt
+ACTIVITY_RESYNC_INTERVAL_SECONDS = 60  # Between re-read attempts while a marker is set
+ACTIVITY_RESYNC_MARKER_PATH = os.path.join(DATA_DIR, "activity_resync")
+
+# Scheduler run ledger (scheduler_runs / scheduler_events) behind the admin
+# Scheduler Activity report
+SCHEDULER_RUNS_PAGE_SIZE = 50
+SCHEDULER_RUN_RETENTION_DAYS = 30
+SCHEDULER_EVENTS_MAX_PER_RUN = 200  # Further items in a run only update its counters
+SCHEDULER_TREND_DAYS = 7
 
 
 # config.py
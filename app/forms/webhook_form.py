@@ -52,6 +52,7 @@ class WebhookForm(FlaskForm):
         - endpoint: The webhook endpoint URL.
         - description: Optional longer description.
         - enabled: Checkbox for activating webhook.
+        - batch_mode: Checkbox for sending events as one JSON array per batch.
         - submit: Submit button ("Create Webhook").
     """
 
@@ -69,5 +70,8 @@ class WebhookForm(FlaskForm):
     # ---------------------- Enabled Field -----------------------------
     enabled = BooleanField(_l("Enabled"), default=True)
 
+    # ---------------------- Batch Mode Field --------------------------
+    batch_mode = BooleanField(_l("Batch delivery"), default=False)
+
     # ---------------------- Submit Button -----------------------------
     submit = SubmitField(_l("Create Webhook"))
@@ -0,0 +1,23 @@
+"""
+# ---------------------------------------------------------------------
+# activity_index.py
+# app/init/activity_index.py
+# Starts the per-user activity index fed by the log writer.
+# ---------------------------------------------------------------------
+"""
+
+from app.extensions import db
+from app.services.activity_index import start_activity_index
+from app.utils.logging import log_exception_with_traceback
+
+
+def setup_activity_index(app):
+    """
+    Backfill the activity_events table if needed and register it with the log
+    writer. Runs after setup_database(), once the table exists.
+    """
+    with app.app_context():
+        try:
+            start_activity_index(db.engine)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log_exception_with_traceback("Failed to start activity index", e)
@@ -8,16 +8,43 @@
 
 from flask import redirect, request, url_for
 from flask_login import current_user
-from sqlalchemy import text
 
-from app.extensions import db
+from app.utils.admin_presence import admin_exists
 from app.utils.logging import log_debug_message, log_error_message, log_info_message
 
+# Endpoints served whether or not an admin exists or the user is logged in
+ALLOWED_ROUTES = frozenset(
+    {
+        "auth.bootstrap",
+        "auth.forgot_username",
+        "auth.forgot_password",
+        "auth.reset_password",
+        "auth.signup",
+        "auth.activate_account",
+        "static",
+        "checkin.handle_checkin",
+        "locale.set_locale_post",
+        "locale.set_language",
+        "admin_help.help_page",
+        "mfa.mfa_challenge",
+        "status.health_and_version",
+        "auth.rate_limit_delay",
+        "meta.version_status",
+        "/locale.langcheck",
+        "pwa.manifest",
+        "csp_report.overview",
+        "assets.fonts_css",
+        "assets.serve_font",
+        "home.server_time",
+        "tools.log_js_error",
+        "meta.background_patterns",
+    }
+)
+
 
 def enforce_admin_bootstrap(app):
     """
     Add before_request hook for admin bootstrap/login enforcement.
-    DO NOT CHANGE FUNCTIONALITY OR ORDER—direct copy from create_app.
     """
 
     @app.before_request
@@ -26,52 +53,25 @@ def enforce_admin_bootstrap(app):
         log_debug_message(f"🧭 REQUEST PATH: {request.path}")
         log_debug_message(f"🧭 REQUEST ENDPOINT: {request.endpoint}")
 
-        allowed_routes = {
-            "auth.bootstrap",
-            "auth.forgot_username",
-            "auth.forgot_password",
-            "auth.reset_password",
-            "auth.signup",
-            "auth.activate_account",
-            "static",
-            "checkin.handle_checkin",
-            "locale.set_locale_post",
-            "locale.set_language",
-            "admin_help.help_page",
-            "mfa.mfa_challenge",
-            "status.health_and_version",
-            "auth.rate_limit_delay",
-            "meta.version_status",
-            "/locale.langcheck",
-            "pwa.manifest",
-            "csp_report.overview",
-            "assets.fonts_css",
-            "assets.serve_font",
-            "home.server_time",
-            "tools.log_js_error",
-            "meta.background_patterns",
-        }
+        # Assets, healthchecks and polling never need the database
+        if request.endpoint in ALLOWED_ROUTES:
+            log_debug_message(f"✅ Allowed route: {request.endpoint}")
+            return None
 
         try:
-            admin_count = db.session.execute(
-                text("SELECT COUNT(*) FROM users WHERE role = 'admin'")
-            ).scalar()
+            has_admin = admin_exists()
         except Exception as e:  # pylint: disable=broad-exception-caught
             log_error_message(f"❌ Admin bootstrap check failed: {e}")
             return "Internal server error", 500
 
-        if admin_count > 0:
-            allowed_routes |= {"auth.login"}
-            log_debug_message("🔓 Login route added to allowed_routes (admin exists).")
-
-        if request.endpoint in allowed_routes:
-            log_debug_message(f"✅ Allowed route: {request.endpoint}")
-            return None
-
-        if not admin_count:
+        if not has_admin:
             log_info_message("🚧 No admin present. Redirecting to bootstrap.")
             return redirect(url_for("auth.bootstrap"))
 
+        if request.endpoint == "auth.login":
+            log_debug_message("✅ Allowed route: auth.login (admin exists)")
+            return None
+
         if not current_user.is_authenticated:
             ip = request.remote_addr or "unknown IP"
             ua = request.user_agent.string or "unknown user-agent"
@@ -8,7 +8,7 @@
 
 from flask_login import current_user
 
-from app.services.settings import get_setting
+from app.services.settings import get_bool_setting
 from app.utils.locale import get_locale
 
 
@@ -34,9 +34,7 @@ def register_context_processors(app):
     @app.context_processor
     def inject_debug_mode():
         """Inject debug mode flag for template use."""
-        raw_value = get_setting("DEBUG")
-        debug_mode = raw_value.strip().lower() == "true"
-        return {"debug_mode": debug_mode}
+        return {"debug_mode": get_bool_setting("DEBUG")}
 
     @app.context_processor
     def inject_github_url():
@@ -8,6 +8,9 @@
 
 import os
 
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from flask_migrate import Migrate, upgrade
 from sqlalchemy import inspect, text
 
@@ -57,6 +60,15 @@ def setup_database(app):
                     raise
             else:
                 log_info_message("🛑 Skipping migrations — migrations folder or DB not found.")
+        elif os.path.exists(migrations_dir) and _has_pending_migrations(migrations_dir):
+            log_info_message("Database schema is behind the latest migration. Upgrading now...")
+            try:
+                upgrade()
+                log_info_message("✅ Pending migrations applied successfully.")
+            except Exception as e:
+                log_error_message("❌ Migration failed.")
+                log_exception_with_traceback("Migration error", exception=e)
+                raise
 
         # Seed system config from env if needed
         if "system_config" in tables and not os.environ.get("SKIP_SEEDING"):
@@ -70,3 +82,18 @@ def setup_database(app):
             log_info_message(
                 "⏭️ Skipping seeding — system_config table not found yet or SKIP_SEEDING is set."
             )
+
+
+def _has_pending_migrations(migrations_dir):
+    """
+    Return True if the database revision differs from the migration head.
+    """
+    config = Config(os.path.join(migrations_dir, "alembic.ini"))
+    config.set_main_option("script_location", migrations_dir)
+    head = ScriptDirectory.from_config(config).get_current_head()
+
+    with db.engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+
+    log_debug_message(f"Database revision: {current}, migration head: {head}")
+    return current != head
@@ -0,0 +1,17 @@
+"""
+# ---------------------------------------------------------------------
+# decrypt_cache.py
+# app/init/decrypt_cache.py
+# Per-request / per-tick decrypted-value memo teardown.
+# ---------------------------------------------------------------------
+"""
+
+from app.services.encryption import clear_decrypt_cache
+
+
+def setup_decrypt_cache(app):
+    """
+    Drop memoised plaintexts when each app context (request or scheduler tick)
+    is torn down.
+    """
+    app.teardown_appcontext(clear_decrypt_cache)
@@ -7,8 +7,10 @@
 """
 
 import hashlib
-from datetime import datetime, timezone
+import json
+from datetime import datetime, timedelta, timezone
 
+from dateutil.rrule import rrulestr
 from sqlalchemy import DateTime
 from sqlalchemy.sql import text
 from sqlalchemy.orm import validates
@@ -19,6 +21,61 @@ from app.forms.security_questions_form import SECURITY_QUESTION_CHOICES
 from app.services.encryption import decrypt, encrypt
 
 
+# ---------------------------------------------------------------------
+# Scheduler next-action phases
+# ---------------------------------------------------------------------
+NEXT_ACTION_CHECKIN = "checkin"  # check-in reminder is due at next_action_at
+NEXT_ACTION_EXPIRE = "expire"  # item executes at next_action_at unless checked in
+
+# ---------------------------------------------------------------------
+# Delivery outbox statuses
+# ---------------------------------------------------------------------
+OUTBOX_PENDING = "pending"  # waiting for next_attempt_at
+OUTBOX_IN_PROGRESS = "in_progress"  # claimed by a drain run until locked_until
+OUTBOX_SENT = "sent"
+OUTBOX_DEAD = "dead"  # gave up after max attempts
+
+
+def as_utc(value):
+    """Return a timezone-aware UTC datetime (SQLite hands back naive values)."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class CheckinScheduleMixin:
+    """
+    Shared next-action bookkeeping for check-in based items (Message, EmailMessage).
+
+    The scheduler only loads rows whose indexed `next_action_at` has passed, so any
+    change to the enabled flag, schedule, check-in or reminder/execution timestamps
+    must be followed by `refresh_next_action()` before committing.
+    """
+
+    def refresh_next_action(self):
+        """Recompute `next_action_at` / `next_action_phase` from the current state."""
+        if (
+            not self.is_enabled
+            or self.executed_at is not None
+            or not self.checkin_interval_minutes
+            or self.grace_period_minutes is None
+            or self.last_checkin is None
+        ):
+            self.next_action_at = None
+            self.next_action_phase = None
+            return
+
+        due_at = as_utc(self.last_checkin) + timedelta(minutes=self.checkin_interval_minutes)
+
+        if self.reminder_sent_at is None:
+            self.next_action_at = due_at
+            self.next_action_phase = NEXT_ACTION_CHECKIN
+        else:
+            grace = timedelta(minutes=self.grace_period_minutes)
+            self.next_action_at = max(as_utc(self.reminder_sent_at) + grace, due_at + grace)
+            self.next_action_phase = NEXT_ACTION_EXPIRE
+
+
 # ---------------------------------------------------------------------
 # System Configuration
 # ---------------------------------------------------------------------
@@ -38,6 +95,17 @@ class SystemConfig(db.Model):
         return f"<SystemConfig {self.key} (sensitive={self.is_sensitive})>"
 
 
+class SettingsVersion(db.Model):
+    """
+    Single-row counter bumped in the same transaction as every system_config
+    change, so each process can tell cheaply whether its settings cache is stale.
+    """
+
+    __tablename__ = "settings_version"
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
 # ---------------------------------------------------------------------
 # User Accounts
 # ---------------------------------------------------------------------
@@ -198,6 +266,13 @@ class AppriseURL(db.Model):
         default=lambda: datetime.now(timezone.utc),
         server_default=text("CURRENT_TIMESTAMP"),
     )
+    # Bumped on every change; versions cached Apprise notifiers for this destination
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=True,
+    )
 
     @property
     def url(self):
@@ -225,6 +300,8 @@ class Webhook(db.Model):
     _endpoint = db.Column("endpoint", db.Text, unique=True, nullable=False)
     description = db.Column(db.Text)
     enabled = db.Column(db.Boolean, default=True)
+    # Batch mode: events are aggregated per endpoint and POSTed as one JSON array
+    batch_mode = db.Column(db.Boolean, nullable=False, default=False, server_default=text("0"))
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     created_at = db.Column(
         db.DateTime(timezone=True),
@@ -246,12 +323,13 @@ class Webhook(db.Model):
 # ---------------------------------------------------------------------
 # Messages Table
 # ---------------------------------------------------------------------
-class Message(db.Model):
+class Message(CheckinScheduleMixin, db.Model):
     """
     Represents a standard user message with check-in, expiry, and notification options.
     """
 
     __tablename__ = "messages"
+    __table_args__ = (db.Index("ix_messages_user_id_next_action_at", "user_id", "next_action_at"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -285,6 +363,10 @@ class Message(db.Model):
     reminder_sent_at = db.Column(db.DateTime(timezone=True), nullable=True)
     is_enabled = db.Column(db.Boolean, nullable=False, default=False)
 
+    # Scheduler deadline, maintained by refresh_next_action()
+    next_action_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+    next_action_phase = db.Column(db.String(16), nullable=True)
+
     apprise_destinations = db.relationship(
         "AppriseURL", secondary="message_apprise_links", backref="messages"
     )
@@ -313,12 +395,15 @@ message_webhook_links = db.Table(
 # ---------------------------------------------------------------------
 # Secure Email Messages
 # ---------------------------------------------------------------------
-class EmailMessage(db.Model):
+class EmailMessage(CheckinScheduleMixin, db.Model):
     """
     Stores email message records that will be delivered to recipients.
     """
 
     __tablename__ = "email_messages"
+    __table_args__ = (
+        db.Index("ix_email_messages_user_id_next_action_at", "user_id", "next_action_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -372,6 +457,10 @@ class EmailMessage(db.Model):
     reminder_sent_at = db.Column(db.DateTime(timezone=True), nullable=True)
     is_enabled = db.Column(db.Boolean, nullable=False, default=False)
 
+    # Scheduler deadline, maintained by refresh_next_action()
+    next_action_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+    next_action_phase = db.Column(db.String(16), nullable=True)
+
     smtp_configs = db.relationship(
         "UserMailSettings", secondary="email_smtp_links", backref="linked_secure_emails"
     )
@@ -499,6 +588,9 @@ class Reminder(db.Model):
     # Enable/disable logic
     is_enabled = db.Column(db.Boolean, nullable=False, default=False)
 
+    # Scheduler deadline, maintained by refresh_next_run()
+    next_run_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+
     # Timestamps (timezone-aware replacements)
     created_at = db.Column(
         db.DateTime(timezone=True),
@@ -524,6 +616,38 @@ class Reminder(db.Model):
         "EmailMessage", secondary="reminder_email_links", backref="linked_reminders"
     )
 
+    def refresh_next_run(self):
+        """
+        Recompute `next_run_at` from the schedule and send history.
+        Past the end date or occurrence limit the deadline is left due, so the
+        scheduler picks the reminder up and disables it.
+        """
+        if not self.is_enabled or not self.start_at:
+            self.next_run_at = None
+            return
+
+        start_at = as_utc(self.start_at)
+        end_at = as_utc(self.end_at)
+        last_sent_at = as_utc(self.last_sent_at)
+
+        if self.max_occurrences and (self.occurrences_sent or 0) >= self.max_occurrences:
+            self.next_run_at = last_sent_at or start_at
+            return
+
+        if self.recurrence_rule:
+            rule = rrulestr(self.recurrence_rule, dtstart=start_at)
+            if last_sent_at:
+                next_run = rule.after(last_sent_at, inc=False)
+            else:
+                next_run = rule.after(start_at, inc=True)
+        else:
+            next_run = None if last_sent_at else start_at
+
+        if next_run and end_at and next_run > end_at:
+            next_run = end_at
+
+        self.next_run_at = next_run
+
     def __repr__(self):
         return f"<Reminder {self.label} (start: {self.start_at}, recur: {self.recurrence_rule})>"
 
@@ -556,6 +680,136 @@ reminder_email_links = db.Table(
 )
 
 
+# ---------------------------------------------------------------------
+# Delivery Outbox
+# ---------------------------------------------------------------------
+class DeliveryOutbox(db.Model):
+    """
+    One pending notification for one destination, enqueued by the scheduler in the
+    same transaction as the state change that triggered it and drained with retries.
+    """
+
+    __tablename__ = "delivery_outbox"
+    __table_args__ = (db.Index("ix_delivery_outbox_status_next_attempt", "status", "next_attempt_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True, index=True)
+
+    # What triggered the delivery (message / email / reminder) and where it goes
+    source_type = db.Column(db.String(16), nullable=False)
+    source_id = db.Column(db.Integer, nullable=True)
+    source_label = db.Column(db.String(100), nullable=True)
+    kind = db.Column(db.String(16), nullable=False)  # apprise / webhook / webhook_batch / email
+    destination_label = db.Column(db.String(100), nullable=True)
+    target = db.Column(db.String(255), nullable=True)  # host used for the per-host cap
+    destination_id = db.Column(db.Integer, nullable=True)  # webhook id, groups batched rows
+
+    # Everything the sender needs, JSON-encoded then encrypted
+    _payload = db.Column("payload", db.Text, nullable=False)
+
+    status = db.Column(db.String(16), nullable=False, default=OUTBOX_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(
+        db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    locked_until = db.Column(db.DateTime(timezone=True), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(
+        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+    sent_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    @property
+    def payload(self):
+        return json.loads(decrypt(self._payload)) if self._payload else {}
+
+    @payload.setter
+    def payload(self, value):
+        self._payload = encrypt(json.dumps(value))
+
+    def __repr__(self):
+        return f"<DeliveryOutbox {self.id} {self.kind} [{self.destination_label}] {self.status}>"
+
+
+# ---------------------------------------------------------------------
+# Activity Index
+# ---------------------------------------------------------------------
+class ActivityEvent(db.Model):
+    """
+    One row per entry of a user's Activity tab, appended by the log writer as the
+    audit records are written (see app/services/activity_index.py). Keyed by
+    username, as the log is, so entries survive the account they describe.
+    """
+
+    __tablename__ = "activity_events"
+    __table_args__ = (
+        db.Index("ix_activity_events_username_id", "username", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(150), nullable=False)
+    category = db.Column(db.String(32), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    level = db.Column(db.String(8), nullable=False, default="INFO")
+    # Same format as the log lines ("2025-05-15 07:45:22,123", server local time)
+    logged_at = db.Column(db.String(23), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ActivityEvent {self.id} {self.username} {self.category}>"
+
+
+# ---------------------------------------------------------------------
+# Scheduler Run Ledger
+# ---------------------------------------------------------------------
+class SchedulerRun(db.Model):
+    """
+    One row per scheduler job run, written when the run finishes (see
+    app/services/scheduler/run_ledger.py).
+    """
+
+    __tablename__ = "scheduler_runs"
+    __table_args__ = (db.Index("ix_scheduler_runs_job_id_id", "job_id", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(16), nullable=False)  # Success / Failure
+    started_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    duration_ms = db.Column(db.Integer, nullable=False, default=0)
+    items_scanned = db.Column(db.Integer, nullable=False, default=0)
+    items_acted = db.Column(db.Integer, nullable=False, default=0)
+    error_count = db.Column(db.Integer, nullable=False, default=0)
+
+    events = db.relationship("SchedulerEvent", backref="run", lazy="select")
+
+    def __repr__(self):
+        return f"<SchedulerRun {self.id} {self.job_id} {self.status}>"
+
+
+class SchedulerEvent(db.Model):
+    """
+    One item a scheduler run acted on or failed on (a check-in reminder sent, an
+    item executed, an outbox row dead-lettered, ...).
+    """
+
+    __tablename__ = "scheduler_events"
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(
+        db.Integer, db.ForeignKey("scheduler_runs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    item_type = db.Column(db.String(16), nullable=True)  # message / email / reminder / outbox / ...
+    item_id = db.Column(db.Integer, nullable=True)
+    action = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(16), nullable=False)  # Success / Failure
+    detail = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<SchedulerEvent {self.id} run={self.run_id} {self.action} {self.status}>"
+
+
 # ---------------------------------------------------------------------
 # Per-User Security Questions
 # ---------------------------------------------------------------------
@@ -0,0 +1,338 @@
+"""
+# ---------------------------------------------------------------------
+# activity_index.py
+# app/services/activity_index.py
+# Per-user activity index (activity_events table), appended by its own
+# indexer thread as the log writer hands over audit records, and read a
+# page at a time by the dashboard Activity tab.
+# ---------------------------------------------------------------------
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+
+from app.config import (
+    ACTIVITY_INDEX_QUEUE_SIZE,
+    ACTIVITY_INDEX_RETRY_ATTEMPTS,
+    ACTIVITY_INDEX_RETRY_SECONDS,
+    ACTIVITY_PAGE_SIZE,
+    ACTIVITY_RESYNC_INTERVAL_SECONDS,
+    ACTIVITY_RESYNC_MARKER_PATH,
+    ACTIVITY_RETENTION_DAYS,
+)
+from app.extensions import db
+from app.models import ActivityEvent
+from app.utils.log_reader import activity_entry, audit_log_available, iter_audit_records_chronological
+from app.utils.logging import log_error_message, log_info_message
+from app.utils.setup_logging import flush_logs, register_audit_sink
+
+# Seconds between retention sweeps run from the indexer thread
+PRUNE_INTERVAL_SECONDS = 3600
+BACKFILL_CHUNK_SIZE = 1000
+# Rows written per transaction when several queued batches are coalesced
+INDEX_MAX_ROWS = 5000
+
+_table = ActivityEvent.__table__
+_timestamps = logging.Formatter()  # Same "%Y-%m-%d %H:%M:%S,mmm" as the log lines
+
+_engine = None
+_engine_pid = None
+_next_prune = 0.0
+
+# Batches of rows from the log writer, written by the indexer thread
+_queue = None
+_indexer = None
+_indexer_pid = None
+# Rows at or before this timestamp were re-read from the audit log by the last
+# resync; copies still queued are skipped
+_resynced_upto = None
+_marker_lock = threading.Lock()
+_marks = 0  # Calls to _mark_resync in this process, to spot one during a resync
+
+
+def _retention_cutoff():
+    cutoff = datetime.now() - timedelta(days=ACTIVITY_RETENTION_DAYS)
+    return cutoff.strftime("%Y-%m-%d %H:%M:%S,000")
+
+
+# ---------------------------------------------------------------------
+# _index_batch (audit sink)
+# ---------------------------------------------------------------------
+def _index_batch(batch):
+    """
+    Hand the batch's activity entries to the indexer thread. Runs on the log
+    writer thread, after the batch has reached the log files, so it only queues:
+    a busy database must never hold up logging.
+    """
+    rows = []
+    for record, fields in batch:
+        entry = activity_entry(fields)
+        if entry is not None:
+            rows.append(
+                {
+                    "username": fields["user"],
+                    "category": entry[0],
+                    "message": entry[1],
+                    "level": record.levelname,
+                    "logged_at": _timestamps.formatTime(record),
+                }
+            )
+    if not rows:
+        return
+
+    _ensure_indexer()
+    try:
+        _queue.put_nowait(rows)
+    except queue.Full:
+        # Already in the audit log: the resync picks these rows up from there
+        _mark_resync(rows[0]["logged_at"])
+
+
+# ---------------------------------------------------------------------
+# _ensure_indexer / _run_indexer
+# ---------------------------------------------------------------------
+def _ensure_indexer():
+    """Start this process's indexer thread (again, in a forked child)."""
+    global _queue, _indexer, _indexer_pid
+    if _indexer_pid == os.getpid() and _indexer.is_alive():
+        return
+    _queue = queue.Queue(maxsize=ACTIVITY_INDEX_QUEUE_SIZE)
+    _indexer = threading.Thread(target=_run_indexer, args=(_queue,), name="grylli-activity-index", daemon=True)
+    _indexer.start()
+    _indexer_pid = os.getpid()
+
+
+def _run_indexer(pending):
+    """
+    Write queued rows (several batches per transaction when they pile up),
+    retrying while the database is locked, and re-read the marked span from the
+    audit log whenever a resync marker is set.
+    """
+    while True:
+        try:
+            rows = pending.get(timeout=ACTIVITY_RESYNC_INTERVAL_SECONDS)
+        except queue.Empty:
+            rows = []
+        while len(rows) < INDEX_MAX_ROWS:
+            try:
+                rows = rows + pending.get_nowait()
+            except queue.Empty:
+                break
+
+        if _resynced_upto is not None:
+            rows = [row for row in rows if row["logged_at"] > _resynced_upto]
+        try:
+            if rows or time.monotonic() >= _next_prune:
+                _write_with_retry(rows)
+            if _read_resync_marker() is not None:
+                _resync(pending)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log_error_message(f"Activity index: indexer error: {e}")
+
+
+# ---------------------------------------------------------------------
+# _write_rows / _write_with_retry
+# ---------------------------------------------------------------------
+def _write_rows(rows):
+    """Insert `rows` in one transaction, pruning expired entries when due."""
+    global _engine_pid, _next_prune
+    if _engine_pid != os.getpid():
+        # Forked worker: never reuse connections inherited from the parent
+        _engine.dispose(close=False)
+        _engine_pid = os.getpid()
+
+    now = time.monotonic()
+    with _engine.begin() as conn:
+        if rows:
+            conn.execute(insert(_table), rows)
+        if now >= _next_prune:
+            conn.execute(delete(_table).where(_table.c.logged_at < _retention_cutoff()))
+            _next_prune = now + PRUNE_INTERVAL_SECONDS
+
+
+def _write_with_retry(rows):
+    delay = ACTIVITY_INDEX_RETRY_SECONDS
+    for attempt in range(1, ACTIVITY_INDEX_RETRY_ATTEMPTS + 1):
+        try:
+            _write_rows(rows)
+            return
+        except Exception as e:
+            if attempt == ACTIVITY_INDEX_RETRY_ATTEMPTS:
+                log_error_message(
+                    f"Activity index: {len(rows)} entries not written after {attempt} attempts ({e}); "
+                    "they will be re-read from the audit log"
+                )
+                if rows:
+                    _mark_resync(min(row["logged_at"] for row in rows))
+                return
+            time.sleep(delay)
+            delay *= 2
+
+
+# ---------------------------------------------------------------------
+# _mark_resync / _read_resync_marker / _resync
+# ---------------------------------------------------------------------
+def _mark_resync(since):
+    """
+    Record that entries logged at or after `since` may be missing from the index.
+    The marker is a file, so a restart still resyncs; the earliest time wins.
+    """
+    global _marks
+    with _marker_lock:
+        _marks += 1
+        current = _read_resync_marker()
+        if current is not None and current <= since:
+            return
+        tmp_path = f"{ACTIVITY_RESYNC_MARKER_PATH}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(since)
+        os.replace(tmp_path, ACTIVITY_RESYNC_MARKER_PATH)
+
+
+def _read_resync_marker():
+    try:
+        with open(ACTIVITY_RESYNC_MARKER_PATH, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _clear_resync_marker(marks_seen):
+    # Entries marked while the resync ran may have been missed: keep the marker
+    with _marker_lock:
+        if _marks == marks_seen:
+            os.remove(ACTIVITY_RESYNC_MARKER_PATH)
+
+
+def _resync(pending):
+    """
+    Replace the index from the marker's timestamp on with the audit log's
+    entries. Runs on the indexer thread; on failure the marker stays and the
+    next pass retries.
+    """
+    global _resynced_upto
+    with _marker_lock:
+        since, marks_seen = _read_resync_marker(), _marks
+    if not audit_log_available():
+        # Nothing to re-read: keep the index as it is rather than emptying the span
+        log_error_message(f"Activity index: entries since {since} may be missing (no audit log to re-read)")
+        _clear_resync_marker(marks_seen)
+        return
+
+    # Every row queued so far is then in the audit log and can be dropped
+    flush_logs()
+    while True:
+        try:
+            pending.get_nowait()
+        except queue.Empty:
+            break
+
+    try:
+        with _engine.begin() as conn:
+            conn.execute(delete(_table).where(_table.c.logged_at >= since))
+            count, upto = _backfill_from_audit_log(conn, since)
+    except Exception as e:
+        log_error_message(f"Activity index: resync from {since} failed ({e}); retrying later")
+        return
+
+    _resynced_upto = upto
+    _clear_resync_marker(marks_seen)
+    log_info_message(f"Activity index: re-read {count} entries logged since {since} from the audit log")
+
+
+# ---------------------------------------------------------------------
+# _backfill_from_audit_log
+# ---------------------------------------------------------------------
+def _backfill_from_audit_log(conn, since=None):
+    """
+    Seed the index from the audit log, rotated segments included (within
+    retention, and from `since` on when given), so the Activity tab keeps its
+    history across the upgrade. Returns (count, timestamp of the last record).
+    """
+    if not audit_log_available():
+        return 0, None
+
+    cutoff = max(_retention_cutoff(), since or "")
+    count = 0
+    upto = None
+    rows = []
+    for record in iter_audit_records_chronological(since=cutoff):
+        if record.get("ts", "") < cutoff:
+            continue
+        upto = record["ts"]
+        entry = activity_entry(record)
+        if entry is None:
+            continue
+        rows.append(
+            {
+                "username": record["user"],
+                "category": entry[0],
+                "message": entry[1],
+                "level": record.get("level", "INFO"),
+                "logged_at": record["ts"],
+            }
+        )
+        if len(rows) >= BACKFILL_CHUNK_SIZE:
+            conn.execute(insert(_table), rows)
+            count += len(rows)
+            rows = []
+
+    if rows:
+        conn.execute(insert(_table), rows)
+        count += len(rows)
+    return count, upto
+
+
+# ---------------------------------------------------------------------
+# start_activity_index
+# ---------------------------------------------------------------------
+def start_activity_index(engine):
+    """
+    Backfill the index if it is empty, then have the log writer keep it
+    current through the indexer thread. Call once per process, after migrations.
+    """
+    global _engine, _engine_pid
+    _engine, _engine_pid = engine, os.getpid()
+
+    # Everything logged so far is in the audit log: backfill covers it
+    flush_logs()
+    with engine.begin() as conn:
+        if conn.execute(select(_table.c.id).limit(1)).first() is None:
+            count, _ = _backfill_from_audit_log(conn)
+            if count:
+                log_info_message(f"Activity index: backfilled {count} entries from the audit log")
+
+    _ensure_indexer()
+    register_audit_sink(_index_batch)
+
+
+# ---------------------------------------------------------------------
+# get_activity_page
+# ---------------------------------------------------------------------
+def get_activity_page(username, before_id=None, page_size=ACTIVITY_PAGE_SIZE):
+    """
+    One page of the user's activity, newest first, as
+    ([{"id", "timestamp", "category", "user", "message"}, ...], next_before_id).
+
+    Keyset pagination on (username, id): each page is a single index range
+    scan, whatever the table size. next_before_id is None on the last page.
+    """
+    query = select(_table.c.id, _table.c.logged_at, _table.c.category, _table.c.message).where(
+        _table.c.username == username
+    )
+    if before_id is not None:
+        query = query.where(_table.c.id < before_id)
+    rows = db.session.execute(query.order_by(_table.c.id.desc()).limit(page_size + 1)).all()
+
+    entries = [
+        {"id": row_id, "timestamp": logged_at, "category": category, "user": username, "message": message}
+        for row_id, logged_at, category, message in rows[:page_size]
+    ]
+    next_before = entries[-1]["id"] if len(rows) > page_size else None
+    return entries, next_before
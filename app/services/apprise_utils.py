@@ -1,14 +1,231 @@
 # ---------------------------------------------------------------------
 # apprise_utils.py
 # app/services/apprise_utils.py
-# Apprise library test notification utility.
+# In-process Apprise notification service (test sends and scheduler)
 # ---------------------------------------------------------------------
 
-from apprise import Apprise
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
 
+from apprise import Apprise, AppriseAsset, AppriseAttachment
+
+from app.config import APPRISE_NOTIFIER_CACHE_MAX_ENTRIES, APPRISE_NOTIFIER_CACHE_MAX_URLS
 from app.utils.logging import log_debug_message, log_exception_with_traceback, log_info_message
 
+# Shared by every Apprise object created in this process
+_asset = AppriseAsset()
+_warm_lock = threading.Lock()
+_warmed = False
+
+
+# ---------------------------------------------------------------------
+# _WarningCapture
+# ---------------------------------------------------------------------
+class _WarningCapture(logging.Handler):
+    """
+    Collects Apprise warnings for the calling thread only, so concurrent sends
+    (delivery pool threads, web requests) each get their own failure reason.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self._local = threading.local()
+
+    def start(self):
+        self._local.lines = []
+
+    def stop(self):
+        lines, self._local.lines = getattr(self._local, "lines", None) or [], None
+        return "\n".join(lines)
 
+    def emit(self, record):
+        lines = getattr(self._local, "lines", None)
+        if lines is not None:
+            lines.append(record.getMessage())
+
+
+_capture = _WarningCapture()
+logging.getLogger("apprise").addHandler(_capture)
+
+# Ready-to-notify Apprise objects keyed by ((destination id, version), ...), least
+# recently used first. Each entry: {"apprise", "hosts", "urls", "lock"}. The
+# version is the destination's updated_at, so an edited URL never hits a stale
+# entry; invalidate_destination() also frees entries on edit, disable and delete.
+_notifiers = OrderedDict()
+_notifiers_lock = threading.Lock()
+_cached_urls = 0
+
+
+# ---------------------------------------------------------------------
+# warm_up
+# ---------------------------------------------------------------------
+def warm_up():
+    """
+    Load Apprise's plugin registry once per process, so the first notification
+    (usually a user's test click) doesn't pay for importing every plugin.
+    """
+    global _warmed
+    with _warm_lock:
+        if _warmed:
+            return
+        try:
+            Apprise(asset=_asset).details()
+            _warmed = True
+            log_debug_message("Apprise plugin registry loaded")
+        except Exception as e:
+            log_exception_with_traceback("Failed to load Apprise plugin registry", e)
+
+
+# ---------------------------------------------------------------------
+# notify
+# ---------------------------------------------------------------------
+def notify(urls, title, body, attachments=None):
+    """
+    Send one notification to one or more Apprise URLs without leaving the process.
+
+    Args:
+        urls: Apprise URL or list of URLs.
+        title: Notification title.
+        body: Notification body.
+        attachments: Optional list of file paths attached via AppriseAttachment.
+
+    Returns:
+        Tuple: (success: bool, error: str or None). The error carries Apprise's own
+        warnings (bad credentials, unreachable host, ...) when it has any.
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+
+    apobj = Apprise(asset=_asset)
+    for url in urls:
+        if not apobj.add(url.strip()):
+            return False, "Invalid Apprise URL."
+
+    attach = None
+    if attachments:
+        attach = AppriseAttachment(asset=_asset)
+        for path in attachments:
+            if not attach.add(path):
+                return False, f"Cannot attach file: {path}"
+
+    _capture.start()
+    try:
+        ok = apobj.notify(title=title, body=body, attach=attach)
+    finally:
+        warnings = _capture.stop()
+
+    if ok:
+        return True, None
+    return False, warnings or "Apprise failed to send the notification."
+
+
+# ---------------------------------------------------------------------
+# destination_ref
+# ---------------------------------------------------------------------
+def destination_ref(destination):
+    """
+    Serialisable reference to an AppriseURL: its id, version and plain URL. Only
+    ever stored inside an encrypted outbox payload (like the SMTP credentials),
+    so a queued row stays sendable after a key rotation.
+    """
+    version = destination.updated_at or destination.created_at
+    return {
+        "id": destination.id,
+        "version": version.isoformat() if version else "",
+        "url": destination.url,
+    }
+
+
+# ---------------------------------------------------------------------
+# get_notifier
+# ---------------------------------------------------------------------
+def get_notifier(refs):
+    """
+    Return the cached notifier entry for a set of destination refs, building it
+    (parsing the URLs and loading their plugins) only on a miss.
+
+    Raises:
+        ValueError: If a URL is rejected by Apprise.
+    """
+    global _cached_urls
+    key = tuple(sorted((ref["id"], ref["version"]) for ref in refs))
+
+    with _notifiers_lock:
+        entry = _notifiers.get(key)
+        if entry is not None:
+            _notifiers.move_to_end(key)
+            return entry
+
+    apobj = Apprise(asset=_asset)
+    hosts = []
+    for ref in refs:
+        url = ref["url"].strip()
+        if not apobj.add(url):
+            raise ValueError(f"Invalid Apprise URL for destination {ref['id']}.")
+        parsed = urlparse(url)
+        hosts.append(parsed.hostname or parsed.scheme)
+
+    entry = {"apprise": apobj, "hosts": hosts, "urls": len(refs), "lock": threading.Lock()}
+
+    with _notifiers_lock:
+        if key in _notifiers:
+            return _notifiers[key]
+        _notifiers[key] = entry
+        _cached_urls += entry["urls"]
+        while len(_notifiers) > 1 and (
+            len(_notifiers) > APPRISE_NOTIFIER_CACHE_MAX_ENTRIES
+            or _cached_urls > APPRISE_NOTIFIER_CACHE_MAX_URLS
+        ):
+            _, evicted = _notifiers.popitem(last=False)
+            _cached_urls -= evicted["urls"]
+
+    log_debug_message(f"Apprise notifier cached for destination(s) {[ref['id'] for ref in refs]}")
+    return entry
+
+
+# ---------------------------------------------------------------------
+# notify_destinations
+# ---------------------------------------------------------------------
+def notify_destinations(refs, title, body):
+    """
+    Send one notification through the cached notifier for `refs`.
+
+    Returns:
+        Tuple: (success: bool, error: str or None), as notify().
+    """
+    entry = get_notifier(refs)
+
+    # Apprise plugins keep per-object state; one send at a time per notifier
+    with entry["lock"]:
+        _capture.start()
+        try:
+            ok = entry["apprise"].notify(title=title, body=body)
+        finally:
+            warnings = _capture.stop()
+
+    if ok:
+        return True, None
+    return False, warnings or "Apprise failed to send the notification."
+
+
+# ---------------------------------------------------------------------
+# invalidate_destination
+# ---------------------------------------------------------------------
+def invalidate_destination(destination_id):
+    """
+    Drop every cached notifier that includes the destination (edit, disable, delete).
+    """
+    global _cached_urls
+    with _notifiers_lock:
+        for key in [key for key in _notifiers if any(id_ == destination_id for id_, _ in key)]:
+            _cached_urls -= _notifiers.pop(key)["urls"]
+
+
+# ---------------------------------------------------------------------
+# send_test_apprise_notification
+# ---------------------------------------------------------------------
 def send_test_apprise_notification(apprise_url):
     """
     Sends a test notification using the Apprise library.
@@ -20,11 +237,8 @@ def send_test_apprise_notification(apprise_url):
         Tuple: (success: bool, message: str)
     """
     try:
-        apobj = Apprise()
-        apobj.add(apprise_url)
-
-        success = apobj.notify(
-            title="Grylli Test", body="✅ This is a test notification from Grylli."
+        success, error = notify(
+            apprise_url, "Grylli Test", "✅ This is a test notification from Grylli."
         )
 
         if success:
@@ -32,7 +246,7 @@ def send_test_apprise_notification(apprise_url):
             return True, "Notification sent successfully."
         else:
             log_info_message(f"Test Apprise notification failed (URL: {apprise_url[:30]}...).")
-            return False, "Apprise failed to send the notification."
+            return False, error
 
     except Exception as e:
         log_exception_with_traceback("Exception while sending Apprise notification", e)
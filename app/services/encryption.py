@@ -2,21 +2,130 @@
 # ---------------------------------------------------------------------
 # encryption.py
 # app/services/encryption.py
-# Symmetric string encryption/decryption with Fernet.
+# Symmetric string encryption/decryption (AES-256-GCM envelope, Fernet legacy).
 # ---------------------------------------------------------------------
 """
 
+import base64
+import binascii
+import hashlib
 import os
-
-from cryptography.fernet import Fernet
+import time
+from collections import OrderedDict
+
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from flask import g, has_app_context
 from flask_login import current_user
 
+from app.config import DECRYPT_CACHE_MAX_ENTRIES, DECRYPT_CACHE_TTL_SECONDS, ENCRYPTION_CIPHER
 from app.utils.logging import log_debug_message, log_exception_with_traceback, log_info_message
 
-__all__ = ["encrypt", "decrypt"]
+__all__ = [
+    "encrypt",
+    "decrypt",
+    "clear_decrypt_cache",
+    "is_current_format",
+    "needs_reencrypt",
+    "key_fingerprint",
+]
+
+# Stored values are either a legacy Fernet token ("gAAAA...") or a versioned
+# envelope "v2:" + unpadded urlsafe-base64(nonce || AES-256-GCM ciphertext || tag).
+# base64 rather than base85: the C decoder is ~10x faster for ~7% more bytes.
+# Readers pick the cipher from the prefix; ENCRYPTION_CIPHER picks what new
+# writes use.
+ENVELOPE_V2 = "v2:"
+GCM_NONCE_BYTES = 12
 
 FERRET_KEY = os.environ.get("FERRET_KEY")
-fernet = Fernet(FERRET_KEY.encode()) if FERRET_KEY else None
+
+# Key rotation: set FERRET_KEY to the new key and list the old one(s) here
+# (comma-separated). Values under an old key keep decrypting while the
+# re-encryption job (or tools/rotate_encryption_key.py) rewrites them.
+FERRET_KEYS_PREVIOUS = [
+    key.strip() for key in os.environ.get("FERRET_KEYS_PREVIOUS", "").split(",") if key.strip()
+]
+
+
+def _derive_aesgcm(key: str):
+    """
+    AES-256-GCM cipher keyed by HKDF-SHA256 over the raw FERRET_KEY bytes, so
+    one configured secret serves both formats without sharing key material.
+    """
+    raw = base64.urlsafe_b64decode(key.encode())
+    derived = HKDF(
+        algorithm=hashes.SHA256(), length=32, salt=None, info=b"grylli/aes-256-gcm/v2"
+    ).derive(raw)
+    return AESGCM(derived)
+
+
+# Current key first: it encrypts; every key decrypts
+_keys = [FERRET_KEY, *FERRET_KEYS_PREVIOUS] if FERRET_KEY else []
+fernet = MultiFernet([Fernet(key.encode()) for key in _keys]) if _keys else None
+_fernet_current = Fernet(FERRET_KEY.encode()) if FERRET_KEY else None
+_aesgcm_keys = [_derive_aesgcm(key) for key in _keys]
+
+
+def _encrypt_v2(data: bytes) -> str:
+    nonce = os.urandom(GCM_NONCE_BYTES)
+    sealed = _aesgcm_keys[0].encrypt(nonce, data, None)
+    return ENVELOPE_V2 + base64.urlsafe_b64encode(nonce + sealed).decode().rstrip("=")
+
+
+def _decrypt_v2(token: str, keys=None) -> bytes:
+    try:
+        body = token[len(ENVELOPE_V2) :]
+        raw = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+    except (ValueError, binascii.Error) as e:
+        raise InvalidToken() from e
+
+    # A wrong key fails on the GCM tag check, so trying old keys is cheap
+    for cipher in _aesgcm_keys if keys is None else keys:
+        try:
+            return cipher.decrypt(raw[:GCM_NONCE_BYTES], raw[GCM_NONCE_BYTES:], None)
+        except InvalidTag:
+            continue
+    # Same exception callers already handle for Fernet
+    raise InvalidToken()
+
+
+def is_current_format(ciphertext: str) -> bool:
+    """
+    True when a stored value is already in the format new writes use.
+    """
+    return ciphertext.startswith(ENVELOPE_V2) == (ENCRYPTION_CIPHER == "aesgcm")
+
+
+def needs_reencrypt(ciphertext: str) -> bool:
+    """
+    True when a stored value is in an older format or was written under one of
+    FERRET_KEYS_PREVIOUS rather than the current key.
+    """
+    if not is_current_format(ciphertext):
+        return True
+    if not FERRET_KEYS_PREVIOUS:
+        return False
+    try:
+        if ciphertext.startswith(ENVELOPE_V2):
+            _decrypt_v2(ciphertext, keys=_aesgcm_keys[:1])
+        else:
+            _fernet_current.decrypt(ciphertext.encode())
+        return False
+    except InvalidToken:
+        return True
+
+
+def key_fingerprint() -> str:
+    """
+    Short fingerprint of the cipher and key set; a re-encryption pass is complete
+    only for the fingerprint it ran under.
+    """
+    material = "|".join([ENCRYPTION_CIPHER, *_keys])
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
 
 
 def _get_username():
@@ -28,13 +137,13 @@ def _get_username():
 
 def encrypt(plaintext: str) -> str:
     """
-    Encrypt a plaintext string using Fernet.
+    Encrypt a plaintext string with the configured cipher (ENCRYPTION_CIPHER).
 
     Args:
         plaintext: The string to encrypt.
 
     Returns:
-        The encrypted string (base64, URL-safe).
+        The encrypted string: a "v2:" AES-256-GCM envelope, or a Fernet token.
 
     Raises:
         ValueError: If the FERRET_KEY environment variable is not set or is invalid.
@@ -43,7 +152,10 @@ def encrypt(plaintext: str) -> str:
         log_info_message("Encryption failed: FERRET_KEY is not set or invalid.")
         raise ValueError("FERRET_KEY is not set or invalid.")
     try:
-        encrypted = fernet.encrypt(plaintext.encode()).decode()
+        if ENCRYPTION_CIPHER == "aesgcm":
+            encrypted = _encrypt_v2(plaintext.encode())
+        else:
+            encrypted = fernet.encrypt(plaintext.encode()).decode()
         log_debug_message(f"[ENCRYPT] String encrypted successfully by '{_get_username()}'.")
         return encrypted
     except Exception as e:
@@ -52,9 +164,38 @@ def encrypt(plaintext: str) -> str:
         raise
 
 
+# ---------------------------------------------------------------------
+# Decrypted-value memo
+# ---------------------------------------------------------------------
+# Plaintexts are memoised per unit of work (a request, or a scheduler tick),
+# keyed by ciphertext and stored on flask.g, so they live only as long as the
+# app context: ciphertext -> (plaintext, decrypted at). Code running outside an
+# app context (delivery pool threads) always decrypts.
+
+
+def _decrypt_memo():
+    if not has_app_context():
+        return None
+    memo = g.get("_decrypt_memo")
+    if memo is None:
+        memo = g._decrypt_memo = OrderedDict()
+    return memo
+
+
+def clear_decrypt_cache(exc=None):
+    """
+    Drop the memoised plaintexts of the current app context (teardown hook).
+    """
+    if has_app_context():
+        memo = g.pop("_decrypt_memo", None)
+        if memo:
+            memo.clear()
+
+
 def decrypt(ciphertext: str) -> str:
     """
-    Decrypt an encrypted string using Fernet.
+    Decrypt a stored value (AES-256-GCM envelope or legacy Fernet token). Repeat reads of the same value in
+    one request or scheduler tick are served from the decrypted-value memo.
 
     Args:
         ciphertext: The encrypted string to decrypt.
@@ -65,12 +206,27 @@ def decrypt(ciphertext: str) -> str:
     Raises:
         ValueError: If the FERRET_KEY environment variable is not set or is invalid.
     """
+    memo = _decrypt_memo()
+    if memo is not None:
+        cached = memo.get(ciphertext)
+        if cached is not None and time.monotonic() - cached[1] < DECRYPT_CACHE_TTL_SECONDS:
+            memo.move_to_end(ciphertext)
+            return cached[0]
+
     if not fernet:
         log_info_message("Decryption failed: FERRET_KEY is not set or invalid.")
         raise ValueError("FERRET_KEY is not set or invalid.")
     try:
-        decrypted = fernet.decrypt(ciphertext.encode()).decode()
+        if ciphertext.startswith(ENVELOPE_V2):
+            decrypted = _decrypt_v2(ciphertext).decode()
+        else:
+            decrypted = fernet.decrypt(ciphertext.encode()).decode()
         log_debug_message(f"[DECRYPT] String decrypted successfully by '{_get_username()}'.")
+
+        if memo is not None:
+            memo[ciphertext] = (decrypted, time.monotonic())
+            while len(memo) > DECRYPT_CACHE_MAX_ENTRIES:
+                memo.popitem(last=False)
         return decrypted
     except Exception as e:
         log_info_message(f"[DECRYPT] Exception raised by '{_get_username()}'.")
@@ -0,0 +1,104 @@
+"""
+# ---------------------------------------------------------------------
+# http_client.py
+# app/services/http_client.py
+# Shared keep-alive HTTP session for webhook and API calls.
+# ---------------------------------------------------------------------
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import (
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT_SECONDS,
+)
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------
+# _build_session
+# ---------------------------------------------------------------------
+def _build_session():
+    """
+    Create a Session whose adapters keep up to HTTP_POOL_MAXSIZE keep-alive
+    connections per host for HTTP_POOL_CONNECTIONS hosts. urllib3 reuses the TLS
+    connection (and session) for every request that gets a pooled connection.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Receivers are unrelated third parties: never carry cookies between them
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+# ---------------------------------------------------------------------
+# get_session
+# ---------------------------------------------------------------------
+def get_session():
+    """
+    Return the process-wide Session, creating it on first use and again after a
+    fork (sockets must not be shared between Gunicorn master and worker).
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    with _lock:
+        if _session is None or _session_pid != pid:
+            _session = _build_session()
+            _session_pid = pid
+        return _session
+
+
+# ---------------------------------------------------------------------
+# post_json
+# ---------------------------------------------------------------------
+def post_json(url, payload, headers=None, timeout=None):
+    """
+    POST a JSON payload through the shared session.
+
+    Args:
+        url: Endpoint URL.
+        payload: JSON-serialisable body.
+        headers: Optional extra headers.
+        timeout: Read timeout in seconds (defaults to HTTP_READ_TIMEOUT_SECONDS);
+            the connect timeout is always HTTP_CONNECT_TIMEOUT_SECONDS.
+
+    Returns:
+        requests.Response
+    """
+    return get_session().post(
+        url,
+        json=payload,
+        headers=headers,
+        timeout=(HTTP_CONNECT_TIMEOUT_SECONDS, timeout or HTTP_READ_TIMEOUT_SECONDS),
+    )
+
+
+# ---------------------------------------------------------------------
+# get
+# ---------------------------------------------------------------------
+def get(url, headers=None, timeout=None):
+    """
+    GET through the shared session (same timeout rules as post_json).
+    """
+    return get_session().get(
+        url,
+        headers=headers,
+        timeout=(HTTP_CONNECT_TIMEOUT_SECONDS, timeout or HTTP_READ_TIMEOUT_SECONDS),
+    )
@@ -3,7 +3,7 @@
 import json
 from pathlib import Path
 from app.config import DATA_DIR, APP_VERSION, GITHUB_URL
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.utils.logging import log_exception_with_traceback, log_user_event
 
 
 def read_version_status():
@@ -26,4 +26,4 @@ def read_version_status():
 def record_theme_change(theme: str, username: str):
     theme = theme.strip()
     if theme:
-        log_info_message(f"Access - {username} - Switched theme to '{theme}'")
+        log_user_event("Access", username, f"Switched theme to '{theme}'")
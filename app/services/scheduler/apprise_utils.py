@@ -7,77 +7,108 @@
 import traceback
 
 # ------------------------ Imports (PEP8 order) -----------------------
-from apprise import Apprise
-
-from app.models import AppriseURL
-from app.utils.logging import log_error_message, log_info_message
+from app.services.apprise_utils import destination_ref, get_notifier, notify_destinations
+from app.utils.logging import log_scheduler_message
 
 
 # ---------------------------------------------------------------------
-# execute_apprise
+# prepare_apprise_deliveries
 # ---------------------------------------------------------------------
-def execute_apprise(message):
+def prepare_apprise_deliveries(message):
     """
-    Send an Apprise notification for the given message using all linked Apprise URLs.
+    Build one delivery spec per enabled Apprise destination linked to the message.
+    Runs on the scheduler thread so decryption and relationship loads happen here.
 
     Args:
         message: The message object with .label, .subject, .content, and .apprise_destinations.
 
-    Logging:
-        - log_info_message for high-level events.
-        - log_error_message for failures or exceptions.
+    Returns:
+        list: Delivery specs for app.services.scheduler.outbox.enqueue_deliveries.
     """
     try:
-        log_info_message(
-            f"Scheduler [ExecuteApprise] - Success - Executing Apprise for message: {getattr(message, 'label', '[unknown label]')}"
+        log_scheduler_message(
+            "ExecuteApprise", "Success", f"Executing Apprise for message: {getattr(message, 'label', '[unknown label]')}"
         )
 
         if not getattr(message, "apprise_destinations", None):
-            log_info_message(
-                "Scheduler [ExecuteApprise] - Success - No Apprise destinations linked to this message."
+            log_scheduler_message(
+                "ExecuteApprise", "Success", "No Apprise destinations linked to this message."
             )
-            return
-
-        apobj = Apprise()
-
-        for destination in message.apprise_destinations:
-            if destination.enabled:
-                try:
-                    apobj.add(destination.url)
-                    log_info_message(
-                        f"Scheduler [ExecuteApprise] - Success - Added Apprise URL: {destination.label} ({destination.url})"
-                    )
-                except Exception as e:
-                    log_error_message(
-                        f"ERROR - Scheduler [ExecuteApprise] - Failure - Failed to add Apprise URL [{destination.label}]: {e}"
-                    )
+            return []
 
         try:
             title = f"[Grylli] {message.subject}"
             body = message.content
         except Exception as e:
-            log_error_message(
-                f"ERROR - Scheduler [ExecuteApprise] - Failure - Failed to extract message content: {e}"
+            log_scheduler_message(
+                "ExecuteApprise", "Failure", f"Failed to extract message content: {e}"
             )
-            return
+            return []
 
-        try:
-            if not apobj.notify(title=title, body=body):
-                log_error_message(
-                    f"ERROR - Scheduler [ExecuteApprise] - Failure - Failed to send Apprise notification for: {message.label}"
-                )
-            else:
-                log_info_message(
-                    f"Scheduler [ExecuteApprise] - Success - Apprise notification sent for: {message.label}"
+        deliveries = []
+        for destination in message.apprise_destinations:
+            if not destination.enabled:
+                continue
+
+            # Cached per destination version: repeat deliveries skip URL
+            # and plugin parsing entirely
+            ref = destination_ref(destination)
+            try:
+                notifier = get_notifier([ref])
+            except Exception as e:
+                log_scheduler_message(
+                    "ExecuteApprise", "Failure", f"Failed to add Apprise URL [{destination.label}]: {e}"
                 )
-        except Exception as notify_error:
-            tb = traceback.format_exc()
-            log_error_message(
-                f"ERROR - Scheduler [ExecuteApprise] - Failure - Exception during Apprise notify(): {notify_error}\n{tb}"
+                continue
+
+            deliveries.append(
+                {
+                    "kind": "apprise",
+                    "label": destination.label,
+                    "target": notifier["hosts"][0],
+                    "payload": {
+                        "destinations": [ref],
+                        "destination_label": destination.label,
+                        "title": title,
+                        "body": body,
+                        "message_label": message.label,
+                    },
+                }
             )
+        return deliveries
+
+    except Exception as e:
+        tb = traceback.format_exc()
+        log_scheduler_message(
+            "ExecuteApprise", "Failure", f"Unexpected error in prepare_apprise_deliveries:\n{e}\n{tb}"
+        )
+        return []
+
 
+# ---------------------------------------------------------------------
+# send_apprise_notification (delivery pool thread)
+# ---------------------------------------------------------------------
+def send_apprise_notification(destination_label, title, body, message_label, destinations):
+    """
+    Send a notification to a single Apprise destination through its cached
+    notifier. Returns True on success.
+    """
+    try:
+        ok, error = notify_destinations(destinations, title, body)
     except Exception as e:
         tb = traceback.format_exc()
-        log_error_message(
-            f"ERROR - Scheduler [ExecuteApprise] - Failure - Unexpected error in execute_apprise:\n{e}\n{tb}"
+        log_scheduler_message(
+            "ExecuteApprise", "Failure", f"Exception during Apprise notify(): {e}\n{tb}"
         )
+        return False
+
+    if not ok:
+        log_scheduler_message(
+            "ExecuteApprise", "Failure", f"Failed to send Apprise notification for: {message_label} ({destination_label}): {error}"
+        )
+        return False
+
+    log_scheduler_message(
+        "ExecuteApprise", "Success", f"Apprise notification sent for: {message_label} ({destination_label})"
+    )
+    return True
@@ -0,0 +1,401 @@
+# ---------------------------------------------------------------------
+# async_webhooks.py
+# app/services/scheduler/async_webhooks.py
+# asyncio webhook fan-out engine (one event loop thread, keep-alive HTTP/1.1,
+# with the shared requests session for proxies and URL credentials)
+# ---------------------------------------------------------------------
+
+import asyncio
+import json
+import os
+import ssl
+import threading
+import time
+
+# ------------------------ Imports (PEP8 order) -----------------------
+from functools import partial
+from urllib.parse import urlsplit
+
+from requests.utils import get_environ_proxies
+
+from app.config import (
+    WEBHOOK_ASYNC_IDLE_SECONDS,
+    WEBHOOK_ASYNC_MAX_CONCURRENCY,
+    WEBHOOK_ASYNC_MAX_IDLE_PER_HOST,
+    WEBHOOK_ASYNC_MAX_PER_HOST,
+)
+from app.services.http_client import post_json
+from app.utils.logging import log_scheduler_message
+
+# A webhook request is a plain dict:
+#   {"endpoint": "https://...", "label": "My hook", "payload": {...}, "timeout": 5}
+#
+# and each result is:
+#   {"endpoint", "label", "ok", "status", "error", "elapsed"}
+#
+# All sockets, semaphores and idle connections below belong to the loop thread
+# and are only touched from coroutines running on it.
+
+USER_AGENT = "grylli-webhook"
+MAX_RESPONSE_BYTES = 64 * 1024
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+_global_semaphore = None
+_host_semaphores = {}
+_idle = {}  # (scheme, host, port) -> [(reader, writer, last_used), ...]
+_ssl_context = None
+
+
+# ---------------------------------------------------------------------
+# _ensure_loop
+# ---------------------------------------------------------------------
+def _ensure_loop():
+    """
+    Start the engine's event loop thread on first use (and again after a fork).
+    """
+    global _loop, _loop_pid, _global_semaphore, _ssl_context
+    pid = os.getpid()
+    with _loop_lock:
+        if _loop is None or _loop_pid != pid or not _loop.is_running():
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            threading.Thread(target=run, name="grylli-webhook-loop", daemon=True).start()
+            started.wait()
+
+            _loop = loop
+            _loop_pid = pid
+            _global_semaphore = None
+            _host_semaphores.clear()
+            _idle.clear()
+            _ssl_context = ssl.create_default_context()
+        return _loop
+
+
+# ---------------------------------------------------------------------
+# submit_webhooks / post_webhooks
+# ---------------------------------------------------------------------
+def submit_webhooks(webhook_requests):
+    """
+    Schedule the POSTs on the engine loop without waiting.
+
+    Returns:
+        concurrent.futures.Future resolving to the list of results, in order.
+    """
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(_post_all(webhook_requests), loop)
+
+
+def post_webhooks(webhook_requests):
+    """
+    POST every request concurrently and wait for the results (in order).
+    """
+    if not webhook_requests:
+        return []
+    return submit_webhooks(webhook_requests).result()
+
+
+# ---------------------------------------------------------------------
+# _post_all
+# ---------------------------------------------------------------------
+async def _post_all(webhook_requests):
+    global _global_semaphore
+    if _global_semaphore is None:
+        _global_semaphore = asyncio.Semaphore(WEBHOOK_ASYNC_MAX_CONCURRENCY)
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(_post_one(r) for r in webhook_requests))
+    ok = sum(1 for r in results if r["ok"])
+    log_scheduler_message(
+        "AsyncWebhooks", "Success", f"{ok}/{len(results)} webhook(s) delivered in {time.monotonic() - started:.2f}s"
+    )
+    return results
+
+
+# ---------------------------------------------------------------------
+# _post_one
+# ---------------------------------------------------------------------
+async def _post_one(request):
+    endpoint = request["endpoint"]
+    result = {
+        "endpoint": endpoint,
+        "label": request.get("label"),
+        "ok": False,
+        "status": None,
+        "error": None,
+        "elapsed": 0.0,
+    }
+    timeout = request.get("timeout", 5)
+    started = time.monotonic()
+
+    try:
+        parts = urlsplit(endpoint)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported webhook URL scheme: {parts.scheme or 'none'}")
+
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        if key not in _host_semaphores:
+            _host_semaphores[key] = asyncio.Semaphore(WEBHOOK_ASYNC_MAX_PER_HOST)
+        slots = (_host_semaphores[key], _global_semaphore)
+
+        # Every stage is bounded per request: a POST that times out is cancelled
+        # (its connection closed), never left running behind a failed result
+        try:
+            await asyncio.wait_for(_acquire(slots), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"no free connection slot within {timeout}s") from None
+
+        try:
+            if _needs_requests(parts, endpoint):
+                status, text = await _post_with_requests(endpoint, request["payload"], timeout)
+            else:
+                body = json.dumps(request["payload"]).encode("utf-8")
+                status, text = await asyncio.wait_for(_exchange(key, parts, body), timeout=timeout)
+        finally:
+            for slot in slots:
+                slot.release()
+
+        result["status"] = status
+        result["ok"] = status == 200
+        if status in REDIRECT_STATUSES:
+            # The payload was already delivered once; never re-POST it elsewhere
+            result["error"] = f"HTTP {status} redirect (not followed)"
+        elif not result["ok"]:
+            result["error"] = f"HTTP {status}: {text[:500]}"
+
+    except asyncio.TimeoutError:
+        result["error"] = f"no response within {timeout}s"
+    except Exception as e:
+        result["error"] = str(e) or e.__class__.__name__
+
+    result["elapsed"] = round(time.monotonic() - started, 3)
+    if result["ok"]:
+        log_scheduler_message(
+            "AsyncWebhooks", "Success", f"Webhook delivered: {result['label']} ({result['elapsed']}s)"
+        )
+    else:
+        log_scheduler_message(
+            "AsyncWebhooks", "Failure", f"Webhook [{result['label']}] failed: {result['error']}"
+        )
+    return result
+
+
+async def _acquire(slots):
+    """Acquire every semaphore in order, releasing the ones held if cancelled."""
+    acquired = []
+    try:
+        for slot in slots:
+            await slot.acquire()
+            acquired.append(slot)
+    except BaseException:
+        for slot in acquired:
+            slot.release()
+        raise
+
+
+# ---------------------------------------------------------------------
+# requests fallback (proxies, credentials in the URL)
+# ---------------------------------------------------------------------
+def _needs_requests(parts, endpoint):
+    """
+    True for requests the wire client does not handle: userinfo (basic auth)
+    in the URL, or an HTTP(S)_PROXY that applies to the endpoint (NO_PROXY
+    honoured).
+    """
+    if parts.username is not None or parts.password is not None:
+        return True
+    return bool(get_environ_proxies(endpoint))
+
+
+async def _post_with_requests(endpoint, payload, timeout):
+    """
+    POST through the shared requests session on a worker thread. requests
+    applies its own connect/read timeouts, so the thread always finishes.
+    """
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(
+        None,
+        partial(post_json, endpoint, payload, headers={"User-Agent": USER_AGENT}, timeout=timeout),
+    )
+    return response.status_code, response.text[:MAX_RESPONSE_BYTES]
+
+
+# ---------------------------------------------------------------------
+# _exchange
+# ---------------------------------------------------------------------
+async def _exchange(key, parts, body):
+    """
+    Send one POST over a pooled keep-alive connection. If a reused connection
+    fails before any byte of the status line arrives (the server closed it
+    while idle), the POST is retried once on a fresh connection. Once the
+    response has started, any failure is final: the POST is never resent.
+    """
+    for attempt in (1, 2):
+        reader, writer, reused = await _checkout(key)
+        try:
+            writer.write(_build_request(parts, body))
+            await writer.drain()
+            status_line = await reader.readline()
+        except (ConnectionError, ssl.SSLError):
+            status_line = b""
+        except BaseException:
+            writer.close()
+            raise
+
+        if not status_line:
+            writer.close()
+            if reused and attempt == 1:
+                continue
+            raise ConnectionResetError("connection closed before response")
+
+        try:
+            status, text, keep_alive = await _read_response(reader, status_line)
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive:
+            _checkin(key, reader, writer)
+        else:
+            writer.close()
+        return status, text
+
+
+# ---------------------------------------------------------------------
+# _checkout / _checkin (keep-alive pool)
+# ---------------------------------------------------------------------
+async def _checkout(key):
+    now = time.monotonic()
+    idle = _idle.get(key, [])
+    while idle:
+        reader, writer, last_used = idle.pop()
+        if (
+            now - last_used < WEBHOOK_ASYNC_IDLE_SECONDS
+            and not writer.is_closing()
+            and not reader.at_eof()
+        ):
+            return reader, writer, True
+        writer.close()
+
+    scheme, host, port = key
+    reader, writer = await asyncio.open_connection(
+        host,
+        port,
+        ssl=_ssl_context if scheme == "https" else None,
+        server_hostname=host if scheme == "https" else None,
+    )
+    return reader, writer, False
+
+
+def _checkin(key, reader, writer):
+    idle = _idle.setdefault(key, [])
+    if len(idle) < WEBHOOK_ASYNC_MAX_IDLE_PER_HOST:
+        idle.append((reader, writer, time.monotonic()))
+    else:
+        writer.close()
+
+
+# ---------------------------------------------------------------------
+# HTTP/1.1 wire helpers
+# ---------------------------------------------------------------------
+def _build_request(parts, body):
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    host = f"[{parts.hostname}]" if ":" in parts.hostname else parts.hostname  # IPv6 literal
+    if parts.port is not None:
+        host = f"{host}:{parts.port}"
+    head = (
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        f"User-Agent: {USER_AGENT}\r\n"
+        "Content-Type: application/json\r\n"
+        "Accept: */*\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: keep-alive\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _read_response(reader, status_line):
+    """
+    Read the rest of one HTTP/1.x response after its first status line,
+    skipping interim 1xx responses. Returns (status, text, keep_alive). At
+    most MAX_RESPONSE_BYTES of the body are read; a connection with body bytes
+    left unread is not kept alive. A body cut short by the server raises.
+    """
+    while True:
+        if not status_line.endswith(b"\n"):
+            raise ConnectionResetError("connection closed in the status line")
+
+        version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+        status = int(status)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionResetError("connection closed in the response headers")
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if status == 101:
+            raise ValueError("server switched protocols")
+        if status >= 200:
+            break  # 100 Continue, 103 Early Hints...: the final response follows
+        status_line = await reader.readline()
+
+    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+    if status in (204, 304):
+        body = b""
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        body, complete = await _read_chunked(reader)
+        keep_alive = keep_alive and complete
+    elif "content-length" in headers:
+        length = int(headers["content-length"])
+        body = await reader.readexactly(min(length, MAX_RESPONSE_BYTES))
+        keep_alive = keep_alive and length <= MAX_RESPONSE_BYTES
+    else:
+        body = await reader.read(MAX_RESPONSE_BYTES)
+        keep_alive = False
+
+    return status, body.decode("utf-8", "replace"), keep_alive
+
+
+async def _read_chunked(reader):
+    """
+    Read a chunked body up to MAX_RESPONSE_BYTES. Returns (body, complete);
+    complete is False when the body was cut short (rest left unread). EOF
+    before the last chunk raises ConnectionResetError.
+    """
+    chunks = []
+    total = 0
+    while True:
+        size_line = await reader.readline()
+        if not size_line.endswith(b"\n"):
+            raise ConnectionResetError("connection closed before the last chunk")
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            # Trailers end with an empty line
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks), True
+        if total + size > MAX_RESPONSE_BYTES:
+            chunks.append(await reader.readexactly(MAX_RESPONSE_BYTES - total))
+            return b"".join(chunks), False
+        chunks.append(await reader.readexactly(size))
+        total += size
+        await reader.readexactly(2)
@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 
 from flask import current_app
 
-from app.utils.logging import log_error_message, log_info_message
+from app.utils.logging import log_scheduler_message
 
 
 # ---------------------------------------------------------------------
@@ -32,11 +32,11 @@ def create_backup():
         dest_file = os.path.join(dest_dir, f"grylli-backup-{timestamp}.db")
 
         shutil.copy2(src, dest_file)
-        log_info_message(f"Scheduler [CreateBackup] - Success - Backup created at: {dest_file}")
+        log_scheduler_message("CreateBackup", "Success", f"Backup created at: {dest_file}")
         return dest_file
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [CreateBackup] - Failure - Failed to create database backup: {e}"
+        log_scheduler_message(
+            "CreateBackup", "Failure", f"Failed to create database backup: {e}"
         )
         return None
 
@@ -59,13 +59,13 @@ def get_backup_files():
             f for f in os.listdir(dir_path) if f.startswith("grylli-backup-") and f.endswith(".db")
         ]
         sorted_files = sorted(files, reverse=True)
-        log_info_message(
-            f"Scheduler [GetBackupFiles] - Success - Found {len(sorted_files)} backup file(s)."
+        log_scheduler_message(
+            "GetBackupFiles", "Success", f"Found {len(sorted_files)} backup file(s)."
         )
         return sorted_files
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [GetBackupFiles] - Failure - Failed to list backup files: {e}"
+        log_scheduler_message(
+            "GetBackupFiles", "Failure", f"Failed to list backup files: {e}"
         )
         return []
 
@@ -86,13 +86,13 @@ def delete_old_backups(days_to_keep=7):
     try:
         dir_path = current_app.config["BACKUP_DIR"]
         if not os.path.exists(dir_path):
-            log_info_message(
-                "Scheduler [DeleteOldBackups] - Success - Backup directory does not exist. Skipping deletion."
+            log_scheduler_message(
+                "DeleteOldBackups", "Success", "Backup directory does not exist. Skipping deletion."
             )
             return 0
 
-        log_info_message(
-            f"Scheduler [DeleteOldBackups] - Start - Pruning backups older than {days_to_keep} day(s)."
+        log_scheduler_message(
+            "DeleteOldBackups", "Start", f"Pruning backups older than {days_to_keep} day(s)."
         )
 
         now = datetime.now()
@@ -107,23 +107,23 @@ def delete_old_backups(days_to_keep=7):
                 mtime = datetime.fromtimestamp(os.path.getmtime(path))
                 if (now - mtime).days > days_to_keep:
                     os.remove(path)
-                    log_info_message(
-                        f"Scheduler [DeleteOldBackups] - Success - Deleted old backup: {f}"
+                    log_scheduler_message(
+                        "DeleteOldBackups", "Success", f"Deleted old backup: {f}"
                     )
                     deleted_count += 1
             except Exception as e:
-                log_error_message(
-                    f"ERROR - Scheduler [DeleteOldBackups] - Failure - Failed to delete backup {f}: {e}"
+                log_scheduler_message(
+                    "DeleteOldBackups", "Failure", f"Failed to delete backup {f}: {e}"
                 )
                 continue
 
-        log_info_message(
-            f"Scheduler [DeleteOldBackups] - Success - Cleanup complete. Deleted {deleted_count} old backup(s)."
+        log_scheduler_message(
+            "DeleteOldBackups", "Success", f"Cleanup complete. Deleted {deleted_count} old backup(s)."
         )
         return deleted_count
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [DeleteOldBackups] - Failure - Unexpected error during backup cleanup: {e}"
+        log_scheduler_message(
+            "DeleteOldBackups", "Failure", f"Unexpected error during backup cleanup: {e}"
         )
         return 0
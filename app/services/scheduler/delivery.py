@@ -0,0 +1,168 @@
+# ---------------------------------------------------------------------
+# delivery.py
+# app/services/scheduler/delivery.py
+# Bounded parallel delivery stage for scheduler notifications
+# ---------------------------------------------------------------------
+
+import threading
+import time
+import traceback
+
+# ------------------------ Imports (PEP8 order) -----------------------
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from app.config import DELIVERY_MAX_PER_HOST, DELIVERY_MAX_WORKERS, DELIVERY_WAIT_GRACE_SECONDS
+from app.utils.logging import log_scheduler_message
+
+# A delivery is a plain dict built on the scheduler thread (where the ORM session
+# lives) — by the outbox drain, from a stored row — and executed on a pool thread:
+#
+#   {"kind": "webhook", "label": "My hook", "host": "example.com",
+#    "timeout": 5, "send": <callable returning True/False>}
+#
+# `send` must not touch the database or Flask context — everything it needs
+# (decrypted content, endpoints, SMTP credentials) is captured up front.
+
+_executor = None
+_executor_lock = threading.Lock()
+_host_semaphores = {}
+
+
+# ---------------------------------------------------------------------
+# make_delivery
+# ---------------------------------------------------------------------
+def make_delivery(kind, label, target, send, timeout):
+    """
+    Build a delivery dict. `target` is a URL or hostname used for the per-host cap.
+    """
+    host = urlparse(target).hostname if "://" in target else target
+    return {
+        "kind": kind,
+        "label": label,
+        "host": (host or target or "unknown").lower(),
+        "timeout": timeout,
+        "send": send,
+    }
+
+
+# ---------------------------------------------------------------------
+# _get_executor
+# ---------------------------------------------------------------------
+def _get_executor():
+    """
+    Lazily create the shared delivery pool. Its size is the global concurrency cap.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DELIVERY_MAX_WORKERS, thread_name_prefix="grylli-delivery"
+            )
+        return _executor
+
+
+# ---------------------------------------------------------------------
+# _host_semaphore
+# ---------------------------------------------------------------------
+def _host_semaphore(host):
+    with _executor_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(DELIVERY_MAX_PER_HOST)
+        return _host_semaphores[host]
+
+
+# ---------------------------------------------------------------------
+# _run_one (pool thread)
+# ---------------------------------------------------------------------
+def _run_one(delivery, deadline):
+    """
+    Execute a single delivery under its host's concurrency cap.
+    Returns (ok, error). A delivery that only gets its slot after `deadline`
+    (when run_deliveries stops waiting) is not sent at all.
+    """
+    semaphore = _host_semaphore(delivery["host"])
+    wait_for = min(delivery["timeout"], deadline - time.monotonic())
+    if wait_for <= 0 or not semaphore.acquire(timeout=wait_for):
+        return False, f"timed out waiting for a free slot on {delivery['host']}"
+
+    try:
+        if time.monotonic() >= deadline:
+            return False, f"not started within the wait for {delivery['host']}"
+        return bool(delivery["send"]()), None
+    except Exception as e:
+        log_scheduler_message(
+            "Delivery", "Failure", f"{delivery['kind']} [{delivery['label']}] raised: {e}\n{traceback.format_exc()}"
+        )
+        return False, str(e)
+    finally:
+        semaphore.release()
+
+
+# ---------------------------------------------------------------------
+# run_deliveries
+# ---------------------------------------------------------------------
+def run_deliveries(batches):
+    """
+    Fan out every delivery of every item onto the pool and wait for all of them.
+
+    Args:
+        batches: list of (label, [delivery, ...]) — one entry per scheduled item.
+
+    Returns:
+        list of result lists aligned with `batches`; each result is a dict
+        {"kind", "label", "ok", "error", "pending"}. Once the slowest timeout
+        (plus DELIVERY_WAIT_GRACE_SECONDS) has passed, deliveries that never
+        started are cancelled and reported as failed (nothing was sent). One
+        still in flight may yet succeed: it is reported with pending=True and
+        its `future`, which resolves to (ok, error) when it finishes.
+    """
+    started = time.monotonic()
+    executor = _get_executor()
+
+    longest = max((d["timeout"] for _, deliveries in batches for d in deliveries), default=0)
+    deadline = started + longest + DELIVERY_WAIT_GRACE_SECONDS
+
+    submitted = []
+    futures = []
+    for _, deliveries in batches:
+        submitted.append([(d, executor.submit(_run_one, d, deadline)) for d in deliveries])
+        futures += [future for _, future in submitted[-1]]
+
+    if futures:
+        wait(futures, timeout=deadline - time.monotonic())
+
+    results = []
+    for (label, _), item_futures in zip(batches, submitted):
+        item_results = []
+        for delivery, future in item_futures:
+            result = {"kind": delivery["kind"], "label": delivery["label"], "pending": False}
+            if future.done():
+                result["ok"], result["error"] = future.result()
+            elif future.cancel():
+                result["ok"], result["error"] = False, f"not started within {delivery['timeout']}s"
+            else:
+                result.update(ok=False, error=None, pending=True, future=future)
+            item_results.append(result)
+        results.append(item_results)
+
+        for r in item_results:
+            if r["pending"]:
+                log_scheduler_message(
+                    "Delivery", "Success", f"{label}: {r['kind']} [{r['label']}] still in flight, outcome recorded when it finishes"
+                )
+        failed = [r for r in item_results if not r["ok"] and not r["pending"]]
+        for r in failed:
+            log_scheduler_message(
+                "Delivery", "Failure", f"{label}: {r['kind']} [{r['label']}] failed: {r['error'] or 'not delivered'}"
+            )
+        if item_results:
+            log_scheduler_message(
+                "Delivery", "Success", f"{label}: {sum(1 for r in item_results if r['ok'])}/{len(item_results)} destination(s) delivered"
+            )
+
+    if futures:
+        log_scheduler_message(
+            "Delivery", "Success", f"{len(futures)} delivery(ies) for {len(batches)} item(s) finished in {time.monotonic() - started:.2f}s"
+        )
+    return results
@@ -5,17 +5,75 @@
 # ---------------------------------------------------------------------
 
 import os
-import smtplib
 import traceback
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from types import SimpleNamespace
 from urllib.parse import urlencode
 
+from app.config import DELIVERY_SMTP_TIMEOUT_SECONDS
 from app.extensions import db
 from app.models import EmailMessage, User, UserMailSettings
-from app.utils.logging import log_debug_message, log_error_message, log_info_message
+from app.services.smtp.pool import send_message, tls_mode_for
+from app.utils.logging import log_debug_message, log_error_message, log_scheduler_message
+
+
+# ---------------------------------------------------------------------
+# _smtp_snapshot (internal helper)
+# ---------------------------------------------------------------------
+def _smtp_snapshot(smtp_settings):
+    """
+    Copy the SMTP settings (with the decrypted password) into a plain dict so the
+    delivery can be stored in the outbox and sent without touching the ORM session.
+    """
+    return {
+        "smtp_host": smtp_settings.smtp_host,
+        "smtp_port": smtp_settings.smtp_port,
+        "smtp_username": smtp_settings.smtp_username,
+        "smtp_password": smtp_settings.smtp_password,
+        "use_tls": smtp_settings.use_tls,
+    }
+
+
+# ---------------------------------------------------------------------
+# _email_delivery (internal helper)
+# ---------------------------------------------------------------------
+def _email_delivery(label, recipient_email, subject, text_body, smtp_settings, **kwargs):
+    """
+    Describe an email as a delivery spec for the outbox (see send_email_payload).
+    """
+    smtp = _smtp_snapshot(smtp_settings)
+    return {
+        "kind": "email",
+        "label": label,
+        "target": smtp["smtp_host"],
+        "payload": {
+            "recipient_email": recipient_email,
+            "subject": subject,
+            "text_body": text_body,
+            "smtp": smtp,
+            **kwargs,
+        },
+    }
+
+
+# ---------------------------------------------------------------------
+# send_email_payload (delivery pool thread)
+# ---------------------------------------------------------------------
+def send_email_payload(recipient_email, subject, text_body, smtp, html_body=None, attachments=None):
+    """
+    Send an email described by an outbox payload. Returns True on success.
+    """
+    return _send_email(
+        recipient_email,
+        subject,
+        text_body,
+        SimpleNamespace(**smtp),
+        html_body=html_body,
+        attachments=attachments,
+    )
 
 
 # ---------------------------------------------------------------------
@@ -64,38 +122,55 @@ def _send_email(
             f"User: {smtp_settings.smtp_username}, TLS: {smtp_settings.use_tls}"
         )
 
-        smtp_class = smtplib.SMTP_SSL if not smtp_settings.use_tls else smtplib.SMTP
-        smtp = smtp_class(smtp_settings.smtp_host, smtp_settings.smtp_port)
-        smtp.ehlo()
-
-        if smtp_settings.use_tls:
-            smtp.starttls()
-
-        smtp.login(smtp_settings.smtp_username, password)
-        smtp.send_message(msg)
-        smtp.quit()
+        # use_tls False means implicit SSL (SMTP_SSL) for user SMTP settings
+        send_message(
+            msg,
+            smtp_settings.smtp_host,
+            smtp_settings.smtp_port,
+            smtp_settings.smtp_username,
+            password,
+            tls_mode_for(smtp_settings.use_tls, implicit_ssl_when_not_tls=True),
+            timeout=DELIVERY_SMTP_TIMEOUT_SECONDS,
+        )
 
-        log_info_message(f"Scheduler [SendEmail] - Success - Email sent to {recipient_email}")
+        log_scheduler_message("SendEmail", "Success", f"Email sent to {recipient_email}")
         return True
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [SendEmail] - Failure - Failed to send email to {recipient_email}: {e}"
+        log_scheduler_message(
+            "SendEmail", "Failure", f"Failed to send email to {recipient_email}: {e}"
         )
         log_error_message(traceback.format_exc())
         return False
 
 
+# ---------------------------------------------------------------------
+# _checkin_url (internal helper)
+# ---------------------------------------------------------------------
+def _checkin_url(user, item):
+    """
+    Build the absolute check-in link for a message or secure email.
+    """
+    fqdn = os.environ.get("FQDN", "http://localhost:5000").rstrip("/")
+    base_url = os.environ.get("BASE_URL", "").strip("/")
+    checkin_type = "email" if isinstance(item, EmailMessage) else "message"
+    params = urlencode({"type": checkin_type, "id": item.id, "user": user.id})
+    return f"{fqdn}/{base_url}/checkin?{params}"
+
+
 # ---------------------------------------------------------------------
 # send_checkin_email
 # ---------------------------------------------------------------------
 def send_checkin_email(user, item):
     """
     Send a check-in reminder email to the user for a pending item (message or secure email).
+
+    Returns:
+        bool: True if the email was sent.
     """
     try:
-        log_info_message(
-            f"Scheduler [SendCheckinEmail] - Success - User '{user.username}' — Sending check-in reminder to {user.email} for {item.label}"
+        log_scheduler_message(
+            "SendCheckinEmail", "Success", f"User '{user.username}' — Sending check-in reminder to {user.email} for {item.label}"
         )
 
         smtp_settings = UserMailSettings.query.filter_by(user_id=user.id).first()
@@ -104,18 +179,13 @@ def send_checkin_email(user, item):
         )
 
         if not smtp_settings or not smtp_settings.enabled:
-            log_error_message(
-                f"ERROR - Scheduler [SendCheckinEmail] - Failure - SMTP settings not found or disabled for user {user.id}"
+            log_scheduler_message(
+                "SendCheckinEmail", "Failure", f"SMTP settings not found or disabled for user {user.id}"
             )
-            return
+            return False
 
         subject = f"[Grylli] Check-in Reminder: {item.label}"
-
-        fqdn = os.environ.get("FQDN", "http://localhost:5000").rstrip("/")
-        base_url = os.environ.get("BASE_URL", "").strip("/")
-        checkin_type = "email" if isinstance(item, EmailMessage) else "message"
-        params = urlencode({"type": checkin_type, "id": item.id, "user": user.id})
-        checkin_url = f"{fqdn}/{base_url}/checkin?{params}"
+        checkin_url = _checkin_url(user, item)
 
         text_body = (
             f"Hello {user.username},\n\n"
@@ -136,74 +206,151 @@ def send_checkin_email(user, item):
 
         success = _send_email(user.email, subject, text_body, smtp_settings, html_body=html_body)
         if not success:
-            log_error_message(
-                f"ERROR - Scheduler [SendCheckinEmail] - Failure - Reminder email failed for {item.label}"
+            log_scheduler_message(
+                "SendCheckinEmail", "Failure", f"Reminder email failed for {item.label}"
             )
+        return bool(success)
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [SendCheckinEmail] - Failure - Exception in send_checkin_email: {e}"
+        log_scheduler_message(
+            "SendCheckinEmail", "Failure", f"Exception in send_checkin_email: {e}"
         )
         log_error_message(traceback.format_exc())
+        return False
 
 
 # ---------------------------------------------------------------------
-# send_secure_email
+# send_checkin_digest
 # ---------------------------------------------------------------------
-def send_secure_email(item):
+def send_checkin_digest(user, items):
     """
-    Send a secure message with attachments to the intended recipient using the owner's SMTP settings.
+    Send one check-in reminder email listing every pending item for the user,
+    each with its own check-in link.
+
+    Returns:
+        bool: True if the email was sent.
+    """
+    try:
+        log_scheduler_message(
+            "SendCheckinDigest", "Success", f"User '{user.username}' — Sending check-in digest for {len(items)} item(s) to {user.email}"
+        )
+
+        smtp_settings = UserMailSettings.query.filter_by(user_id=user.id).first()
+
+        if not smtp_settings or not smtp_settings.enabled:
+            log_scheduler_message(
+                "SendCheckinDigest", "Failure", f"SMTP settings not found or disabled for user {user.id}"
+            )
+            return False
+
+        subject = f"[Grylli] Check-in Reminder: {len(items)} items need your check-in"
+        links = [(item.label, _checkin_url(user, item)) for item in items]
+
+        text_lines = "\n".join(f"- {label}: {url}" for label, url in links)
+        text_body = (
+            f"Hello {user.username},\n\n"
+            f"This is a friendly reminder to check in for the following messages:\n\n"
+            f"{text_lines}\n\n"
+            f"- Grylli"
+        )
+        html_items = "".join(
+            f'<li><strong>{label}</strong> — <a href="{url}">✅ Check in</a></li>' for label, url in links
+        )
+        html_body = f"""
+        <html>
+          <body>
+            <p>Hello {user.username},</p>
+            <p>This is a friendly reminder to check in for the following messages:</p>
+            <ul>{html_items}</ul>
+            <p>- Grylli</p>
+          </body>
+        </html>
+        """
+
+        success = _send_email(user.email, subject, text_body, smtp_settings, html_body=html_body)
+        if not success:
+            log_scheduler_message(
+                "SendCheckinDigest", "Failure", f"Digest email failed for user {user.id}"
+            )
+        return bool(success)
+
+    except Exception as e:
+        log_scheduler_message(
+            "SendCheckinDigest", "Failure", f"Exception in send_checkin_digest: {e}"
+        )
+        log_error_message(traceback.format_exc())
+        return False
+
+
+# ---------------------------------------------------------------------
+# prepare_secure_email
+# ---------------------------------------------------------------------
+def prepare_secure_email(item):
+    """
+    Build the delivery for a secure message with attachments to the intended recipient
+    using the owner's SMTP settings. Returns a list with zero or one delivery.
     """
     try:
         user = db.session.get(User, item.user_id)
         smtp_settings = UserMailSettings.query.filter_by(user_id=user.id).first() if user else None
 
-        log_info_message(
-            f"Scheduler [SendSecureEmail] - Success - User '{user.username}' — Sending email: {item.label} → {item.recipient}"
+        log_scheduler_message(
+            "SendSecureEmail", "Success", f"User '{user.username}' — Sending email: {item.label} → {item.recipient}"
         )
 
         if not smtp_settings or not smtp_settings.enabled:
-            log_error_message(
-                f"ERROR - Scheduler [SendSecureEmail] - Failure - SMTP settings not found or disabled for user {user.id}"
+            log_scheduler_message(
+                "SendSecureEmail", "Failure", f"SMTP settings not found or disabled for user {user.id}"
             )
-            return
+            return []
 
         subject = item.subject
         body = item.body
         upload_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../uploads"))
         attachments = [os.path.join(upload_dir, f.file_path) for f in item.files if f.file_path]
 
-        _send_email(item.recipient, subject, body, smtp_settings, attachments=attachments)
+        return [
+            _email_delivery(
+                f"secure email to {item.recipient}",
+                item.recipient,
+                subject,
+                body,
+                smtp_settings,
+                attachments=attachments,
+            )
+        ]
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [SendSecureEmail] - Failure - Exception in send_secure_email for {getattr(item, 'label', 'unknown')}: {e}"
+        log_scheduler_message(
+            "SendSecureEmail", "Failure", f"Exception in prepare_secure_email for {getattr(item, 'label', 'unknown')}: {e}"
         )
         log_error_message(traceback.format_exc())
+        return []
 
 
 # ---------------------------------------------------------------------
-# send_owner_notice
+# prepare_owner_notice
 # ---------------------------------------------------------------------
-def send_owner_notice(item):
+def prepare_owner_notice(item):
     """
-    Notify the owner via email that their scheduled item was executed due to missed check-in.
+    Build the delivery notifying the owner that their scheduled item was executed due
+    to missed check-in. Returns a list with zero or one delivery.
     """
     try:
         user = db.session.get(User, item.user_id)
         smtp_settings = UserMailSettings.query.filter_by(user_id=user.id).first() if user else None
 
         if not user:
-            log_error_message(
-                f"ERROR - Scheduler [SendOwnerNotice] - Failure - User not found for item {item.label} (user_id={item.user_id})"
+            log_scheduler_message(
+                "SendOwnerNotice", "Failure", f"User not found for item {item.label} (user_id={item.user_id})"
             )
-            return
+            return []
 
         if not smtp_settings or not smtp_settings.enabled:
-            log_error_message(
-                f"ERROR - Scheduler [SendOwnerNotice] - Failure - SMTP settings not found or disabled for user {user.id}"
+            log_scheduler_message(
+                "SendOwnerNotice", "Failure", f"SMTP settings not found or disabled for user {user.id}"
             )
-            return
+            return []
 
         subject = f"[Grylli] Final Notice: {item.label} was executed"
 
@@ -219,57 +366,56 @@ def send_owner_notice(item):
             f"- Grylli"
         )
 
-        log_info_message(
-            f"Scheduler [SendOwnerNotice] - Success - User '{user.username}' — Sent final notice for {item.label} to {user.email}"
+        log_scheduler_message(
+            "SendOwnerNotice", "Success", f"User '{user.username}' — Queued final notice for {item.label} to {user.email}"
         )
-        _send_email(user.email, subject, body, smtp_settings)
+        return [_email_delivery("owner notice", user.email, subject, body, smtp_settings)]
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [SendOwnerNotice] - Failure - Exception in send_owner_notice: {e}"
+        log_scheduler_message(
+            "SendOwnerNotice", "Failure", f"Exception in prepare_owner_notice: {e}"
         )
         log_error_message(traceback.format_exc())
+        return []
 
 
 # ---------------------------------------------------------------------
-# send_reminder_email
+# prepare_reminder_email
 # ---------------------------------------------------------------------
-def send_reminder_email(reminder):
+def prepare_reminder_email(reminder):
     """
-    Sends the reminder content to the owner (reminder.user.email) via SMTP.
-    Used for generic reminders (not EmailMessages).
+    Build the delivery sending the reminder content to the owner (reminder.user.email)
+    via SMTP. Used for generic reminders (not EmailMessages).
+    Returns a list with zero or one delivery.
     """
     try:
         user = db.session.get(User, reminder.user_id)
         smtp = UserMailSettings.query.filter_by(user_id=reminder.user_id, enabled=True).first()
 
         if not user:
-            log_error_message(
-                f"ERROR - Scheduler [SendReminderEmail] - Failure - Reminder email failed — user not found for reminder {reminder.label}"
+            log_scheduler_message(
+                "SendReminderEmail", "Failure", f"Reminder email failed — user not found for reminder {reminder.label}"
             )
-            return
+            return []
 
         if not smtp:
-            log_error_message(
-                f"ERROR - Scheduler [SendReminderEmail] - Failure - Reminder email failed — no SMTP config for user {reminder.user_id}"
+            log_scheduler_message(
+                "SendReminderEmail", "Failure", f"Reminder email failed — no SMTP config for user {reminder.user_id}"
             )
-            return
+            return []
 
         subject = f"[Grylli] {reminder.subject}"
         body = reminder.content or f"You have a reminder: {reminder.label}"
 
-        log_info_message(
-            f"Scheduler [SendReminderEmail] - Success - User '{user.username}' — Sending reminder email to {user.email} via SMTP config {smtp.id}"
+        log_scheduler_message(
+            "SendReminderEmail", "Success", f"User '{user.username}' — Sending reminder email to {user.email} via SMTP config {smtp.id}"
         )
-        success = _send_email(user.email, subject, body, smtp)
-
-        if not success:
-            log_error_message(
-                f"ERROR - Scheduler [SendReminderEmail] - Failure - Reminder email failed to send for {reminder.label}"
-            )
+        return [_email_delivery("reminder email", user.email, subject, body, smtp)]
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [SendReminderEmail] - Failure - Exception in send_reminder_email: {e}"
+        log_scheduler_message(
+            "SendReminderEmail", "Failure", f"Exception in prepare_reminder_email: {e}"
         )
         log_error_message(traceback.format_exc())
+        return []
+
@@ -0,0 +1,457 @@
+# ---------------------------------------------------------------------
+# outbox.py
+# app/services/scheduler/outbox.py
+# Durable delivery outbox: transactional enqueue, retrying drain
+# ---------------------------------------------------------------------
+
+import random
+import threading
+import traceback
+
+# ------------------------ Imports (PEP8 order) -----------------------
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+from sqlalchemy import and_, func, or_
+
+from app.config import (
+    DELIVERY_APPRISE_TIMEOUT_SECONDS,
+    DELIVERY_SMTP_TIMEOUT_SECONDS,
+    DELIVERY_WAIT_GRACE_SECONDS,
+    DELIVERY_WEBHOOK_TIMEOUT_SECONDS,
+    OUTBOX_BACKOFF_BASE_SECONDS,
+    OUTBOX_BACKOFF_MAX_SECONDS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETENTION_DAYS,
+    WEBHOOK_ASYNC_ENABLED,
+    WEBHOOK_BATCH_LINGER_SECONDS,
+    WEBHOOK_BATCH_MAX_SIZE,
+)
+from app.extensions import db
+from app.models import (
+    OUTBOX_DEAD,
+    OUTBOX_IN_PROGRESS,
+    OUTBOX_PENDING,
+    OUTBOX_SENT,
+    DeliveryOutbox,
+    as_utc,
+)
+from app.services.scheduler.apprise_utils import send_apprise_notification
+from app.services.scheduler.async_webhooks import submit_webhooks
+from app.services.scheduler.delivery import make_delivery, run_deliveries
+from app.services.scheduler.email_utils import send_email_payload
+from app.services.scheduler.run_ledger import note_error, note_item, note_scanned
+from app.services.scheduler.webhook_utils import WEBHOOK_BATCH_KIND, post_webhook
+from app.utils.logging import log_scheduler_message
+
+# Sender and timeout per delivery kind; payload keys match the sender's arguments
+SENDERS = {
+    "apprise": (send_apprise_notification, DELIVERY_APPRISE_TIMEOUT_SECONDS),
+    "webhook": (post_webhook, DELIVERY_WEBHOOK_TIMEOUT_SECONDS),
+    WEBHOOK_BATCH_KIND: (post_webhook, DELIVERY_WEBHOOK_TIMEOUT_SECONDS),
+    "email": (send_email_payload, DELIVERY_SMTP_TIMEOUT_SECONDS),
+}
+
+# Outcomes of sends that were still in flight when their drain run stopped
+# waiting: row id -> (ok, error), applied at the start of the next drain run
+_late_results = {}
+_late_results_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------
+# enqueue_deliveries
+# ---------------------------------------------------------------------
+def enqueue_deliveries(specs, source_type, source):
+    """
+    Add one outbox row per delivery spec to the current session.
+
+    Does not commit: the caller commits the rows together with the state change
+    that produced them (executed_at, last_sent_at, ...), so either both persist
+    or neither does.
+
+    Args:
+        specs: Delivery specs from the prepare_* helpers ({"kind", "label", "target",
+            "payload"}, plus "destination_id" for webhooks).
+        source_type: "message", "email" or "reminder".
+        source: The item that triggered the deliveries.
+
+    Returns:
+        int: Number of rows enqueued.
+    """
+    now = datetime.now(timezone.utc)
+
+    for spec in specs:
+        next_attempt_at = now
+        if spec["kind"] == WEBHOOK_BATCH_KIND:
+            next_attempt_at = _batch_window(spec["destination_id"], now)
+
+        row = DeliveryOutbox(
+            user_id=source.user_id,
+            source_type=source_type,
+            source_id=source.id,
+            source_label=(source.label or "")[:100],
+            kind=spec["kind"],
+            destination_label=(spec["label"] or "")[:100],
+            target=(spec["target"] or "")[:255],
+            destination_id=spec.get("destination_id"),
+            status=OUTBOX_PENDING,
+            attempts=0,
+            next_attempt_at=next_attempt_at,
+        )
+        row.payload = spec["payload"]
+        db.session.add(row)
+
+    return len(specs)
+
+
+# ---------------------------------------------------------------------
+# _batch_window
+# ---------------------------------------------------------------------
+def _batch_window(webhook_id, now):
+    """
+    Send time for a batched webhook row: join the window already open for the
+    webhook, or open a new one WEBHOOK_BATCH_LINGER_SECONDS from now.
+    """
+    open_until = (
+        db.session.query(func.min(DeliveryOutbox.next_attempt_at))
+        .filter(
+            DeliveryOutbox.kind == WEBHOOK_BATCH_KIND,
+            DeliveryOutbox.destination_id == webhook_id,
+            DeliveryOutbox.status == OUTBOX_PENDING,
+            DeliveryOutbox.attempts == 0,
+            DeliveryOutbox.next_attempt_at > now,
+        )
+        .scalar()
+    )
+    if open_until is not None:
+        return as_utc(open_until)
+    return now + timedelta(seconds=WEBHOOK_BATCH_LINGER_SECONDS)
+
+
+# ---------------------------------------------------------------------
+# next_pending_attempt
+# ---------------------------------------------------------------------
+def next_pending_attempt():
+    """
+    Earliest next_attempt_at among pending rows (aware UTC), or None.
+    """
+    earliest = (
+        db.session.query(func.min(DeliveryOutbox.next_attempt_at))
+        .filter(DeliveryOutbox.status == OUTBOX_PENDING)
+        .scalar()
+    )
+    return as_utc(earliest) if earliest is not None else None
+
+
+# ---------------------------------------------------------------------
+# _backoff_seconds
+# ---------------------------------------------------------------------
+def _backoff_seconds(attempts):
+    """
+    Exponential backoff with full jitter: random in [base/2, base * 2^(attempts-1)],
+    capped at OUTBOX_BACKOFF_MAX_SECONDS.
+    """
+    ceiling = min(OUTBOX_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)), OUTBOX_BACKOFF_MAX_SECONDS)
+    return random.uniform(OUTBOX_BACKOFF_BASE_SECONDS / 2, max(ceiling, OUTBOX_BACKOFF_BASE_SECONDS))
+
+
+# ---------------------------------------------------------------------
+# _claim_due_rows
+# ---------------------------------------------------------------------
+def _claim_due_rows(now):
+    """
+    Lease up to OUTBOX_BATCH_SIZE due rows. Rows left in progress by a run that
+    never finished (crash, restart) are reclaimed once their lease expires.
+
+    Webhooks with batched rows get topped up to WEBHOOK_BATCH_MAX_SIZE
+    rows beyond that limit, so a mass expiry still goes out in full batches.
+    """
+    due = or_(
+        and_(
+            DeliveryOutbox.status == OUTBOX_PENDING,
+            DeliveryOutbox.next_attempt_at <= now,
+        ),
+        and_(
+            DeliveryOutbox.status == OUTBOX_IN_PROGRESS,
+            DeliveryOutbox.locked_until <= now,
+        ),
+    )
+    rows = (
+        DeliveryOutbox.query.filter(due)
+        .order_by(DeliveryOutbox.next_attempt_at)
+        .limit(OUTBOX_BATCH_SIZE)
+        .all()
+    )
+
+    claimed = {}
+    for row in rows:
+        if row.kind == WEBHOOK_BATCH_KIND and row.destination_id is not None:
+            claimed[row.destination_id] = claimed.get(row.destination_id, 0) + 1
+
+    ids = [row.id for row in rows]
+    for webhook_id, count in claimed.items():
+        if count % WEBHOOK_BATCH_MAX_SIZE == 0:
+            continue
+        rows += (
+            DeliveryOutbox.query.filter(
+                due,
+                DeliveryOutbox.kind == WEBHOOK_BATCH_KIND,
+                DeliveryOutbox.destination_id == webhook_id,
+                DeliveryOutbox.id.notin_(ids),
+            )
+            .order_by(DeliveryOutbox.next_attempt_at)
+            .limit(WEBHOOK_BATCH_MAX_SIZE - count % WEBHOOK_BATCH_MAX_SIZE)
+            .all()
+        )
+
+    lease_until = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+    for row in rows:
+        row.status = OUTBOX_IN_PROGRESS
+        row.locked_until = lease_until
+    db.session.commit()
+    return rows
+
+
+# ---------------------------------------------------------------------
+# Late results (sends still in flight when a drain run stopped waiting)
+# ---------------------------------------------------------------------
+def _watch_in_flight(row_ids, future, unpack=None):
+    """
+    Record the outcome of an in-flight send for `row_ids` once it finishes. The
+    rows stay leased (in progress) until then, so they are not sent twice.
+
+    `future` resolves to (ok, error) for all rows, or to a value that
+    `unpack` turns into one (ok, error) per row.
+    """
+
+    def done(finished):
+        try:
+            result = finished.result()
+            outcomes = unpack(result) if unpack else [result] * len(row_ids)
+        except Exception as e:
+            outcomes = [(False, str(e))] * len(row_ids)
+        with _late_results_lock:
+            for row_id, outcome in zip(row_ids, outcomes):
+                _late_results[row_id] = outcome
+
+    future.add_done_callback(done)
+
+
+def _apply_late_results(now):
+    """Record the outcomes collected by _watch_in_flight since the last run."""
+    with _late_results_lock:
+        late = dict(_late_results)
+        _late_results.clear()
+    if not late:
+        return
+
+    counts = {"sent": 0, "retried": 0, "dead": 0}
+    for row in DeliveryOutbox.query.filter(DeliveryOutbox.id.in_(late)).all():
+        if row.status != OUTBOX_IN_PROGRESS:
+            continue  # Lease expired and the row was already reclaimed
+        ok, error = late[row.id]
+        counts[_record_outcome(row, [{"ok": ok, "error": error}], now)] += 1
+    db.session.commit()
+    log_scheduler_message(
+        "DeliveryOutbox", "Success", f"Recorded {len(late)} late delivery result(s): {counts['sent']} sent, {counts['retried']} retrying, {counts['dead']} dead-lettered"
+    )
+
+
+def _webhook_outcomes(unit_rows, webhook_results):
+    """(ok, error) per row, from the engine's per-request results."""
+    return [
+        (r["ok"], r["error"]) for ids, r in zip(unit_rows, webhook_results) for _ in ids
+    ]
+
+
+# ---------------------------------------------------------------------
+# _record_outcome
+# ---------------------------------------------------------------------
+def _record_outcome(row, item_results, finished):
+    """
+    Mark a row sent, rescheduled with backoff, or dead-lettered after
+    OUTBOX_MAX_ATTEMPTS. Returns "sent", "retried" or "dead".
+    """
+    row.attempts += 1
+    row.locked_until = None
+
+    if item_results and item_results[0]["ok"]:
+        row.status = OUTBOX_SENT
+        row.sent_at = finished
+        row.last_error = None
+        note_item("Send", "outbox", row.id, f"{row.kind} [{row.destination_label}] for {row.source_type} '{row.source_label}'")
+        return "sent"
+
+    row.last_error = (
+        item_results[0]["error"] if item_results else "invalid outbox payload"
+    ) or "not delivered"
+
+    if row.attempts >= OUTBOX_MAX_ATTEMPTS or not item_results:
+        row.status = OUTBOX_DEAD
+        log_scheduler_message(
+            "DeliveryOutbox", "Failure", f"Dead-lettered {row.kind} [{row.destination_label}] for {row.source_type} '{row.source_label}' after {row.attempts} attempt(s): {row.last_error}"
+        )
+        note_error("DeadLetter", row.last_error, "outbox", row.id)
+        return "dead"
+
+    row.status = OUTBOX_PENDING
+    row.next_attempt_at = finished + timedelta(seconds=_backoff_seconds(row.attempts))
+    log_scheduler_message(
+        "DeliveryOutbox", "Success", f"Retry {row.attempts}/{OUTBOX_MAX_ATTEMPTS} for {row.kind} [{row.destination_label}] scheduled at {row.next_attempt_at.isoformat()}"
+    )
+    note_error("Retry", row.last_error, "outbox", row.id)
+    return "retried"
+
+
+# ---------------------------------------------------------------------
+# drain_delivery_outbox
+# ---------------------------------------------------------------------
+def drain_delivery_outbox():
+    """
+    Deliver one batch of due outbox rows — webhooks on the async engine, email
+    and Apprise on the bounded delivery pool — and record the outcome: sent, rescheduled with backoff, or dead-lettered after
+    OUTBOX_MAX_ATTEMPTS.
+
+    Returns:
+        int: Number of rows processed.
+    """
+    now = datetime.now(timezone.utc)
+    _apply_late_results(now)
+    rows = _claim_due_rows(now)
+    note_scanned(len(rows))
+    if not rows:
+        _prune_sent_rows(now)
+        return 0
+
+    # One unit per outbound request: (row indices, kind, payload). Batched webhook
+    # rows for the same endpoint are merged into units of WEBHOOK_BATCH_MAX_SIZE.
+    units = []
+    batched = {}
+    results = [[] for _ in rows]
+
+    for index, row in enumerate(rows):
+        try:
+            payload = row.payload
+            if row.kind not in SENDERS:
+                raise ValueError(f"unknown delivery kind '{row.kind}'")
+        except Exception as e:
+            log_scheduler_message(
+                "DeliveryOutbox", "Failure", f"Cannot load outbox row {row.id}: {e}\n{traceback.format_exc()}"
+            )
+            note_error("Load", str(e), "outbox", row.id)
+            continue
+
+        if row.kind == WEBHOOK_BATCH_KIND:
+            batched.setdefault(payload["endpoint"], []).append((index, payload))
+        else:
+            units.append(([index], row.kind, payload))
+
+    for endpoint, members in batched.items():
+        for start in range(0, len(members), WEBHOOK_BATCH_MAX_SIZE):
+            chunk = members[start : start + WEBHOOK_BATCH_MAX_SIZE]
+            units.append(
+                (
+                    [index for index, _ in chunk],
+                    WEBHOOK_BATCH_KIND,
+                    {
+                        "endpoint": endpoint,
+                        "label": chunk[0][1]["label"],
+                        "payload": [payload["payload"] for _, payload in chunk],
+                    },
+                )
+            )
+
+    batches = []
+    pool_units = []
+    webhook_requests = []
+    webhook_units = []
+
+    for unit in units:
+        indices, kind, payload = unit
+        sender, timeout = SENDERS[kind]
+
+        if kind in ("webhook", WEBHOOK_BATCH_KIND) and WEBHOOK_ASYNC_ENABLED:
+            webhook_requests.append(dict(payload, timeout=timeout))
+            webhook_units.append(unit)
+            continue
+
+        first = rows[indices[0]]
+        label = first.source_label if len(indices) == 1 else f"{len(indices)} batched item(s)"
+        delivery = make_delivery(
+            kind, first.destination_label, first.target, partial(sender, **payload), timeout
+        )
+        batches.append((label, [delivery]))
+        pool_units.append(unit)
+
+    # Webhooks run on the async engine while the pool handles email and Apprise
+    webhook_future = submit_webhooks(webhook_requests) if webhook_requests else None
+
+    for (indices, _, _), item_results in zip(pool_units, run_deliveries(batches)):
+        for index in indices:
+            results[index] = item_results
+        if item_results and item_results[0]["pending"]:
+            _watch_in_flight([rows[index].id for index in indices], item_results[0]["future"])
+
+    if webhook_future is not None:
+        try:
+            # Each POST is bounded by its own timeout (slot wait + exchange);
+            # this only guards against a stalled engine
+            webhook_results = webhook_future.result(
+                timeout=2 * DELIVERY_WEBHOOK_TIMEOUT_SECONDS + DELIVERY_WAIT_GRACE_SECONDS
+            )
+        except FutureTimeoutError:
+            webhook_results = None
+            unit_rows = [[rows[index].id for index in indices] for indices, _, _ in webhook_units]
+            _watch_in_flight(
+                [row_id for ids in unit_rows for row_id in ids],
+                webhook_future,
+                partial(_webhook_outcomes, unit_rows),
+            )
+            for indices, kind, _ in webhook_units:
+                for index in indices:
+                    results[index] = [{"kind": kind, "label": None, "ok": False, "error": None, "pending": True}]
+        except Exception as e:
+            webhook_results = [
+                {"label": r["label"], "ok": False, "error": f"webhook engine: {e}"}
+                for r in webhook_requests
+            ]
+        for (indices, kind, _), r in zip(webhook_units, webhook_results or []):
+            for index in indices:
+                results[index] = [{"kind": kind, "label": r["label"], "ok": r["ok"], "error": r["error"]}]
+
+    finished = datetime.now(timezone.utc)
+    counts = {"sent": 0, "retried": 0, "dead": 0, "in flight": 0}
+
+    for row, item_results in zip(rows, results):
+        if item_results and item_results[0].get("pending"):
+            # Keep the lease; _apply_late_results records the outcome
+            row.locked_until = finished + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+            counts["in flight"] += 1
+            continue
+        counts[_record_outcome(row, item_results, finished)] += 1
+
+    db.session.commit()
+    log_scheduler_message(
+        "DeliveryOutbox", "Success", f"Processed {len(rows)} row(s): {counts['sent']} sent, {counts['retried']} retrying, {counts['dead']} dead-lettered, {counts['in flight']} still in flight"
+    )
+    return len(rows)
+
+
+# ---------------------------------------------------------------------
+# _prune_sent_rows
+# ---------------------------------------------------------------------
+def _prune_sent_rows(now):
+    """
+    Delete delivered rows older than OUTBOX_RETENTION_DAYS. Dead rows are kept for
+    inspection.
+    """
+    cutoff = now - timedelta(days=OUTBOX_RETENTION_DAYS)
+    deleted = DeliveryOutbox.query.filter(
+        DeliveryOutbox.status == OUTBOX_SENT, DeliveryOutbox.sent_at < cutoff
+    ).delete(synchronize_session=False)
+    if deleted:
+        db.session.commit()
+        log_scheduler_message("DeliveryOutbox", "Success", f"Pruned {deleted} delivered row(s)")
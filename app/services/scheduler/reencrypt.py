@@ -0,0 +1,352 @@
+# ---------------------------------------------------------------------
+# reencrypt.py
+# app/services/scheduler/reencrypt.py
+# Background re-encryption of encrypted columns (cipher migration, key rotation)
+# ---------------------------------------------------------------------
+
+import fcntl
+import json
+import os
+import time
+import traceback
+
+# ------------------------ Imports (PEP8 order) -----------------------
+from contextlib import contextmanager
+
+from sqlalchemy import select, update
+
+from app.config import REENCRYPT_BATCH_SIZE, REENCRYPT_CHECKPOINT_PATH, REENCRYPT_THROTTLE_SECONDS
+from app.extensions import db
+from app.models import (
+    AppriseURL,
+    DeliveryOutbox,
+    EmailMessage,
+    Message,
+    Reminder,
+    SystemConfig,
+    User,
+    UserMailSettings,
+    Webhook,
+)
+from app.services.encryption import ENVELOPE_V2, decrypt, encrypt, key_fingerprint, needs_reencrypt
+from app.services.scheduler.run_ledger import note_counts, note_error
+from app.utils.logging import log_scheduler_message
+
+# (model, column name, extra filter) for every column holding encrypt() output
+ENCRYPTED_COLUMNS = [
+    (Message, "subject", None),
+    (Message, "content", None),
+    (EmailMessage, "subject", None),
+    (EmailMessage, "body", None),
+    (EmailMessage, "recipient", None),
+    (Reminder, "subject", None),
+    (Reminder, "content", None),
+    (AppriseURL, "url", None),
+    (Webhook, "endpoint", None),
+    (UserMailSettings, "smtp_password", None),
+    (User, "mfa_recovery_codes", None),
+    (DeliveryOutbox, "payload", None),
+    (SystemConfig, "value", lambda: SystemConfig.is_sensitive.is_(True)),
+]
+
+# Every Fernet token starts with this (version byte 0x80 + timestamp). Values
+# without it and not yet current (e.g. hashed MFA recovery codes) are left alone.
+FERNET_TOKEN_PREFIX = "gAAAAA"
+
+# Keyset cursor per column ("table.column" -> highest id examined), persisted to
+# REENCRYPT_CHECKPOINT_PATH after every batch so a restart resumes where it left
+# off. Ids that could not be re-encrypted are kept under "failed" and retried
+# once the scan is over; the pass only counts as completed when none remain.
+# The checkpoint belongs to one key fingerprint; a new key set starts over.
+# Only the holder of checkpoint_lock() may run a pass.
+_checkpoint = None
+
+
+# ---------------------------------------------------------------------
+# checkpoint_lock
+# ---------------------------------------------------------------------
+@contextmanager
+def checkpoint_lock(blocking=True):
+    """
+    Hold an exclusive flock on REENCRYPT_CHECKPOINT_PATH + ".lock", so the
+    scheduler job and tools/rotate_encryption_key.py never run a pass (and
+    write the checkpoint) at the same time.
+
+    Yields True once the lock is held, or False straight away when another
+    process holds it and `blocking` is False. The checkpoint is re-read from
+    disk after locking, since the other process may have moved it on.
+    """
+    global _checkpoint
+    with open(f"{REENCRYPT_CHECKPOINT_PATH}.lock", "a", encoding="utf-8") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            _checkpoint = None
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ---------------------------------------------------------------------
+# _load_checkpoint / _save_checkpoint
+# ---------------------------------------------------------------------
+def _load_checkpoint():
+    global _checkpoint
+    if _checkpoint is not None and _checkpoint["fingerprint"] == key_fingerprint():
+        return _checkpoint
+
+    _checkpoint = {
+        "fingerprint": key_fingerprint(),
+        "cursors": {},
+        "failed": {},
+        "scanned": False,
+        "completed": False,
+    }
+    try:
+        with open(REENCRYPT_CHECKPOINT_PATH, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("fingerprint") == _checkpoint["fingerprint"]:
+            _checkpoint.update(
+                cursors=saved.get("cursors", {}),
+                failed=saved.get("failed", {}),
+                scanned=saved.get("scanned", False),
+                completed=saved.get("completed", False),
+            )
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log_scheduler_message("Reencrypt", "Failure", f"Unreadable checkpoint, starting over: {e}")
+    return _checkpoint
+
+
+def _save_checkpoint():
+    tmp_path = f"{REENCRYPT_CHECKPOINT_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_checkpoint, f)
+    os.replace(tmp_path, REENCRYPT_CHECKPOINT_PATH)
+
+
+# ---------------------------------------------------------------------
+# _rewrite_value
+# ---------------------------------------------------------------------
+def _rewrite_value(table, name, row_id, stored):
+    """
+    Rewrite one stored value under the current format and key. Returns the number
+    of rows updated (0 when the value is already current or changed meanwhile);
+    raises when the value cannot be decrypted.
+    """
+    if not (
+        stored.startswith(FERNET_TOKEN_PREFIX) or stored.startswith(ENVELOPE_V2)
+    ) or not needs_reencrypt(stored):
+        return 0
+
+    fresh = encrypt(decrypt(stored))
+    column = table.c[name]
+    # Guarded on the old value so a concurrent edit is never overwritten
+    result = db.session.execute(
+        update(table)
+        .where(table.c.id == row_id, column == stored)
+        .values({name: fresh})
+    )
+    return result.rowcount
+
+
+# ---------------------------------------------------------------------
+# _reencrypt_column
+# ---------------------------------------------------------------------
+def _reencrypt_column(model, name, extra, limit):
+    """
+    Examine up to `limit` rows past the column's cursor and rewrite values that
+    are not in the current format. Returns (examined, rewritten, failed).
+    """
+    table = model.__table__
+    column = table.c[name]
+    key = f"{table.name}.{name}"
+    checkpoint = _load_checkpoint()
+    cursors = checkpoint["cursors"]
+
+    query = (
+        select(table.c.id, column)
+        .where(table.c.id > cursors.get(key, 0), column.isnot(None), column != "")
+        .order_by(table.c.id)
+        .limit(limit)
+    )
+    if extra is not None:
+        query = query.where(extra())
+
+    rows = db.session.execute(query).all()
+    rewritten = failed = 0
+
+    for row_id, stored in rows:
+        cursors[key] = row_id
+        try:
+            rewritten += _rewrite_value(table, name, row_id, stored)
+        except Exception as e:
+            failed += 1
+            log_scheduler_message(
+                "Reencrypt", "Failure", f"{table.name}.{name} id={row_id} could not be re-encrypted: {e}"
+            )
+            note_error("Reencrypt", str(e), table.name, row_id)
+            failed_ids = checkpoint["failed"].setdefault(key, [])
+            if row_id not in failed_ids:
+                failed_ids.append(row_id)
+
+    # One short write transaction per batch keeps SQLite's lock brief
+    db.session.commit()
+    _save_checkpoint()
+    return len(rows), rewritten, failed
+
+
+# ---------------------------------------------------------------------
+# _retry_failed
+# ---------------------------------------------------------------------
+def _retry_failed(model, name):
+    """
+    Retry the ids a previous scan could not re-encrypt (e.g. before a missing
+    old key was added back). Returns (rewritten, still_failing).
+    """
+    table = model.__table__
+    column = table.c[name]
+    key = f"{table.name}.{name}"
+    failed = _load_checkpoint()["failed"]
+    if not failed.get(key):
+        return 0, 0
+
+    rows = db.session.execute(
+        select(table.c.id, column).where(table.c.id.in_(failed[key]))
+    ).all()
+    rewritten = 0
+    still_failing = []
+
+    # Ids no longer in the table (deleted rows) drop out of the list here
+    for row_id, stored in rows:
+        if not stored:
+            continue
+        try:
+            rewritten += _rewrite_value(table, name, row_id, stored)
+        except Exception as e:
+            still_failing.append(row_id)
+            log_scheduler_message(
+                "Reencrypt", "Failure", f"{table.name}.{name} id={row_id} still cannot be re-encrypted: {e}"
+            )
+
+    if still_failing:
+        failed[key] = still_failing
+    else:
+        failed.pop(key, None)
+
+    db.session.commit()
+    _save_checkpoint()
+    return rewritten, len(still_failing)
+
+
+# ---------------------------------------------------------------------
+# reencrypt_batch
+# ---------------------------------------------------------------------
+def reencrypt_batch(batch_size=REENCRYPT_BATCH_SIZE, throttle=REENCRYPT_THROTTLE_SECONDS):
+    """
+    Advance the pass by up to `batch_size` rows per encrypted column, pausing
+    `throttle` seconds between columns so requests get the database in between.
+    Call it while holding checkpoint_lock().
+
+    Once every column has been scanned, later calls only retry the ids that
+    failed; the pass is marked completed when none are left.
+
+    Returns:
+        bool: True once every column has been scanned to the end (check
+        reencrypt_failures() for values that still could not be rewritten).
+    """
+    checkpoint = _load_checkpoint()
+    if checkpoint["completed"]:
+        return True
+
+    if checkpoint["scanned"]:
+        rewritten_total = failed_total = 0
+        for model, name, _ in ENCRYPTED_COLUMNS:
+            try:
+                rewritten, still_failing = _retry_failed(model, name)
+            except Exception as e:
+                db.session.rollback()
+                log_scheduler_message("Reencrypt", "Failure", f"{model.__tablename__}.{name}: {e}")
+                note_error("Reencrypt", str(e), model.__tablename__)
+                return True
+            rewritten_total += rewritten
+            failed_total += still_failing
+            note_counts(acted=rewritten)
+
+        log_scheduler_message(
+            "Reencrypt",
+            "Success" if not failed_total else "Failure",
+            f"Retried failed values: {rewritten_total} re-encrypted, {failed_total} still failing",
+        )
+        checkpoint["completed"] = not checkpoint["failed"]
+        _save_checkpoint()
+        return True
+
+    done = True
+    rewritten_total = failed_total = 0
+
+    for index, (model, name, extra) in enumerate(ENCRYPTED_COLUMNS):
+        if index and throttle:
+            time.sleep(throttle)
+        try:
+            examined, rewritten, failed = _reencrypt_column(model, name, extra, batch_size)
+        except Exception as e:
+            db.session.rollback()
+            log_scheduler_message(
+                "Reencrypt", "Failure", f"{model.__tablename__}.{name}: {e}\n{traceback.format_exc()}"
+            )
+            note_error("Reencrypt", str(e), model.__tablename__)
+            done = False
+            continue
+
+        rewritten_total += rewritten
+        failed_total += failed
+        note_counts(scanned=examined, acted=rewritten)
+        if examined == batch_size:
+            done = False
+
+    if rewritten_total or failed_total:
+        log_scheduler_message(
+            "Reencrypt", "Success", f"Re-encrypted {rewritten_total} value(s), {failed_total} failed"
+        )
+
+    if done:
+        checkpoint["scanned"] = True
+        checkpoint["completed"] = not checkpoint["failed"]
+        _save_checkpoint()
+    return done
+
+
+# ---------------------------------------------------------------------
+# reencrypt_pending
+# ---------------------------------------------------------------------
+def reencrypt_pending():
+    """
+    True unless a pass has already completed under the current key fingerprint
+    (a scan that left values it could not re-encrypt does not count).
+    """
+    return not _load_checkpoint()["completed"]
+
+
+# ---------------------------------------------------------------------
+# reencrypt_progress
+# ---------------------------------------------------------------------
+def reencrypt_progress():
+    """
+    Checkpoint cursors ("table.column" -> last id examined) for status output.
+    """
+    return dict(_load_checkpoint()["cursors"])
+
+
+# ---------------------------------------------------------------------
+# reencrypt_failures
+# ---------------------------------------------------------------------
+def reencrypt_failures():
+    """
+    Ids that could not be re-encrypted ("table.column" -> [id, ...]).
+    """
+    return {key: list(ids) for key, ids in _load_checkpoint()["failed"].items()}
@@ -0,0 +1,255 @@
+# ---------------------------------------------------------------------
+# run_ledger.py
+# app/services/scheduler/run_ledger.py
+# Scheduler run ledger: one scheduler_runs row per job run, plus
+# scheduler_events for the items it acted or failed on
+# ---------------------------------------------------------------------
+
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+# ------------------------ Imports (PEP8 order) -----------------------
+from sqlalchemy import case, delete, func, insert, select
+
+from app.config import (
+    SCHEDULER_EVENTS_MAX_PER_RUN,
+    SCHEDULER_RUN_RETENTION_DAYS,
+    SCHEDULER_RUNS_PAGE_SIZE,
+    SCHEDULER_TREND_DAYS,
+)
+from app.extensions import db
+from app.models import SchedulerEvent, SchedulerRun
+from app.utils.logging import log_scheduler_message
+
+# Seconds between retention sweeps (run after a ledger write)
+PRUNE_INTERVAL_SECONDS = 3600
+DETAIL_MAX_LENGTH = 2000
+
+_runs = SchedulerRun.__table__
+_events = SchedulerEvent.__table__
+
+# The run the current scheduler thread is recording, if any
+_local = threading.local()
+_next_prune = 0.0
+
+
+# ---------------------------------------------------------------------
+# _RunRecord
+# ---------------------------------------------------------------------
+class _RunRecord:
+    """
+    Counters and events for one run, kept in memory and written in a single
+    transaction when the run ends.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.monotonic()
+        self.scanned = 0
+        self.acted = 0
+        self.errors = 0
+        self.events = []
+
+    def add_event(self, action, status, item_type, item_id, detail):
+        if len(self.events) >= SCHEDULER_EVENTS_MAX_PER_RUN:
+            return
+        if detail is not None:
+            detail = str(detail)[:DETAIL_MAX_LENGTH]
+        self.events.append(
+            {
+                "item_type": item_type,
+                "item_id": item_id,
+                "action": action,
+                "status": status,
+                "detail": detail,
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+
+
+def _current():
+    return getattr(_local, "run", None)
+
+
+# ---------------------------------------------------------------------
+# Recording helpers (no-ops outside a scheduler run)
+# ---------------------------------------------------------------------
+def note_scanned(count):
+    """Count `count` items examined by the current run."""
+    run = _current()
+    if run is not None:
+        run.scanned += count
+
+
+def note_item(action, item_type=None, item_id=None, detail=None):
+    """Record an item the current run acted on (reminder sent, item executed...)."""
+    run = _current()
+    if run is not None:
+        run.acted += 1
+        run.add_event(action, "Success", item_type, item_id, detail)
+
+
+def note_error(action, detail, item_type=None, item_id=None):
+    """Record a failure in the current run (one item, or the run itself)."""
+    run = _current()
+    if run is not None:
+        run.errors += 1
+        run.add_event(action, "Failure", item_type, item_id, detail)
+
+
+def note_counts(scanned=0, acted=0, errors=0):
+    """Add to the current run's counters without per-item events."""
+    run = _current()
+    if run is not None:
+        run.scanned += scanned
+        run.acted += acted
+        run.errors += errors
+
+
+# ---------------------------------------------------------------------
+# scheduler_run
+# ---------------------------------------------------------------------
+@contextmanager
+def scheduler_run(job_id):
+    """
+    Record everything inside the block as one run of `job_id`. Runs nested in
+    the same thread (e.g. the wake-up job calling the check-in pass) count
+    towards the outer run.
+    """
+    if _current() is not None:
+        yield _current()
+        return
+
+    run = _RunRecord(job_id)
+    _local.run = run
+    try:
+        yield run
+    except Exception:
+        note_error("Run", traceback.format_exc())
+        raise
+    finally:
+        _local.run = None
+        _save_run(run)
+
+
+# ---------------------------------------------------------------------
+# _save_run
+# ---------------------------------------------------------------------
+def _save_run(run):
+    """
+    Write the run and its events on a connection of their own, so a job that
+    left its session rolled back or mid-transaction still gets its row.
+    """
+    global _next_prune
+    finished_at = datetime.now(timezone.utc)
+    try:
+        # Anything the job left uncommitted is rolled back at app-context
+        # teardown anyway; release it now, or its SQLite write lock would make
+        # the ledger write below wait on this very thread.
+        db.session.rollback()
+        with db.engine.begin() as conn:
+            run_id = conn.execute(
+                insert(_runs).values(
+                    job_id=run.job_id,
+                    status="Failure" if run.errors else "Success",
+                    started_at=run.started_at,
+                    finished_at=finished_at,
+                    duration_ms=int((time.monotonic() - run.started) * 1000),
+                    items_scanned=run.scanned,
+                    items_acted=run.acted,
+                    error_count=run.errors,
+                )
+            ).inserted_primary_key[0]
+            if run.events:
+                conn.execute(insert(_events), [dict(event, run_id=run_id) for event in run.events])
+
+            now = time.monotonic()
+            if now >= _next_prune:
+                _next_prune = now + PRUNE_INTERVAL_SECONDS
+                _prune(conn, finished_at - timedelta(days=SCHEDULER_RUN_RETENTION_DAYS))
+    except Exception as e:
+        log_scheduler_message("RunLedger", "Failure", f"Could not record {run.job_id} run: {e}")
+
+
+def _prune(conn, cutoff):
+    # SQLite does not enforce ON DELETE CASCADE without PRAGMA foreign_keys
+    expired = select(_runs.c.id).where(_runs.c.started_at < cutoff).scalar_subquery()
+    conn.execute(delete(_events).where(_events.c.run_id.in_(expired)))
+    conn.execute(delete(_runs).where(_runs.c.started_at < cutoff))
+
+
+# ---------------------------------------------------------------------
+# get_run_page
+# ---------------------------------------------------------------------
+def get_run_page(job_id=None, before_id=None, page_size=SCHEDULER_RUNS_PAGE_SIZE):
+    """
+    One page of runs, newest first, as (runs, next_before_id). Keyset
+    pagination on id (or on (job_id, id) when filtered), so a page costs the
+    same whatever the table size; next_before_id is None on the last page.
+    """
+    query = SchedulerRun.query
+    if job_id:
+        query = query.filter(SchedulerRun.job_id == job_id)
+    if before_id is not None:
+        query = query.filter(SchedulerRun.id < before_id)
+    runs = query.order_by(SchedulerRun.id.desc()).limit(page_size + 1).all()
+
+    next_before = runs[page_size - 1].id if len(runs) > page_size else None
+    return runs[:page_size], next_before
+
+
+# ---------------------------------------------------------------------
+# get_run_events
+# ---------------------------------------------------------------------
+def get_run_events(run_id):
+    """Events recorded for one run, in order."""
+    return SchedulerEvent.query.filter_by(run_id=run_id).order_by(SchedulerEvent.id).all()
+
+
+# ---------------------------------------------------------------------
+# get_job_trends
+# ---------------------------------------------------------------------
+def get_job_trends(days=SCHEDULER_TREND_DAYS):
+    """
+    Per-job, per-day totals over the last `days` days (a range scan on the
+    started_at index):
+    [{"job_id", "day", "runs", "failed_runs", "avg_ms", "max_ms", "scanned", "acted", "errors"}, ...]
+    ordered by job, newest day first.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    day = func.date(SchedulerRun.started_at)
+    rows = db.session.execute(
+        select(
+            SchedulerRun.job_id,
+            day.label("day"),
+            func.count(SchedulerRun.id),
+            func.sum(case((SchedulerRun.error_count > 0, 1), else_=0)),
+            func.avg(SchedulerRun.duration_ms),
+            func.max(SchedulerRun.duration_ms),
+            func.sum(SchedulerRun.items_scanned),
+            func.sum(SchedulerRun.items_acted),
+            func.sum(SchedulerRun.error_count),
+        )
+        .where(SchedulerRun.started_at >= cutoff)
+        .group_by(SchedulerRun.job_id, day)
+        .order_by(SchedulerRun.job_id, day.desc())
+    ).all()
+
+    return [
+        {
+            "job_id": job_id,
+            "day": row_day,
+            "runs": runs,
+            "failed_runs": failed or 0,
+            "avg_ms": int(avg_ms or 0),
+            "max_ms": max_ms or 0,
+            "scanned": scanned or 0,
+            "acted": acted or 0,
+            "errors": errors or 0,
+        }
+        for job_id, row_day, runs, failed, avg_ms, max_ms, scanned, acted, errors in rows
+    ]
@@ -7,22 +7,33 @@
 import traceback
 
 # ------------------------ Imports (PEP8 order) -----------------------
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from dateutil.rrule import rrulestr
 from flask import current_app
 
 from app.extensions import db
-from app.models import EmailMessage, Message, Reminder, User, UserMailSettings
-from app.services.scheduler.apprise_utils import execute_apprise
+from app.models import (
+    NEXT_ACTION_CHECKIN,
+    NEXT_ACTION_EXPIRE,
+    EmailMessage,
+    Message,
+    Reminder,
+    User,
+    UserMailSettings,
+)
+from app.services.scheduler.apprise_utils import prepare_apprise_deliveries
 from app.services.scheduler.backup_utils import create_backup, delete_old_backups
 from app.services.scheduler.email_utils import (
+    prepare_owner_notice,
+    prepare_reminder_email,
+    prepare_secure_email,
+    send_checkin_digest,
     send_checkin_email,
-    send_owner_notice,
-    send_reminder_email,
-    send_secure_email,
 )
-from app.services.scheduler.webhook_utils import execute_webhooks
-from app.utils.logging import log_error_message, log_info_message
+from app.services.scheduler.outbox import enqueue_deliveries
+from app.services.scheduler.run_ledger import note_error, note_item, note_scanned
+from app.services.scheduler.webhook_utils import prepare_webhook_deliveries
+from app.utils.logging import log_info_message, log_scheduler_message
 
 # ---------------------------------------------------------------------
 # process_checkins_and_overdue_actions
@@ -33,23 +44,80 @@ def process_checkins_and_overdue_actions():
     """
     try:
         find_messages_needing_checkin_reminder()
-        log_info_message(
-            "Scheduler [ProcessCheckinsAndOverdueActions] - Success - Processed check-ins and overdue actions."
+        log_scheduler_message(
+            "ProcessCheckinsAndOverdueActions", "Success", "Processed check-ins and overdue actions."
         )
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [ProcessCheckinsAndOverdueActions] - Failure - Error in check-in reminder processing: {e}\n{traceback.format_exc()}"
+        log_scheduler_message(
+            "ProcessCheckinsAndOverdueActions", "Failure", f"Error in check-in reminder processing: {e}\n{traceback.format_exc()}"
         )
+        note_error("CheckinReminders", traceback.format_exc())
 
     try:
         find_expired_items()
-        log_info_message(
-            "Scheduler [ProcessCheckinsAndOverdueActions] - Success - Processed expired items."
+        log_scheduler_message(
+            "ProcessCheckinsAndOverdueActions", "Success", "Processed expired items."
         )
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [ProcessCheckinsAndOverdueActions] - Failure - Error in expired item processing: {e}\n{traceback.format_exc()}"
+        log_scheduler_message(
+            "ProcessCheckinsAndOverdueActions", "Failure", f"Error in expired item processing: {e}\n{traceback.format_exc()}"
+        )
+        note_error("ExpireItems", traceback.format_exc())
+
+
+# ---------------------------------------------------------------------
+# backfill_next_actions
+# ---------------------------------------------------------------------
+def backfill_next_actions():
+    """
+    Compute next_action_at for enabled items that do not have one yet
+    (rows created before the column existed, or edited outside the UI).
+    Items that cannot have a deadline (no schedule or no check-in yet) are
+    left out, so they are not refreshed and committed again on every run.
+    """
+    for model in (Message, EmailMessage):
+        items = model.query.filter(
+            model.is_enabled.is_(True),
+            model.executed_at.is_(None),
+            model.next_action_at.is_(None),
+            model.checkin_interval_minutes > 0,
+            model.grace_period_minutes.is_not(None),
+            model.last_checkin.is_not(None),
+        ).all()
+
+        if not items:
+            continue
+
+        for item in items:
+            item.refresh_next_action()
+        db.session.commit()
+        log_scheduler_message(
+            "BackfillNextActions", "Success", f"Scheduled {len(items)} {model.__tablename__} item(s)"
+        )
+
+
+# ---------------------------------------------------------------------
+# _due_items
+# ---------------------------------------------------------------------
+def _due_items(model, phase, now):
+    """
+    Return enabled items of `model` whose next action in `phase` is due.
+    Uses the indexed next_action_at column, so cost scales with due work only.
+    """
+    return (
+        model.query.filter(
+            model.is_enabled.is_(True),
+            model.next_action_phase == phase,
+            model.next_action_at <= now,
         )
+        .order_by(model.next_action_at)
+        .all()
+    )
+
+
+def _item_type(item):
+    """Ledger item type, matching the outbox's source_type values."""
+    return "message" if isinstance(item, Message) else "email"
 
 
 # ---------------------------------------------------------------------
@@ -57,135 +125,159 @@ def process_checkins_and_overdue_actions():
 # ---------------------------------------------------------------------
 def find_messages_needing_checkin_reminder():
     now = datetime.now(timezone.utc)
-    messages = Message.query.filter_by(is_enabled=True).all()
-    emails = EmailMessage.query.filter_by(is_enabled=True).all()
+    backfill_next_actions()
+
+    messages = _due_items(Message, NEXT_ACTION_CHECKIN, now)
+    emails = _due_items(EmailMessage, NEXT_ACTION_CHECKIN, now)
+    note_scanned(len(messages) + len(emails))
+
+    if current_app.config.get("SCHEDULER_CHECKIN_DIGEST", False):
+        _send_checkin_digests(messages + emails, now)
+        return
 
     for item in messages + emails:
-        if item.checkin_interval_minutes is None or item.last_checkin is None:
-            continue
+        try:
+            user = db.session.get(User, item.user_id)
+            if user:
+                # Marked only once sent, so a failed reminder is retried next run
+                if not send_checkin_email(user, item):
+                    note_error("CheckinReminder", "Reminder email not sent", _item_type(item), item.id)
+                    continue
+                item.reminder_sent_at = now
+                item.refresh_next_action()
+                db.session.commit()
+                log_scheduler_message(
+                    "SendCheckinEmail", "Success", f"Check-in reminder sent to {user.email} for {item.label}"
+                )
+                note_item("CheckinReminder", _item_type(item), item.id, item.label)
+            else:
+                log_scheduler_message(
+                    "SendCheckinEmail", "Failure", f"Cannot send reminder — user {item.user_id} not found"
+                )
+                note_error("CheckinReminder", f"User {item.user_id} not found", _item_type(item), item.id)
+        except Exception as e:
+            db.session.rollback()
+            log_scheduler_message(
+                "SendCheckinEmail", "Failure", f"Error sending reminder for {item.label}: {e}\n{traceback.format_exc()}"
+            )
+            note_error("CheckinReminder", str(e), _item_type(item), item.id)
+
+
+# ---------------------------------------------------------------------
+# _send_checkin_digests
+# ---------------------------------------------------------------------
+def _send_checkin_digests(items, now):
+    """
+    Group due check-in items by owner and send each user a single reminder
+    listing all of them, marking the whole group reminded in one transaction.
+    """
+    by_user = {}
+    for item in items:
+        by_user.setdefault(item.user_id, []).append(item)
+
+    for user_id, user_items in by_user.items():
+        try:
+            user = db.session.get(User, user_id)
+            if not user:
+                log_scheduler_message(
+                    "SendCheckinDigest", "Failure", f"Cannot send reminder — user {user_id} not found"
+                )
+                note_error("CheckinDigest", f"User {user_id} not found", "user", user_id)
+                continue
 
-        delta = timedelta(minutes=item.checkin_interval_minutes)
-
-        last_checkin = item.last_checkin
-        if last_checkin.tzinfo is None:
-            last_checkin = last_checkin.replace(tzinfo=timezone.utc)
-
-        if now - last_checkin >= delta:
-            if item.reminder_sent_at is None:
-                try:
-                    user = db.session.get(User, item.user_id)
-                    if user:
-                        item.reminder_sent_at = now
-                        db.session.commit()
-                        send_checkin_email(user, item)
-                        log_info_message(
-                            f"Scheduler [SendCheckinEmail] - Success - Check-in reminder sent to {user.email} for {item.label}"
-                        )
-                    else:
-                        log_error_message(
-                            f"ERROR - Scheduler [SendCheckinEmail] - Failure - Cannot send reminder — user {item.user_id} not found"
-                        )
-                except Exception as e:
-                    db.session.rollback()
-                    log_error_message(
-                        f"ERROR - Scheduler [SendCheckinEmail] - Failure - Error sending reminder for {item.label}: {e}\n{traceback.format_exc()}"
-                    )
+            if len(user_items) == 1:
+                sent = send_checkin_email(user, user_items[0])
+            else:
+                sent = send_checkin_digest(user, user_items)
+            # Marked only once sent, so a failed reminder is retried next run
+            if not sent:
+                note_error("CheckinDigest", "Reminder email not sent", "user", user_id)
+                continue
+
+            for item in user_items:
+                item.reminder_sent_at = now
+                item.refresh_next_action()
+            db.session.commit()
+            log_scheduler_message(
+                "SendCheckinDigest", "Success", f"Check-in reminder sent to {user.email} for {len(user_items)} item(s)"
+            )
+            for item in user_items:
+                note_item("CheckinReminder", _item_type(item), item.id, item.label)
+        except Exception as e:
+            db.session.rollback()
+            log_scheduler_message(
+                "SendCheckinDigest", "Failure", f"Error sending reminders for user {user_id}: {e}\n{traceback.format_exc()}"
+            )
+            note_error("CheckinDigest", str(e), "user", user_id)
 
 
 # ---------------------------------------------------------------------
 # find_expired_items
 # ---------------------------------------------------------------------
 def find_expired_items():
+    """
+    Execute every item whose grace period has passed.
+
+    Each destination is enqueued in the delivery outbox in the same transaction
+    that marks the item executed; the outbox drain job does the actual sending
+    and retries, so this finishes without waiting on any remote server.
+    """
     now = datetime.now(timezone.utc)
-    messages = Message.query.filter_by(is_enabled=True).all()
-    emails = EmailMessage.query.filter_by(is_enabled=True).all()
+    messages = _due_items(Message, NEXT_ACTION_EXPIRE, now)
+    emails = _due_items(EmailMessage, NEXT_ACTION_EXPIRE, now)
+    note_scanned(len(messages) + len(emails))
 
     for item in messages:
-        if (
-            item.executed_at is not None
-            or item.grace_period_minutes is None
-            or item.last_checkin is None
-            or item.reminder_sent_at is None
-        ):
-            log_info_message(
-                f"Scheduler [FindExpiredItems] - Skipping {item.label} — not eligible for expiration"
+        try:
+            log_scheduler_message(
+                "ExecuteExpiredMessage", "Success", f"Executing expired message: {item.label}"
             )
-            continue
-
-        if item.reminder_sent_at.tzinfo is None:
-            item.reminder_sent_at = item.reminder_sent_at.replace(tzinfo=timezone.utc)
-
-        if now - item.reminder_sent_at < timedelta(minutes=item.grace_period_minutes):
-            log_info_message(
-                f"Scheduler [FindExpiredItems] - Skipping {item.label} — grace period not yet elapsed"
+            queued = enqueue_deliveries(
+                prepare_apprise_deliveries(item)
+                + prepare_webhook_deliveries(item)
+                + prepare_owner_notice(item),
+                "message",
+                item,
             )
-            continue
-
-        grace = timedelta(minutes=item.checkin_interval_minutes + item.grace_period_minutes)
-        last_checkin = item.last_checkin
-        if last_checkin and last_checkin.tzinfo is None:
-            last_checkin = last_checkin.replace(tzinfo=timezone.utc)
-
-        if now - last_checkin >= grace:
-            try:
-                log_info_message(
-                    f"Scheduler [ExecuteExpiredMessage] - Success - Executing expired message: {item.label}"
-                )
-                execute_apprise(item)
-                execute_webhooks(item)
-                send_owner_notice(item)
-                item.executed_at = datetime.now(timezone.utc)
-                item.is_enabled = False
-                db.session.commit()
-                log_info_message(
-                    f"Scheduler [ExecuteExpiredMessage] - Success - Executed and disabled message: {item.label}"
-                )
-            except Exception as e:
-                db.session.rollback()
-                log_error_message(
-                    f"ERROR - Scheduler [ExecuteExpiredMessage] - Failure - Error executing message '{item.label}': {e}\n{traceback.format_exc()}"
-                )
+            item.executed_at = datetime.now(timezone.utc)
+            item.is_enabled = False
+            item.refresh_next_action()
+            db.session.commit()
+            log_scheduler_message(
+                "ExecuteExpiredMessage", "Success", f"Executed and disabled message: {item.label} ({queued} delivery(ies) queued)"
+            )
+            note_item("Execute", "message", item.id, f"{item.label} ({queued} delivery(ies) queued)")
+        except Exception as e:
+            db.session.rollback()
+            log_scheduler_message(
+                "ExecuteExpiredMessage", "Failure", f"Error executing message '{item.label}': {e}\n{traceback.format_exc()}"
+            )
+            note_error("Execute", str(e), "message", item.id)
 
     for item in emails:
-        if (
-            item.executed_at is not None
-            or item.grace_period_minutes is None
-            or item.last_checkin is None
-            or item.reminder_sent_at is None
-        ):
-            log_info_message(
-                f"Scheduler [FindExpiredItems] - Skipping {item.label} — not eligible for expiration"
+        try:
+            log_scheduler_message(
+                "ExecuteExpiredEmail", "Success", f"Executing expired email: {item.label}"
             )
-            continue
-
-        if item.reminder_sent_at.tzinfo is None:
-            item.reminder_sent_at = item.reminder_sent_at.replace(tzinfo=timezone.utc)
-
-        if now - item.reminder_sent_at < timedelta(minutes=item.grace_period_minutes):
-            log_info_message(
-                f"Scheduler [FindExpiredItems] - Skipping {item.label} — grace period not yet elapsed"
+            queued = enqueue_deliveries(
+                prepare_secure_email(item) + prepare_owner_notice(item),
+                "email",
+                item,
             )
-            continue
-
-        grace = timedelta(minutes=item.checkin_interval_minutes + item.grace_period_minutes)
-        if now - item.last_checkin >= grace:
-            try:
-                log_info_message(
-                    f"Scheduler [ExecuteExpiredEmail] - Success - Executing expired email: {item.label}"
-                )
-                send_secure_email(item)
-                send_owner_notice(item)
-                item.executed_at = datetime.now(timezone.utc)
-                item.is_enabled = False
-                db.session.commit()
-                log_info_message(
-                    f"Scheduler [ExecuteExpiredEmail] - Success - Executed and disabled email: {item.label}"
-                )
-            except Exception as e:
-                db.session.rollback()
-                log_error_message(
-                    f"ERROR - Scheduler [ExecuteExpiredEmail] - Failure - Error executing email '{item.label}': {e}\n{traceback.format_exc()}"
-                )
+            item.executed_at = datetime.now(timezone.utc)
+            item.is_enabled = False
+            item.refresh_next_action()
+            db.session.commit()
+            log_scheduler_message(
+                "ExecuteExpiredEmail", "Success", f"Executed and disabled email: {item.label} ({queued} delivery(ies) queued)"
+            )
+            note_item("Execute", "email", item.id, f"{item.label} ({queued} delivery(ies) queued)")
+        except Exception as e:
+            db.session.rollback()
+            log_scheduler_message(
+                "ExecuteExpiredEmail", "Failure", f"Error executing email '{item.label}': {e}\n{traceback.format_exc()}"
+            )
+            note_error("Execute", str(e), "email", item.id)
 
 
 # ---------------------------------------------------------------------
@@ -197,15 +289,17 @@ def create_daily_backup():
     """
     try:
         path = create_backup()
-        log_info_message(f"Scheduler [DailyBackup] - Success - Daily backup created: {path}")
+        log_scheduler_message("DailyBackup", "Success", f"Daily backup created: {path}")
+        note_item("Backup", detail=str(path))
 
         # Prune backups older than 7 days (or adjust retention here)
         delete_old_backups(days_to_keep=current_app.config["BACKUP_RETENTION_DAYS"])
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [DailyBackup] - Failure - Failed to create daily backup: {e}\n{traceback.format_exc()}"
+        log_scheduler_message(
+            "DailyBackup", "Failure", f"Failed to create daily backup: {e}\n{traceback.format_exc()}"
         )
+        note_error("Backup", str(e))
 
 
 # ---------------------------------------------------------------------
@@ -213,14 +307,38 @@ def create_daily_backup():
 # ---------------------------------------------------------------------
 def execute_due_reminders():
     now = datetime.now(timezone.utc)
-    reminders = Reminder.query.filter_by(is_enabled=True).all()
-    log_info_message(
-        f"Scheduler [ExecuteDueReminders] - Success - Found {len(reminders)} enabled reminders to check"
+
+    # Backfill reminders scheduled before next_run_at existed. A reminder that
+    # still has no next run has nothing left to send (exhausted recurrence,
+    # one-time reminder already sent): disable it, or it comes back every run.
+    unscheduled = Reminder.query.filter(
+        Reminder.is_enabled.is_(True),
+        Reminder.next_run_at.is_(None),
+        Reminder.start_at.is_not(None),
+    ).all()
+    if unscheduled:
+        for reminder in unscheduled:
+            reminder.refresh_next_run()
+            if reminder.next_run_at is None:
+                reminder.is_enabled = False
+                log_scheduler_message(
+                    "ExecuteDueReminders", "Success", f"Reminder has no further runs, disabled: {reminder.label}"
+                )
+        db.session.commit()
+
+    reminders = (
+        Reminder.query.filter(Reminder.is_enabled.is_(True), Reminder.next_run_at <= now)
+        .order_by(Reminder.next_run_at)
+        .all()
+    )
+    log_scheduler_message(
+        "ExecuteDueReminders", "Success", f"Found {len(reminders)} due reminders to check"
     )
+    note_scanned(len(reminders))
 
     for reminder in reminders:
-        log_info_message(
-            f"Scheduler [ExecuteDueReminders] - Success - Evaluating reminder: {reminder.label}"
+        log_scheduler_message(
+            "ExecuteDueReminders", "Success", f"Evaluating reminder: {reminder.label}"
         )
 
         if not reminder.is_enabled or not reminder.start_at:
@@ -242,6 +360,8 @@ def execute_due_reminders():
             log_info_message(
                 f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — start_at in future: {reminder.start_at}"
             )
+            reminder.refresh_next_run()
+            db.session.commit()
             continue
 
         if reminder.max_occurrences and reminder.occurrences_sent >= reminder.max_occurrences:
@@ -249,6 +369,7 @@ def execute_due_reminders():
                 f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — max occurrences reached ({reminder.occurrences_sent})"
             )
             reminder.is_enabled = False
+            reminder.refresh_next_run()
             db.session.commit()
             continue
 
@@ -257,6 +378,7 @@ def execute_due_reminders():
                 f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — past end date {reminder.end_at}"
             )
             reminder.is_enabled = False
+            reminder.refresh_next_run()
             db.session.commit()
             continue
 
@@ -272,40 +394,48 @@ def execute_due_reminders():
                 log_info_message(
                     f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — next occurrence is {next_occurrence}"
                 )
+                reminder.refresh_next_run()
+                db.session.commit()
                 continue
         else:
             if reminder.last_sent_at:
                 log_info_message(
                     f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — already sent one-time reminder"
                 )
+                reminder.refresh_next_run()
+                db.session.commit()
                 continue
 
         try:
-            log_info_message(
-                f"Scheduler [ExecuteDueReminders] - Success - Sending reminder: {reminder.label}"
+            log_scheduler_message(
+                "ExecuteDueReminders", "Success", f"Sending reminder: {reminder.label}"
             )
 
+            deliveries = []
+
             if reminder.apprise_destinations:
-                execute_apprise(reminder)
+                deliveries += prepare_apprise_deliveries(reminder)
             else:
                 log_info_message(
                     f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — No Apprise destinations"
                 )
 
             if reminder.webhooks:
-                execute_webhooks(reminder)
+                deliveries += prepare_webhook_deliveries(reminder)
             else:
                 log_info_message(
                     f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — No Webhooks"
                 )
 
             if reminder.smtp_configs:
-                send_reminder_email(reminder)
+                deliveries += prepare_reminder_email(reminder)
             else:
                 log_info_message(
                     f"Scheduler [ExecuteDueReminders] - Skipping {reminder.label} — No SMTP config"
                 )
 
+            queued = enqueue_deliveries(deliveries, "reminder", reminder)
+
             reminder.last_sent_at = now
             reminder.occurrences_sent += 1
 
@@ -315,13 +445,16 @@ def execute_due_reminders():
                     f"Scheduler [ExecuteDueReminders] - One-time reminder disabled: {reminder.label}"
                 )
 
+            reminder.refresh_next_run()
             db.session.commit()
-            log_info_message(
-                f"Scheduler [ExecuteDueReminders] - Success - Reminder sent: {reminder.label}"
+            log_scheduler_message(
+                "ExecuteDueReminders", "Success", f"Reminder sent: {reminder.label} ({queued} delivery(ies) queued)"
             )
+            note_item("SendReminder", "reminder", reminder.id, f"{reminder.label} ({queued} delivery(ies) queued)")
 
         except Exception as e:
             db.session.rollback()
-            log_error_message(
-                f"ERROR - Scheduler [ExecuteDueReminders] - Failure - Error sending reminder '{reminder.label}': {e}\n{traceback.format_exc()}"
+            log_scheduler_message(
+                "ExecuteDueReminders", "Failure", f"Error sending reminder '{reminder.label}': {e}\n{traceback.format_exc()}"
             )
+            note_error("SendReminder", str(e), "reminder", reminder.id)
@@ -7,21 +7,236 @@
 import traceback
 import subprocess
 import os
+import threading
 
 # ------------------------ Imports (PEP8 order) -----------------------
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import func
 
+from app.extensions import db
+from app.models import EmailMessage, Message, Reminder, as_utc
+from app.services.apprise_utils import warm_up
+from app.services.scheduler.outbox import drain_delivery_outbox, next_pending_attempt
+from app.services.scheduler.reencrypt import (
+    checkpoint_lock,
+    reencrypt_batch,
+    reencrypt_failures,
+    reencrypt_pending,
+)
+from app.services.scheduler.run_ledger import note_error, scheduler_run
 from app.services.scheduler.scheduler import (
     create_daily_backup,
     execute_due_reminders,
     process_checkins_and_overdue_actions,
 )
 from app.services.scheduler.version_check import check_latest_version
-from app.utils.logging import log_info_message
+from app.utils.logging import log_debug_message, log_scheduler_message
+
+WAKEUP_JOB_ID = "scheduler_wakeup"
+OUTBOX_JOB_ID = "drain_delivery_outbox"
+REENCRYPT_JOB_ID = "reencrypt_legacy_values"
+
+# Set by start_scheduler() in the process that owns the scheduler (Gunicorn worker
+# or dev server). Views call rearm_wakeup() after changing a deadline; in any other
+# process, or when polling on intervals, it is a no-op.
+_scheduler = None
+_app = None
+_event_driven = False
+_wakeup_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------
+# kick_outbox_drain
+# ---------------------------------------------------------------------
+def kick_outbox_drain(at=None):
+    """
+    Run the outbox drain job now (or at `at`, when that is sooner than its next
+    interval run) so freshly enqueued deliveries and short batch windows don't
+    wait for the full interval.
+    """
+    if _scheduler is None:
+        return
+
+    try:
+        if at is not None:
+            job = _scheduler.get_job(OUTBOX_JOB_ID)
+            if job is None or (job.next_run_time is not None and job.next_run_time <= at):
+                return
+        _scheduler.modify_job(OUTBOX_JOB_ID, next_run_time=at or datetime.now(timezone.utc))
+    except Exception:
+        log_scheduler_message(
+            "DeliveryOutbox", "Failure", "Could not trigger outbox drain:\n"
+            + traceback.format_exc()
+        )
+
+
+# ---------------------------------------------------------------------
+# next_deadline
+# ---------------------------------------------------------------------
+def next_deadline():
+    """
+    Return the earliest pending deadline across messages, emails and reminders
+    (aware UTC), or None when nothing is scheduled. Each lookup is a MIN() over
+    an indexed column.
+    """
+    candidates = [
+        db.session.query(func.min(Message.next_action_at))
+        .filter(Message.is_enabled.is_(True))
+        .scalar(),
+        db.session.query(func.min(EmailMessage.next_action_at))
+        .filter(EmailMessage.is_enabled.is_(True))
+        .scalar(),
+        db.session.query(func.min(Reminder.next_run_at))
+        .filter(Reminder.is_enabled.is_(True))
+        .scalar(),
+    ]
+    candidates = [as_utc(c) for c in candidates if c is not None]
+    return min(candidates) if candidates else None
+
+
+# ---------------------------------------------------------------------
+# rearm_wakeup
+# ---------------------------------------------------------------------
+def rearm_wakeup():
+    """
+    Point the one-shot wake-up job at the earliest pending deadline.
+
+    Call after committing any change that can move a deadline (check-in, toggle,
+    schedule edit). Requires an app context; does nothing unless this process
+    runs the scheduler in event-driven mode.
+    """
+    if _scheduler is None or not _event_driven:
+        return
+
+    try:
+        with _wakeup_lock:
+            now = datetime.now(timezone.utc)
+            max_sleep = timedelta(minutes=_app.config.get("SCHEDULER_WAKEUP_MAX_SLEEP_MINUTES", 60))
+            retry = timedelta(seconds=_app.config.get("SCHEDULER_WAKEUP_RETRY_SECONDS", 30))
+
+            deadline = next_deadline()
+            if deadline is None or deadline > now + max_sleep:
+                run_at = now + max_sleep
+            elif deadline <= now:
+                # Still overdue after a run (delivery failed) — retry, don't spin
+                run_at = now + retry
+            else:
+                run_at = deadline
+
+            job = _scheduler.get_job(WAKEUP_JOB_ID)
+            if job is not None and job.next_run_time == run_at:
+                return
+
+            _scheduler.add_job(
+                _wakeup_wrapper,
+                trigger=DateTrigger(run_date=run_at),
+                id=WAKEUP_JOB_ID,
+                name="Process check-ins, expiries and reminders at the next deadline",
+                replace_existing=True,
+                misfire_grace_time=None,
+            )
+            log_debug_message(
+                f"Scheduler [Wakeup] - Success - Next wake-up armed for {run_at.isoformat()}"
+            )
+    except Exception:
+        log_scheduler_message(
+            "Wakeup", "Failure", "Could not re-arm wake-up:\n"
+            + traceback.format_exc()
+        )
+
+
+# ---------------------------------------------------------------------
+# _wakeup_wrapper
+# ---------------------------------------------------------------------
+def _wakeup_wrapper():
+    """
+    One-shot wake-up: process everything that is due, then arm the next wake-up.
+    """
+    with _app.app_context(), scheduler_run("Wakeup"):
+        try:
+            log_scheduler_message(
+                "Wakeup", "Success", "Processing due check-ins, expiries and reminders..."
+            )
+            process_checkins_and_overdue_actions()
+            execute_due_reminders()
+        except Exception:
+            log_scheduler_message(
+                "Wakeup", "Failure", "Error in wake-up task:\n"
+                + traceback.format_exc()
+            )
+            note_error("Run", traceback.format_exc())
+        finally:
+            rearm_wakeup()
+            kick_outbox_drain()
+
+
+# ---------------------------------------------------------------------
+# _outbox_wrapper
+# ---------------------------------------------------------------------
+def _outbox_wrapper():
+    """
+    Drain due delivery outbox rows (new deliveries, retries and expired leases).
+    """
+    with _app.app_context(), scheduler_run("DeliveryOutbox"):
+        try:
+            drain_delivery_outbox()
+            # Come back early for open batch windows and short retry backoffs. The
+            # second of slack keeps the re-run from landing while this one is still
+            # finishing (APScheduler would skip it as a concurrent instance).
+            upcoming = next_pending_attempt()
+            if upcoming is not None:
+                kick_outbox_drain(at=max(upcoming, datetime.now(timezone.utc) + timedelta(seconds=1)))
+        except Exception:
+            log_scheduler_message(
+                "DeliveryOutbox", "Failure", "Error in outbox drain task:\n"
+                + traceback.format_exc()
+            )
+            note_error("Run", traceback.format_exc())
+
+
+# ---------------------------------------------------------------------
+# _reencrypt_wrapper
+# ---------------------------------------------------------------------
+def _reencrypt_wrapper():
+    """
+    Move one batch of encrypted values to the current cipher format and key; the
+    job removes itself once every column has been scanned (the checkpoint keeps it
+    from being scheduled again until the key set changes). Values that could not
+    be re-encrypted are retried after the next restart. Runs are skipped while
+    tools/rotate_encryption_key.py holds the checkpoint lock.
+    """
+    with _app.app_context(), scheduler_run("Reencrypt"), checkpoint_lock(blocking=False) as locked:
+        if not locked:
+            log_scheduler_message(
+                "Reencrypt", "Success", "Checkpoint locked by tools/rotate_encryption_key.py; batch skipped."
+            )
+            return
+        try:
+            if reencrypt_batch():
+                _scheduler.remove_job(REENCRYPT_JOB_ID)
+                failures = reencrypt_failures()
+                if failures:
+                    log_scheduler_message(
+                        "Reencrypt", "Failure",
+                        f"{sum(len(ids) for ids in failures.values())} value(s) could not be re-encrypted "
+                        f"({', '.join(sorted(failures))}); keep FERRET_KEYS_PREVIOUS, they are retried "
+                        "after the next restart.",
+                    )
+                else:
+                    log_scheduler_message(
+                        "Reencrypt", "Success", "All encrypted columns are in the current format and key."
+                    )
+        except Exception:
+            log_scheduler_message(
+                "Reencrypt", "Failure", "Error in re-encryption task:\n"
+                + traceback.format_exc()
+            )
+            note_error("Run", traceback.format_exc())
 
 
 # ---------------------------------------------------------------------
@@ -32,70 +247,80 @@ def start_scheduler(app):
     Initialize and start the APScheduler with background jobs for Grylli.
 
     Sets up:
-        - A periodic task to process check-ins and overdue actions.
+        - Check-in/overdue and reminder processing, either as a one-shot wake-up
+          armed at the next deadline (SCHEDULER_EVENT_DRIVEN) or as interval polls.
+        - A delivery outbox drain loop that sends (and retries) queued notifications.
+        - A batched re-encryption job for values written by an older cipher or key.
         - A daily backup task for the database.
-        - A reminder execution loop.
         - A version check loop.
     """
+    global _scheduler, _app, _event_driven
+
     scheduler = BackgroundScheduler()
 
     # Wrapper for check-in/reminder/overdue logic (runs with app context)
     def task_wrapper():
-        with app.app_context():
+        with app.app_context(), scheduler_run("ProcessCheckinsAndOverdueActions"):
             try:
-                log_info_message(
-                    "Scheduler [ProcessCheckinsAndOverdueActions] - Success - APScheduler processing check-in reminders and overdue actions..."
+                log_scheduler_message(
+                    "ProcessCheckinsAndOverdueActions", "Success", "APScheduler processing check-in reminders and overdue actions..."
                 )
                 process_checkins_and_overdue_actions()
             except Exception:
-                log_info_message(
-                    "ERROR - Scheduler [ProcessCheckinsAndOverdueActions] - Failure - Error in check-in/overdue task:\n"
+                log_scheduler_message(
+                    "ProcessCheckinsAndOverdueActions", "Failure", "Error in check-in/overdue task:\n"
                     + traceback.format_exc()
                 )
+                note_error("Run", traceback.format_exc())
+            kick_outbox_drain()
 
     # Wrapper for daily backup logic (runs with app context)
     def backup_wrapper():
-        with app.app_context():
+        with app.app_context(), scheduler_run("DailyBackup"):
             try:
-                log_info_message("Scheduler [DailyBackup] - Success - Running daily backup...")
+                log_scheduler_message("DailyBackup", "Success", "Running daily backup...")
                 create_daily_backup()
             except Exception:
-                log_info_message(
-                    "ERROR - Scheduler [DailyBackup] - Failure - Error in daily backup task:\n"
+                log_scheduler_message(
+                    "DailyBackup", "Failure", "Error in daily backup task:\n"
                     + traceback.format_exc()
                 )
+                note_error("Run", traceback.format_exc())
 
     # Wrapper for reminder task
     def reminder_wrapper():
-        with app.app_context():
+        with app.app_context(), scheduler_run("ExecuteDueReminders"):
             try:
-                log_info_message(
-                    "Scheduler [ExecuteDueReminders] - Success - APScheduler executing due reminders..."
+                log_scheduler_message(
+                    "ExecuteDueReminders", "Success", "APScheduler executing due reminders..."
                 )
                 execute_due_reminders()
             except Exception:
-                log_info_message(
-                    "ERROR - Scheduler [ExecuteDueReminders] - Failure - Error in reminder task:\n"
+                log_scheduler_message(
+                    "ExecuteDueReminders", "Failure", "Error in reminder task:\n"
                     + traceback.format_exc()
                 )
+                note_error("Run", traceback.format_exc())
+            kick_outbox_drain()
 
     # Wrapper for version check job
     def version_check_wrapper():
-        with app.app_context():
+        with app.app_context(), scheduler_run("VersionCheck"):
             try:
-                log_info_message(
-                    "Scheduler [VersionCheck] - Success - Checking for newer Grylli releases..."
+                log_scheduler_message(
+                    "VersionCheck", "Success", "Checking for newer Grylli releases..."
                 )
                 check_latest_version()
             except Exception:
-                log_info_message(
-                    "ERROR - Scheduler [VersionCheck] - Failure - Error in version check task:\n"
+                log_scheduler_message(
+                    "VersionCheck", "Failure", "Error in version check task:\n"
                     + traceback.format_exc()
                 )
+                note_error("Run", traceback.format_exc())
 
     # Wrapper for file integrity verification
     def file_integrity_wrapper():
-        with app.app_context():
+        with app.app_context(), scheduler_run("FileIntegrity"):
             try:
                 result = subprocess.run(
                     ["python3", "verify_file_integrity.py", "--silent"],
@@ -103,15 +328,15 @@ def start_scheduler(app):
                     text=True,
                 )
                 if result.returncode != 0:
-                    log_info_message(
-                        f"ERROR - Scheduler [FileIntegrity] - Failure - File integrity check failed:\n{result.stdout}\n{result.stderr}"
+                    log_scheduler_message(
+                        "FileIntegrity", "Failure", f"File integrity check failed:\n{result.stdout}\n{result.stderr}"
                     )
                     os._exit(1)
                 else:
-                    log_info_message("Scheduler [FileIntegrity] - Success - File integrity verified.")
+                    log_scheduler_message("FileIntegrity", "Success", "File integrity verified.")
             except Exception as e:
-                log_info_message(
-                    f"ERROR - Scheduler [FileIntegrity] - Failure - Exception during check:\n{e}\n{traceback.format_exc()}"
+                log_scheduler_message(
+                    "FileIntegrity", "Failure", f"Exception during check:\n{e}\n{traceback.format_exc()}"
                 )
                 os._exit(1)
 
@@ -122,14 +347,40 @@ def start_scheduler(app):
     reminder_interval = app.config.get("SCHEDULER_REMINDER_INTERVAL_MINUTES", 5)
     file_integrity_minutes = app.config.get("SCHEDULER_FILE_INTEGRITY_INTERVAL_MINUTES", 15)
     version_check_minutes = app.config.get("SCHEDULER_VERSION_CHECK_INTERVAL_MINUTES", 60)
+    reencrypt_minutes = app.config.get("REENCRYPT_INTERVAL_MINUTES", 1)
+    outbox_seconds = app.config.get("OUTBOX_DRAIN_INTERVAL_SECONDS", 30)
 
-    # Schedule the check-in/reminder/overdue job
+    event_driven = app.config.get("SCHEDULER_EVENT_DRIVEN", False)
+
+    if event_driven:
+        # First wake-up runs immediately (backfills deadlines), then re-arms itself
+        scheduler.add_job(
+            _wakeup_wrapper,
+            trigger=DateTrigger(run_date=datetime.now(timezone.utc)),
+            id=WAKEUP_JOB_ID,
+            name="Process check-ins, expiries and reminders at the next deadline",
+            replace_existing=True,
+            misfire_grace_time=None,
+        )
+    else:
+        # Schedule the check-in/reminder/overdue job
+        scheduler.add_job(
+            task_wrapper,
+            trigger=IntervalTrigger(minutes=checkin_minutes),
+            id="process_checkins_and_overdue_actions",
+            name="Process check-in reminders and execute overdue actions",
+            replace_existing=True,
+        )
+
+    # Schedule the delivery outbox drain (also kicked right after each run above)
     scheduler.add_job(
-        task_wrapper,
-        trigger=IntervalTrigger(minutes=checkin_minutes),
-        id="process_checkins_and_overdue_actions",
-        name="Process check-in reminders and execute overdue actions",
+        _outbox_wrapper,
+        trigger=IntervalTrigger(seconds=outbox_seconds),
+        id=OUTBOX_JOB_ID,
+        name="Send queued notifications from the delivery outbox",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
     )
 
     # Schedule the daily backup job
@@ -142,13 +393,14 @@ def start_scheduler(app):
     )
 
     # Schedule the reminder execution task
-    scheduler.add_job(
-        reminder_wrapper,
-        trigger=IntervalTrigger(minutes=reminder_interval),
-        id="execute_due_reminders",
-        name="Execute scheduled reminders",
-        replace_existing=True,
-    )
+    if not event_driven:
+        scheduler.add_job(
+            reminder_wrapper,
+            trigger=IntervalTrigger(minutes=reminder_interval),
+            id="execute_due_reminders",
+            name="Execute scheduled reminders",
+            replace_existing=True,
+        )
 
     # Schedule the version check
     scheduler.add_job(
@@ -170,5 +422,29 @@ def start_scheduler(app):
         replace_existing=True,
     )
 
+    # Rewrite encrypted values from an older cipher or key, a batch at a time,
+    # until a pass completes under the current key set
+    with app.app_context():
+        reencrypt_needed = reencrypt_pending()
+    if reencrypt_needed:
+        scheduler.add_job(
+            _reencrypt_wrapper,
+            trigger=IntervalTrigger(minutes=reencrypt_minutes),
+            id=REENCRYPT_JOB_ID,
+            name="Re-encrypt stored values with the current cipher and key",
+            replace_existing=True,
+        )
+
+    _scheduler = scheduler
+    _app = app
+    _event_driven = event_driven
+
     scheduler.start()
-    log_info_message("Scheduler [SchedulerStart] - Success - APScheduler started.")
+
+    # Load Apprise plugins off the request path; this is the serving process too
+    threading.Thread(target=warm_up, name="grylli-apprise-warmup", daemon=True).start()
+
+    log_scheduler_message(
+        "SchedulerStart", "Success", "APScheduler started"
+        + (" (event-driven wake-ups)." if event_driven else ".")
+    )
@@ -8,10 +8,9 @@ import json
 from datetime import datetime, timezone
 from pathlib import Path
 
-import requests
-
 from app.config import APP_VERSION, DATA_DIR, GITHUB_URL
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.services.http_client import get as http_get
+from app.utils.logging import log_exception_with_traceback, log_scheduler_message
 
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*found in sys.modules.*")
@@ -46,14 +45,14 @@ def check_latest_version():
     """
     try:
         headers = {"User-Agent": "grylli-version-check"}
-        response = requests.get(GITHUB_API_RELEASES, timeout=10, headers=headers)
+        response = http_get(GITHUB_API_RELEASES, headers=headers, timeout=10)
         response.raise_for_status()
 
         try:
             json_data = response.json()
         except ValueError as parse_error:
-            log_info_message(
-                "Scheduler [CheckLatestVersion] - Failure - Failed to parse JSON from GitHub API."
+            log_scheduler_message(
+                "CheckLatestVersion", "Failure", "Failed to parse JSON from GitHub API."
             )
             log_exception_with_traceback(
                 "ERROR - Scheduler [CheckLatestVersion] - Failure - Could not parse JSON from GitHub API",
@@ -65,20 +64,20 @@ def check_latest_version():
         latest = json_data.get("tag_name", "").lstrip("v")
 
         if not latest:
-            log_info_message(
-                "Scheduler [CheckLatestVersion] - Failure - Could not parse latest version from GitHub response."
+            log_scheduler_message(
+                "CheckLatestVersion", "Failure", "Could not parse latest version from GitHub response."
             )
             write_version_cache(APP_VERSION, None, GITHUB_URL)
             return
 
         if latest != APP_VERSION:
-            log_info_message(
-                f"Scheduler [CheckLatestVersion] - Success - A new Grylli version is available: v{latest} "
+            log_scheduler_message(
+                "CheckLatestVersion", "Success", f"A new Grylli version is available: v{latest} "
                 f"(currently running: v{APP_VERSION}) — {GITHUB_URL}/releases"
             )
         else:
-            log_info_message(
-                f"Scheduler [CheckLatestVersion] - Success - Grylli is up to date (v{APP_VERSION})"
+            log_scheduler_message(
+                "CheckLatestVersion", "Success", f"Grylli is up to date (v{APP_VERSION})"
             )
 
         write_version_cache(APP_VERSION, latest, GITHUB_URL)
@@ -5,77 +5,106 @@
 # ---------------------------------------------------------------------
 
 import traceback
+from urllib.parse import urlparse
 
-import requests
+from app.config import DELIVERY_WEBHOOK_TIMEOUT_SECONDS
+from app.services.http_client import post_json
+from app.utils.logging import log_scheduler_message
 
-from app.utils.logging import log_error_message, log_info_message
+# Outbox kind for webhooks in batch mode: rows for the same endpoint are held for
+# WEBHOOK_BATCH_LINGER_SECONDS and POSTed together as one JSON array.
+WEBHOOK_BATCH_KIND = "webhook_batch"
 
 
 # ---------------------------------------------------------------------
-# execute_webhooks
+# prepare_webhook_deliveries
 # ---------------------------------------------------------------------
-def execute_webhooks(message):
+def prepare_webhook_deliveries(message):
     """
-    Send HTTP POST requests to all enabled webhooks linked to the given message.
+    Build one delivery spec per enabled webhook linked to the given message.
+    The payload is decrypted here, on the scheduler thread.
 
     Args:
         message: The message object (should have .webhooks, .label, .id, .subject, .content).
 
-    Logging:
-        - log_info_message for delivery attempts and successes.
-        - log_error_message for failures and exceptions.
+    Returns:
+        list: Delivery specs for app.services.scheduler.outbox.enqueue_deliveries.
     """
     try:
-        log_info_message(
-            f"Scheduler [ExecuteWebhooks] - Success - Executing Webhook(s) for message: {message.label}"
+        log_scheduler_message(
+            "ExecuteWebhooks", "Success", f"Executing Webhook(s) for message: {message.label}"
         )
 
         if not message.webhooks:
-            log_info_message(
-                f"Scheduler [ExecuteWebhooks] - Success - No webhooks linked to this message."
+            log_scheduler_message(
+                "ExecuteWebhooks", "Success", "No webhooks linked to this message."
             )
-            return
+            return []
 
+        payload = {
+            "message_id": message.id,
+            "label": message.label,
+            "subject": message.subject,
+            "content": message.content,
+        }
+
+        deliveries = []
         for webhook in message.webhooks:
             if not webhook.enabled:
                 continue
 
-            log_info_message(
-                f"Scheduler [ExecuteWebhooks] - Success - Sending webhook: {webhook.label} → {webhook.endpoint}"
+            deliveries.append(
+                {
+                    "kind": WEBHOOK_BATCH_KIND if webhook.batch_mode else "webhook",
+                    "label": webhook.label,
+                    # Host only: the endpoint URL can carry secrets and lives in
+                    # the encrypted payload
+                    "target": urlparse(webhook.endpoint).hostname or "",
+                    "destination_id": webhook.id,
+                    "payload": {"endpoint": webhook.endpoint, "label": webhook.label, "payload": payload},
+                }
             )
+        return deliveries
 
-            try:
-                payload = {
-                    "message_id": message.id,
-                    "label": message.label,
-                    "subject": message.subject,
-                    "content": message.content,
-                }
+    except Exception as e:
+        log_scheduler_message(
+            "ExecuteWebhooks", "Failure", f"Unexpected error in prepare_webhook_deliveries: {e}\n{traceback.format_exc()}"
+        )
+        return []
+
+
+# ---------------------------------------------------------------------
+# post_webhook (delivery pool thread)
+# ---------------------------------------------------------------------
+def post_webhook(endpoint, label, payload):
+    """
+    POST the payload (one item, or a list of items for a batch) to a single
+    webhook endpoint. Returns True on HTTP 200.
+    """
+    log_scheduler_message("ExecuteWebhooks", "Success", f"Sending webhook: {label} → {urlparse(endpoint).hostname}")
 
-                headers = {"User-Agent": "grylli-webhook"}
-
-                response = requests.post(
-                    webhook.endpoint,
-                    json=payload,
-                    headers=headers,
-                    timeout=5,
-                )
-
-                if response.status_code == 200:
-                    log_info_message(
-                        f"Scheduler [ExecuteWebhooks] - Success - Webhook delivered: {webhook.label}"
-                    )
-                else:
-                    log_error_message(
-                        f"ERROR - Scheduler [ExecuteWebhooks] - Failure - Webhook [{webhook.label}] failed with status {response.status_code}: {response.text}"
-                    )
-
-            except Exception as e:
-                log_error_message(
-                    f"ERROR - Scheduler [ExecuteWebhooks] - Failure - Exception during webhook [{webhook.label}]: {e}\n{traceback.format_exc()}"
-                )
+    try:
+        headers = {"User-Agent": "grylli-webhook"}
+
+        response = post_json(
+            endpoint,
+            payload,
+            headers=headers,
+            timeout=DELIVERY_WEBHOOK_TIMEOUT_SECONDS,
+        )
+
+        if response.status_code == 200:
+            log_scheduler_message("ExecuteWebhooks", "Success", f"Webhook delivered: {label}")
+            return True
+
+        log_scheduler_message(
+            "ExecuteWebhooks", "Failure", f"Webhook [{label}] failed with status {response.status_code}: {response.text}"
+        )
+        return False
 
     except Exception as e:
-        log_error_message(
-            f"ERROR - Scheduler [ExecuteWebhooks] - Failure - Unexpected error in execute_webhooks: {e}\n{traceback.format_exc()}"
+        log_scheduler_message(
+            "ExecuteWebhooks", "Failure", f"Exception during webhook [{label}]: {e}\n{traceback.format_exc()}"
         )
+        return False
+
@@ -2,7 +2,7 @@
 # ---------------------------------------------------------------------
 # settings.py
 # app/services/settings.py
-# System settings seeding and retrieval utilities.
+# System settings seeding and retrieval utilities (cached, typed reads).
 # ---------------------------------------------------------------------
 """
 
@@ -14,7 +14,8 @@ from sqlalchemy import inspect
 
 from app.models import SystemConfig, db
 from app.services.encryption import decrypt, encrypt
-from app.utils.logging import log_debug_message, log_error_message, log_info_message
+from app.utils.logging import log_error_message, log_info_message
+from app.utils.settings_cache import TRUTHY_VALUES, get_settings_snapshot
 
 # ---------------------------------------------------------------------
 # Default system keys and sensitive keys
@@ -106,7 +107,9 @@ def seed_system_config_from_env():
 # ---------------------------------------------------------------------
 def get_setting(key, decrypt_value=False):
     """
-    Retrieve a system configuration value from the database.
+    Retrieve a system configuration value from the settings snapshot (a dict
+    lookup; see app/utils/settings_cache.py). Sensitive values are decrypted on
+    first use and kept decrypted until the snapshot is replaced.
 
     Args:
         key: The configuration key to retrieve.
@@ -118,42 +121,53 @@ def get_setting(key, decrypt_value=False):
     Raises:
         ValueError: If the key does not exist or decryption fails.
     """
+    snapshot = get_settings_snapshot()
 
-
-def get_setting(key, decrypt_value=False):
-    """
-    Retrieve a system configuration value from the database.
-
-    Args:
-        key: The configuration key to retrieve.
-        decrypt_value: If True, decrypt the value if it is sensitive.
-
-    Returns:
-        The config value as a string.
-
-    Raises:
-        ValueError: If the key does not exist or decryption fails.
-    """
-    try:
-        setting = SystemConfig.query.filter_by(key=key).first()
-    except Exception as e:
-        log_error_message(f"[settings] DB error while retrieving key '{key}': {e}")
-        raise ValueError(f"Database error retrieving setting '{key}'")
-
-    if not setting:
+    if key not in snapshot.values:
         log_error_message(f"[settings] Missing required config key: {key}")
         raise ValueError(f"Missing required config setting: {key}")
 
-    value = setting.value
+    if not (decrypt_value and key in snapshot.sensitive):
+        return snapshot.values[key].strip()
 
-    if decrypt_value and setting.is_sensitive:
+    value = snapshot.plain.get(key)
+    if value is None:
         try:
-            value = decrypt(value)
-            log_info_message(f"[settings] Decrypted setting: {key}")
+            value = decrypt(snapshot.values[key]).strip()
         except Exception as e:
             log_error_message(f"[settings] Decryption failed for {key}: {e}")
             raise ValueError(f"Failed to decrypt {key}: {e}")
-    else:
-        log_debug_message(f"[settings] Retrieved setting: {key} (sensitive={setting.is_sensitive})")
+        snapshot.plain[key] = value
+    return value
+
+
+# ---------------------------------------------------------------------
+# Typed accessors
+# ---------------------------------------------------------------------
+def get_secret_setting(key):
+    """
+    Decrypted value of a sensitive setting (plain value if not sensitive).
+    """
+    return get_setting(key, decrypt_value=True)
+
 
-    return value.strip()
+def get_int_setting(key, default=None):
+    """
+    Integer setting; `default` (when given) replaces a missing or invalid value.
+    """
+    try:
+        return int(get_setting(key))
+    except ValueError:
+        if default is None:
+            raise
+        return default
+
+
+def get_bool_setting(key, default=False):
+    """
+    Boolean setting ("1", "true", "yes" are true); `default` if missing.
+    """
+    value = get_settings_snapshot().values.get(key)
+    if value is None:
+        return default
+    return str(value).strip().lower() in TRUTHY_VALUES
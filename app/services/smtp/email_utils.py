@@ -1,13 +1,13 @@
 # ---------------------------------------------------------------------
 # email_utils.py
 # app/services/smtp/email_utils.py
-# SMTP configuration test utility using Apprise CLI for Grylli
+# SMTP configuration test utility using Apprise for Grylli
 # ---------------------------------------------------------------------
 
-import subprocess
 import traceback
 from urllib.parse import quote
 
+from app.services.apprise_utils import notify
 from app.utils.logging import log_error_message, log_info_message
 
 
@@ -16,7 +16,7 @@ from app.utils.logging import log_error_message, log_info_message
 # ---------------------------------------------------------------------
 def send_test_smtp(user, smtp_settings):
     """
-    Sends a test email using the Apprise CLI with the given SMTP settings.
+    Sends a test email through Apprise (in-process) with the given SMTP settings.
 
     Args:
         user: The User object (expects .email for recipient).
@@ -24,7 +24,7 @@ def send_test_smtp(user, smtp_settings):
                        .smtp_host, .smtp_port, .use_tls).
 
     Returns:
-        True if Apprise CLI test email was sent successfully, False otherwise.
+        True if the Apprise test email was sent successfully, False otherwise.
     """
     try:
         log_info_message(f"📧 Starting SMTP test for user: {user.email}")
@@ -53,31 +53,17 @@ def send_test_smtp(user, smtp_settings):
             return False
 
         try:
-            log_info_message("🚀 Invoking Apprise CLI...")
-            command = [
-                "apprise",
-                "-vv",
-                "-t",
-                "Test Notification",
-                "-b",
-                "This is a test message",
-                apprise_url,
-            ]
-            result = subprocess.run(command, capture_output=True, text=True, timeout=10)
-        except FileNotFoundError:
-            log_error_message("❌ Apprise CLI not found. Is it installed?")
-            return False
-        except Exception as subprocess_error:
-            log_error_message(f"❌ Error running Apprise CLI: {subprocess_error}")
+            log_info_message("🚀 Sending test email via Apprise...")
+            ok, error = notify(apprise_url, "Test Notification", "This is a test message")
+        except Exception as apprise_error:
+            log_error_message(f"❌ Error sending via Apprise: {apprise_error}")
             return False
 
-        if result.returncode != 0:
-            log_error_message(f"❌ Apprise CLI failed with return code {result.returncode}")
-            log_error_message(f"📤 STDOUT:\n{result.stdout.strip()}")
-            log_error_message(f"📥 STDERR:\n{result.stderr.strip()}")
+        if not ok:
+            log_error_message(f"❌ Apprise test email failed: {error}")
             return False
 
-        log_info_message("✅ Apprise CLI test email sent successfully.")
+        log_info_message("✅ Apprise test email sent successfully.")
         return True
 
     except Exception as e:
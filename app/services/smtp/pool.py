@@ -0,0 +1,237 @@
+"""
+# ---------------------------------------------------------------------
+# pool.py
+# app/services/smtp/pool.py
+# Shared pool of authenticated SMTP connections
+# ---------------------------------------------------------------------
+"""
+
+import atexit
+import hashlib
+import hmac
+import os
+import smtplib
+import threading
+import time
+
+from app.config import (
+    SMTP_POOL_IDLE_SECONDS,
+    SMTP_POOL_MAX_IDLE_PER_KEY,
+    SMTP_POOL_MAX_MESSAGES,
+    SMTP_POOL_NOOP_AFTER_SECONDS,
+)
+from app.utils.logging import log_debug_message
+
+# TLS modes
+TLS_SSL = "ssl"  # implicit TLS (SMTP_SSL, usually port 465)
+TLS_STARTTLS = "starttls"  # plain connect, then STARTTLS (usually port 587)
+TLS_NONE = "none"
+
+# (host, port, username, tls_mode, credential digest) -> list of idle connection dicts:
+#   {"smtp": <smtplib.SMTP>, "last_used": <monotonic>, "sent": <int>}
+# The digest makes a pooled (already authenticated) connection reusable only
+# by a sender presenting the same password.
+_idle = {}
+_lock = threading.Lock()
+
+# Per-process key, so the digests kept in memory are not plain password hashes
+_digest_key = os.urandom(32)
+
+
+def _credential_digest(password):
+    return hmac.new(_digest_key, (password or "").encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+# ---------------------------------------------------------------------
+# _connect
+# ---------------------------------------------------------------------
+def _connect(host, port, username, password, tls_mode, timeout):
+    """
+    Open, secure and authenticate a new SMTP connection.
+    """
+    smtp_class = smtplib.SMTP_SSL if tls_mode == TLS_SSL else smtplib.SMTP
+    smtp = smtp_class(host, port, timeout=timeout)
+    try:
+        smtp.ehlo()
+        if tls_mode == TLS_STARTTLS:
+            smtp.starttls()
+            smtp.ehlo()
+        if username:
+            smtp.login(username, password)
+    except Exception:
+        _close(smtp)
+        raise
+
+    log_debug_message(f"SMTP pool - opened connection to {host}:{port} ({tls_mode})")
+    return {"smtp": smtp, "last_used": time.monotonic(), "sent": 0}
+
+
+# ---------------------------------------------------------------------
+# _close
+# ---------------------------------------------------------------------
+def _close(smtp):
+    try:
+        smtp.quit()
+    except Exception:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+
+# ---------------------------------------------------------------------
+# _is_alive
+# ---------------------------------------------------------------------
+def _is_alive(conn):
+    """
+    NOOP health check for connections that have been idle for a while.
+    """
+    if time.monotonic() - conn["last_used"] < SMTP_POOL_NOOP_AFTER_SECONDS:
+        return True
+    try:
+        code, _ = conn["smtp"].noop()
+        return code == 250
+    except Exception:
+        return False
+
+
+# ---------------------------------------------------------------------
+# _checkout
+# ---------------------------------------------------------------------
+def _checkout(key):
+    """
+    Take a healthy idle connection for `key` out of the pool, or None.
+    Expired and worn-out connections found along the way are closed.
+    """
+    now = time.monotonic()
+    stale = []
+    conn = None
+
+    with _lock:
+        idle = _idle.get(key, [])
+        while idle:
+            candidate = idle.pop()
+            if (
+                now - candidate["last_used"] > SMTP_POOL_IDLE_SECONDS
+                or candidate["sent"] >= SMTP_POOL_MAX_MESSAGES
+            ):
+                stale.append(candidate)
+                continue
+            conn = candidate
+            break
+
+    for candidate in stale:
+        _close(candidate["smtp"])
+
+    if conn is not None and not _is_alive(conn):
+        _close(conn["smtp"])
+        conn = None
+    return conn
+
+
+# ---------------------------------------------------------------------
+# _checkin
+# ---------------------------------------------------------------------
+def _checkin(key, conn):
+    """
+    Return a connection to the pool unless it is worn out or the pool is full.
+    """
+    conn["last_used"] = time.monotonic()
+    if conn["sent"] < SMTP_POOL_MAX_MESSAGES:
+        with _lock:
+            idle = _idle.setdefault(key, [])
+            if len(idle) < SMTP_POOL_MAX_IDLE_PER_KEY:
+                idle.append(conn)
+                return
+    _close(conn["smtp"])
+
+
+# ---------------------------------------------------------------------
+# send_message
+# ---------------------------------------------------------------------
+def send_message(msg, host, port, username, password, tls_mode, timeout=30):
+    """
+    Send an email.message through a pooled connection for
+    (host, port, username, tls_mode) and this password, reconnecting once if
+    the server dropped it. Idle connections opened with another password for
+    the same account are closed: the credentials changed.
+
+    Raises:
+        smtplib.SMTPException / OSError if the message cannot be sent.
+    """
+    key = (host, int(port), username or "", tls_mode, _credential_digest(password))
+    _close_matching(lambda other: other[:4] == key[:4] and other != key)
+
+    conn = _checkout(key)
+    reused = conn is not None
+    if conn is None:
+        conn = _connect(host, port, username, password, tls_mode, timeout)
+
+    try:
+        conn["smtp"].send_message(msg)
+    except smtplib.SMTPServerDisconnected:
+        _close(conn["smtp"])
+        if not reused:
+            raise
+        log_debug_message(f"SMTP pool - {host}:{port} dropped pooled connection, reconnecting")
+        conn = _connect(host, port, username, password, tls_mode, timeout)
+        try:
+            conn["smtp"].send_message(msg)
+        except Exception:
+            _close(conn["smtp"])
+            raise
+    except Exception:
+        # Connection state is unknown after a failed transaction; don't reuse it
+        _close(conn["smtp"])
+        raise
+
+    conn["sent"] += 1
+    _checkin(key, conn)
+
+
+# ---------------------------------------------------------------------
+# close_all / close_connections
+# ---------------------------------------------------------------------
+def _close_matching(matches):
+    with _lock:
+        keys = [key for key in _idle if matches(key)]
+        conns = [conn for key in keys for conn in _idle.pop(key)]
+
+    for conn in conns:
+        _close(conn["smtp"])
+
+
+def close_all():
+    """
+    Close every idle pooled connection (process exit, settings change).
+    """
+    _close_matching(lambda key: True)
+
+
+def close_connections(host, port, username):
+    """
+    Close idle pooled connections for one account (SMTP settings edited or deleted).
+    """
+    try:
+        port = int(port)
+    except (TypeError, ValueError):
+        return
+    _close_matching(lambda key: key[:3] == (host, port, username or ""))
+
+
+atexit.register(close_all)
+
+
+# ---------------------------------------------------------------------
+# tls_mode_for
+# ---------------------------------------------------------------------
+def tls_mode_for(use_tls, implicit_ssl_when_not_tls=False):
+    """
+    Map the repo's boolean TLS flags to a pool TLS mode.
+
+    User SMTP settings treat use_tls=False as implicit SSL; the system SMTP
+    settings treat it as an unencrypted connection.
+    """
+    if use_tls:
+        return TLS_STARTTLS
+    return TLS_SSL if implicit_ssl_when_not_tls else TLS_NONE
@@ -8,13 +8,13 @@
 
 import os
 
-import requests
 from flask import current_app
 from flask_login import current_user
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models import SystemConfig, db
 from app.services.encryption import encrypt
+from app.services.http_client import post_json
 from app.utils.logging import log_error_message, log_exception_with_traceback, log_info_message
 
 # ---------------------------------------------------------------------
@@ -109,7 +109,7 @@ def send_test_webhook_notification(endpoint_url):
     log_info_message(f"[webhook] Sending test notification to: {endpoint_url} (user: {user})")
 
     try:
-        response = requests.post(endpoint_url, json=payload, timeout=5)
+        response = post_json(endpoint_url, payload, timeout=5)
         if response.ok:
             log_info_message(
                 f"[webhook] Webhook test success (user: {user}, status={response.status_code})"
@@ -54,4 +54,4 @@ ${r.join(`
 `:l.textContent;t+=`## ${this._formatTitle(n)}
 ${h}
 
-`}});let e=new Blob([t],{type:"text/plain"}),r=URL.createObjectURL(e),i=document.createElement("a");i.href=r,i.download="grylli_layout_debug.txt",document.body.appendChild(i),i.click(),document.body.removeChild(i),URL.revokeObjectURL(r)}_formatTitle(s){return s.replace(/([A-Z])/g," $1").replace(/Debug$/,"").replace(/Dom/g,"DOM").replace(/Css/g,"CSS").replace(/^./,t=>t.toUpperCase())}};var w=class extends o{connect(){this._updateLabel()}toggle(){this.panelTarget.classList.toggle("hidden"),this._updateLabel()}_updateLabel(){let s=this.panelTarget.classList.contains("hidden"),t=this.hasShowLabelValue?this.showLabelValue:"Show Help",e=this.hasHideLabelValue?this.hideLabelValue:"Hide Help";this.labelTarget.textContent=s?t:e}};a(w,"targets",["label","panel"]),a(w,"values",{showLabel:String,hideLabel:String});var H=class extends o{connect(){if(!this.statusUrlValue){console.warn("[version-check] \u26A0\uFE0F statusUrlValue is missing.");return}let s=new URL(this.statusUrlValue,window.location.origin);fetch(s).then(t=>t.json()).then(t=>this._render(t)).catch(()=>this._render({error:!0}))}_render({current_version:s,latest_version:t,github_url:e,error:r}){this.element.innerHTML="";let i=document.createElement("div");i.className="flex items-center space-x-2 text-sm px-2 py-1";let n=document.createElement("i");n.classList.add("fas","text-lg");let l=document.createElement("span");if(l.setAttribute("data-sidebar-target","label"),r)n.classList.add("fa-times-circle","text-error"),l.textContent="Version check failed",i.title="Version check failed";else if(s===t)n.classList.add("fa-check-circle","text-success"),l.textContent=`Up to date (v${s})`,i.title=l.textContent;else{n.classList.add("fa-rocket","text-warning");let h=document.createElement("a");h.href=`${e}/releases`,h.className="underline hover:text-warning-focus",h.textContent=`Update available: ${t}`,l.appendChild(h),i.title=`New version available: ${t}`}i.appendChild(n),i.appendChild(l),this.element.appendChild(i),this.element.classList.remove("hidden"),this.element.dispatchEvent(new CustomEvent("sidebar:labels:update",{bubbles:!0}))}};a(H,"values",{statusUrl:String});var ot=class extends o{connect(){location.protocol==="http:"&&location.hostname!=="localhost"&&this.element.classList.remove("hidden")}};var q=class extends o{connect(){this.highlightActiveLink(),this.updateTitleFromActiveLink(),document.addEventListener("htmx:afterSettle",()=>{this.highlightActiveLink(),this.updateTitleFromActiveLink()})}highlightActiveLink(){let s=window.location.pathname;this.linkTargets.forEach(t=>{let e=t.getAttribute("data-path-prefix");e&&s.startsWith(e)?t.classList.add("bg-base-200","font-bold"):t.classList.remove("bg-base-200","font-bold")})}updateTitleFromActiveLink(){let s=window.location.pathname;this.linkTargets.forEach((t,e)=>{let r=t.getAttribute("data-path-prefix"),i=t.getAttribute("data-sidebar-title");r&&s.startsWith(r)&&i&&(document.title=i)})}};a(q,"targets",["link"]);var x=class extends o{connect(){let s=this.tabTargets[0],t=this.activeTabValue;if(!t){let e=window.location.pathname.match(/\/overview\/(\w+)\//);e&&e[1]&&(t=e[1])}if(t){let e=`[data-tabs-name="${t}"]`,r=this.tabTargets.find(i=>i.matches(e));r&&(s=r)}this.activate(s)}activate(s){let t=s.target||s;this.tabTargets.forEach(r=>{r.classList.remove("font-bold","text-primary")}),t.classList.add("font-bold","text-primary");let e=t.getAttribute("data-tabs-title");e&&(document.title=e)}};a(x,"targets",["tab"]),a(x,"values",{activeTab:String});var z=class extends o{setTitle(){this.hasTitleValue&&(document.title=this.titleValue)}};a(z,"values",{title:String});var J=class extends o{async connect(){try{let s=window.BASE_URL||"",t=await fetch(`${s}/meta/static/background-patterns.json`);this.patterns=await t.json(),this.hasSelectTarget&&(this.selectTarget.replaceChildren(),this.patterns.forEach(r=>{let i=document.createElement("option");i.value=r.file,i.textContent=this.label(r.name),this.selectTarget.appendChild(i)}));let e=localStorage.getItem("background")||"none";this.apply(e),this.hasSelectTarget&&(this.selectTarget.value=e)}catch(s){console.error("Failed to load background patterns:",s)}}change(s){let t=s.target.value;this.apply(t),localStorage.setItem("background",t)}apply(s){let t=document.querySelector("#main-content");if(!t)return;let e=window.BASE_URL||"",r=s==="none"?"none":`url('${e}/static/${s}')`;t.style.backgroundImage=r}label(s){return s.replace(/[-_]/g," ").replace(/\b\w/g,t=>t.toUpperCase())}};a(J,"targets",["select"]);var Rt=["font-comic","font-gloria","font-inter","font-noto","font-orbitron","font-pacifico","font-patrick","font-playfair","font-plexmono","font-rubikmono","font-sharetech","font-vt323","font-rocksalt","font-audiowide","font-amaticsc","font-schoolbell","font-lato","font-luckiest","font-caveat","font-satisfy","font-reenie","font-righteous","font-bebas","font-baloo2"],Kt={comic:"Comic Neue",gloria:"Gloria Hallelujah",inter:"Inter",noto:"Noto Sans",orbitron:"Orbitron",pacifico:"Pacifico",patrick:"Patrick Hand",playfair:"Playfair Display",plexmono:"IBM Plex Mono",rubikmono:"Rubik Mono One",sharetech:"Share Tech Mono",vt323:"VT323",rocksalt:"Rock Salt",audiowide:"Audiowide",amaticsc:"Amatic SC",schoolbell:"Schoolbell",lato:"Lato",luckiest:"Luckiest Guy",caveat:"Caveat",satisfy:"Satisfy",reenie:"Reenie Beanie",righteous:"Righteous",bebas:"Bebas Neue",baloo2:"Baloo 2"};var C=class extends o{connect(){let t=localStorage.getItem("grylli-font")||"inter";setTimeout(()=>{this.applyFont(t),this.hasSelectTarget&&(this.selectTarget.value=t)},10)}change(t){let e=t.target.value;this.applyFont(e),localStorage.setItem("grylli-font",e)}applyFont(t){document.fonts.ready.then(()=>{let e=document.documentElement,r=`font-${t}`;if(!Rt.includes(r)){console.warn(`Unknown font: ${t}`);return}e.classList.remove(...Array.from(e.classList).filter(h=>h.startsWith("font-"))),e.classList.add(r);let i=Kt[t];i&&document.fonts.load(`16px ${i}`).catch(()=>{});let n=document.createElement("div");n.textContent="Wg",n.style.fontFamily=i,n.style.position="absolute",n.style.visibility="hidden",n.style.fontSize="64px",document.body.appendChild(n),requestAnimationFrame(()=>{n.offsetHeight,document.body.removeChild(n)});let l=e.style.fontSize||"";e.style.fontSize="101%",requestAnimationFrame(()=>{e.style.fontSize=l})})}};a(C,"targets",["select"]);var G=class extends o{connect(){let s=localStorage.getItem("grylli-font-size")||"100";setTimeout(()=>{this.applyFontSize(s),this.hasSelectTarget&&(this.selectTarget.value=s)},10)}update(s){let t=s.target.value;localStorage.setItem("grylli-font-size",t),this.applyFontSize(t)}applyFontSize(s){document.documentElement.style.fontSize=`${s}%`}};a(G,"targets",["select"]);var Z=class extends o{connect(){let s=localStorage.getItem("grylli-rounded")||"default";setTimeout(()=>{this.applyRoundedness(s),this.hasSelectTarget&&(this.selectTarget.value=s)},10)}update(s){let t=s.target.value;localStorage.setItem("grylli-rounded",t),this.applyRoundedness(t)}applyRoundedness(s){let t=document.documentElement;t.classList.remove("rounded-none","rounded-lg","rounded-xl"),s==="none"?t.classList.add("rounded-none"):s==="xl"&&t.classList.add("rounded-xl")}};a(Z,"targets",["select"]);var Y=class extends o{connect(){let s=localStorage.getItem("grylli-contrast")||"default";this.applyContrast(s),this.hasSelectTarget&&(this.selectTarget.value=s)}change(s){let t=s.target.value;localStorage.setItem("grylli-contrast",t),this.applyContrast(t)}applyContrast(s){let t=document.documentElement;t.classList.remove("contrast-low","contrast-high"),s==="low"?t.classList.add("contrast-low"):s==="high"&&t.classList.add("contrast-high")}};a(Y,"targets",["select"]);var L=class extends o{connect(){let s=localStorage.getItem(this.keyValue);s&&(this.applyTracking(s),this.hasSelectorTarget&&(this.selectorTarget.value=s))}update(s){let t=s.target.value;localStorage.setItem(this.keyValue,t),this.applyTracking(t)}applyTracking(s){let t=document.documentElement;t.classList.remove("tracking-tight","tracking-normal","tracking-wide"),t.classList.add(s)}};a(L,"targets",["selector"]),a(L,"values",{key:{type:String,default:"trackingLevel"}});var S=class extends o{connect(){let s=localStorage.getItem(this.keyValue);s&&(this.applyLineHeight(s),this.hasSelectorTarget&&(this.selectorTarget.value=s))}update(s){let t=s.target.value;localStorage.setItem(this.keyValue,t),this.applyLineHeight(t)}applyLineHeight(s){let t=document.documentElement;t.classList.remove("leading-tight","leading-normal","leading-loose"),t.classList.add(s)}};a(S,"targets",["selector"]),a(S,"values",{key:{type:String,default:"lineHeightLevel"}});import{Controller as Oe}from"https://cdn.jsdelivr.net/npm/@hotwired/stimulus@3.0.0/dist/stimulus.js";var at=class extends Oe{connect(){this.element.addEventListener("htmx:afterOnLoad",s=>{let e=s.detail.elt?.getAttribute("data-profile-title");e&&(document.title=e)})}};async function $e(){if(!window.isSecureContext||!crypto?.subtle)return console.info("Insecure context. Skipping fingerprint."),"insecure-context";let s=[navigator.userAgent,navigator.language,navigator.platform,Intl.DateTimeFormat().resolvedOptions().timeZone,navigator.deviceMemory||"unknown",screen.colorDepth,navigator.hardwareConcurrency||"unknown"].join("::"),t=new TextEncoder().encode(s),e=await crypto.subtle.digest("SHA-256",t);return[...new Uint8Array(e)].map(i=>i.toString(16).padStart(2,"0")).join("").slice(0,12)}var lt=class extends o{constructor(){super(...arguments);a(this,"suppressErrors",!1);a(this,"seenErrors",new Set)}connect(){let e=`${window.BASE_URL||""}/admin/tools/log_js_error`;$e().then(r=>{this.fingerprint=r,this._send(e,{type:"fingerprint",fingerprint:r,comment:"Generated from browser+OS+timezone+memory. See logger_controller.js for details."}),this._logInitialEvents(e)})}_logInitialEvents(t){this._send(t,{type:"environment",userAgent:navigator.userAgent,userAgentData:navigator.userAgentData||null,platform:navigator.platform,language:navigator.language,languages:navigator.languages,standalone:window.navigator.standalone||!1,isSecureContext:window.isSecureContext,referrer:document.referrer});let e=new Date;this._send(t,{type:"client-time",time:e.toISOString(),timezone:Intl.DateTimeFormat().resolvedOptions().timeZone,offsetMinutes:e.getTimezoneOffset()}),this._send(t,{type:"viewport",width:window.innerWidth,height:window.innerHeight,orientation:screen.orientation?.type||"unknown"}),navigator.connection&&this._send(t,{type:"network-info",downlink:navigator.connection.downlink,effectiveType:navigator.connection.effectiveType,rtt:navigator.connection.rtt,saveData:navigator.connection.saveData});let r=[];window.fetch||r.push("fetch"),window.Promise||r.push("Promise"),window.IntersectionObserver||r.push("IntersectionObserver"),window.ResizeObserver||r.push("ResizeObserver"),(!window.CSS||!CSS.supports("display: grid"))&&r.push("CSS Grid"),r.length&&this._send(t,{type:"missing-features",features:r}),this._send(t,{type:"ui-preference",darkMode:window.matchMedia("(prefers-color-scheme: dark)").matches});let i=!0;try{localStorage.setItem("logger_test","1"),localStorage.removeItem("logger_test")}catch{i=!1}this._send(t,{type:"storage",localStorageAvailable:i}),window.addEventListener("load",()=>{let n=performance.getEntriesByType("navigation")[0];n&&this._send(t,{type:"performance",timing:{domContentLoaded:n.domContentLoadedEventEnd-n.startTime,loadEvent:n.loadEventEnd-n.startTime,timeToFirstByte:n.responseStart-n.requestStart}})}),document.addEventListener("visibilitychange",()=>{this._send(t,{type:"visibility",state:document.visibilityState,timestamp:new Date().toISOString()})}),document.body.addEventListener("htmx:sendError",n=>{this._send(t,{type:"htmx-send-error",error:n.detail.error?.message||"Unknown send error",url:n.detail.pathInfo.requestPath})}),document.body.addEventListener("htmx:responseError",n=>{let l=n.detail.xhr;this._send(t,{type:"htmx-response-error",status:l.status,url:n.detail.pathInfo.requestPath,snippet:l?.responseText?.slice(0,500)||""})}),window.addEventListener("error",n=>{let l=n.target||n.srcElement;l&&(l.src||l.href)&&this._send(t,{type:"resource-error",tag:l.tagName,url:l.src||l.href,outerHTML:l.outerHTML})},!0),window.onerror=(n,l,h,g,d)=>{this._send(t,{type:"error",message:n,source:l,lineno:h,colno:g,stack:d?.stack||null})},window.onunhandledrejection=n=>{this._send(t,{type:"unhandledrejection",reason:n.reason})},["log","info","warn","error"].forEach(n=>{let l=console[n];console[n]=(...h)=>{l.apply(console,h),this._send(t,{type:"console",level:n,message:h.map(g=>String(g)).join(" "),timestamp:new Date().toISOString()})}})}_send(t,e){let r=JSON.stringify({type:e?.type,message:e?.message,source:e?.source,status:e?.status,reason:e?.reason});this.seenErrors.has(r)||fetch(t,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({fingerprint:this.fingerprint||null,...e})}).then(i=>{let n=i.headers.get("content-type")||"";(!i.ok||i.status!==204&&!n.includes("application/json"))&&(console.warn("Log response not JSON. Suppressing this error from future logs."),this.seenErrors.add(r))}).catch(i=>{console.warn("Logger failed. Suppressing this error from future logs.",i),this.seenErrors.add(r)})}};var c=tt.start();c.register("logger",lt);c.register("sidebar",A);c.register("collapse",p);c.register("theme",k);c.register("lang",B);c.register("role-modal",_);c.register("list-toggle",f);c.register("collapsible-item",b);c.register("confirm",D);c.register("reveal-password",st);c.register("redirect-button",O);c.register("flash-message",$);c.register("profile-dropdown",I);c.register("user-form",M);c.register("bootstrap-form",V);c.register("signup-form",F);c.register("reset-password",N);c.register("forgot-password",P);c.register("forgot-username",j);c.register("email-status",rt);c.register("apprise-list-toggle",y);c.register("apprise-form",R);c.register("apprise-validate",K);c.register("webhook-list-toggle",v);c.register("webhook-form",U);c.register("smtp-form",T);c.register("rate-limit-redirect",W);c.register("redirect",it);c.register("layout-debug",nt);c.register("toggle-help",w);c.register("version-check",H);c.register("insecure-warning",ot);c.register("sidebar-active",q);c.register("tabs",x);c.register("action-title",z);c.register("background",J);c.register("font",C);c.register("font-size",G);c.register("roundedness",Z);c.register("contrast",Y);c.register("tracking",L);c.register("line-height",S);c.register("profile-title",at);window.Stimulus=c;
+`}});let e=new Blob([t],{type:"text/plain"}),r=URL.createObjectURL(e),i=document.createElement("a");i.href=r,i.download="grylli_layout_debug.txt",document.body.appendChild(i),i.click(),document.body.removeChild(i),URL.revokeObjectURL(r)}_formatTitle(s){return s.replace(/([A-Z])/g," $1").replace(/Debug$/,"").replace(/Dom/g,"DOM").replace(/Css/g,"CSS").replace(/^./,t=>t.toUpperCase())}};var w=class extends o{connect(){this._updateLabel()}toggle(){this.panelTarget.classList.toggle("hidden"),this._updateLabel()}_updateLabel(){let s=this.panelTarget.classList.contains("hidden"),t=this.hasShowLabelValue?this.showLabelValue:"Show Help",e=this.hasHideLabelValue?this.hideLabelValue:"Hide Help";this.labelTarget.textContent=s?t:e}};a(w,"targets",["label","panel"]),a(w,"values",{showLabel:String,hideLabel:String});var H=class extends o{connect(){if(!this.statusUrlValue){console.warn("[version-check] \u26A0\uFE0F statusUrlValue is missing.");return}let s=new URL(this.statusUrlValue,window.location.origin);fetch(s).then(t=>t.json()).then(t=>this._render(t)).catch(()=>this._render({error:!0}))}_render({current_version:s,latest_version:t,github_url:e,error:r}){this.element.innerHTML="";let i=document.createElement("div");i.className="flex items-center space-x-2 text-sm px-2 py-1";let n=document.createElement("i");n.classList.add("fas","text-lg");let l=document.createElement("span");if(l.setAttribute("data-sidebar-target","label"),r)n.classList.add("fa-times-circle","text-error"),l.textContent="Version check failed",i.title="Version check failed";else if(s===t)n.classList.add("fa-check-circle","text-success"),l.textContent=`Up to date (v${s})`,i.title=l.textContent;else{n.classList.add("fa-rocket","text-warning");let h=document.createElement("a");h.href=`${e}/releases`,h.className="underline hover:text-warning-focus",h.textContent=`Update available: ${t}`,l.appendChild(h),i.title=`New version available: ${t}`}i.appendChild(n),i.appendChild(l),this.element.appendChild(i),this.element.classList.remove("hidden"),this.element.dispatchEvent(new CustomEvent("sidebar:labels:update",{bubbles:!0}))}};a(H,"values",{statusUrl:String});var ot=class extends o{connect(){location.protocol==="http:"&&location.hostname!=="localhost"&&this.element.classList.remove("hidden")}};var q=class extends o{connect(){this.highlightActiveLink(),this.updateTitleFromActiveLink(),document.addEventListener("htmx:afterSettle",()=>{this.highlightActiveLink(),this.updateTitleFromActiveLink()})}highlightActiveLink(){let s=window.location.pathname;this.linkTargets.forEach(t=>{let e=t.getAttribute("data-path-prefix");e&&s.startsWith(e)?t.classList.add("bg-base-200","font-bold"):t.classList.remove("bg-base-200","font-bold")})}updateTitleFromActiveLink(){let s=window.location.pathname;this.linkTargets.forEach((t,e)=>{let r=t.getAttribute("data-path-prefix"),i=t.getAttribute("data-sidebar-title");r&&s.startsWith(r)&&i&&(document.title=i)})}};a(q,"targets",["link"]);var x=class extends o{connect(){let s=this.tabTargets[0],t=this.activeTabValue;if(!t){let e=window.location.pathname.match(/\/overview\/(\w+)\//);e&&e[1]&&(t=e[1])}if(t){let e=`[data-tabs-name="${t}"]`,r=this.tabTargets.find(i=>i.matches(e));r&&(s=r)}this.activate(s)}activate(s){let t=s.target||s;this.tabTargets.forEach(r=>{r.classList.remove("font-bold","text-primary")}),t.classList.add("font-bold","text-primary");let e=t.getAttribute("data-tabs-title");e&&(document.title=e)}};a(x,"targets",["tab"]),a(x,"values",{activeTab:String});var z=class extends o{setTitle(){this.hasTitleValue&&(document.title=this.titleValue)}};a(z,"values",{title:String});var J=class extends o{async connect(){try{let s=window.BASE_URL||"",t=await fetch(`${s}/meta/static/background-patterns.json`);this.patterns=await t.json(),this.hasSelectTarget&&(this.selectTarget.replaceChildren(),this.patterns.forEach(r=>{let i=document.createElement("option");i.value=r.file,i.textContent=this.label(r.name),this.selectTarget.appendChild(i)}));let e=localStorage.getItem("background")||"none";this.apply(e),this.hasSelectTarget&&(this.selectTarget.value=e)}catch(s){console.error("Failed to load background patterns:",s)}}change(s){let t=s.target.value;this.apply(t),localStorage.setItem("background",t)}apply(s){let t=document.querySelector("#main-content");if(!t)return;let e=window.BASE_URL||"",r=s==="none"?"none":`url('${e}/static/${s}')`;t.style.backgroundImage=r}label(s){return s.replace(/[-_]/g," ").replace(/\b\w/g,t=>t.toUpperCase())}};a(J,"targets",["select"]);var Rt=["font-comic","font-gloria","font-inter","font-noto","font-orbitron","font-pacifico","font-patrick","font-playfair","font-plexmono","font-rubikmono","font-sharetech","font-vt323","font-rocksalt","font-audiowide","font-amaticsc","font-schoolbell","font-lato","font-luckiest","font-caveat","font-satisfy","font-reenie","font-righteous","font-bebas","font-baloo2"],Kt={comic:"Comic Neue",gloria:"Gloria Hallelujah",inter:"Inter",noto:"Noto Sans",orbitron:"Orbitron",pacifico:"Pacifico",patrick:"Patrick Hand",playfair:"Playfair Display",plexmono:"IBM Plex Mono",rubikmono:"Rubik Mono One",sharetech:"Share Tech Mono",vt323:"VT323",rocksalt:"Rock Salt",audiowide:"Audiowide",amaticsc:"Amatic SC",schoolbell:"Schoolbell",lato:"Lato",luckiest:"Luckiest Guy",caveat:"Caveat",satisfy:"Satisfy",reenie:"Reenie Beanie",righteous:"Righteous",bebas:"Bebas Neue",baloo2:"Baloo 2"};var C=class extends o{connect(){let t=localStorage.getItem("grylli-font")||"inter";setTimeout(()=>{this.applyFont(t),this.hasSelectTarget&&(this.selectTarget.value=t)},10)}change(t){let e=t.target.value;this.applyFont(e),localStorage.setItem("grylli-font",e)}applyFont(t){document.fonts.ready.then(()=>{let e=document.documentElement,r=`font-${t}`;if(!Rt.includes(r)){console.warn(`Unknown font: ${t}`);return}e.classList.remove(...Array.from(e.classList).filter(h=>h.startsWith("font-"))),e.classList.add(r);let i=Kt[t];i&&document.fonts.load(`16px ${i}`).catch(()=>{});let n=document.createElement("div");n.textContent="Wg",n.style.fontFamily=i,n.style.position="absolute",n.style.visibility="hidden",n.style.fontSize="64px",document.body.appendChild(n),requestAnimationFrame(()=>{n.offsetHeight,document.body.removeChild(n)});let l=e.style.fontSize||"";e.style.fontSize="101%",requestAnimationFrame(()=>{e.style.fontSize=l})})}};a(C,"targets",["select"]);var G=class extends o{connect(){let s=localStorage.getItem("grylli-font-size")||"100";setTimeout(()=>{this.applyFontSize(s),this.hasSelectTarget&&(this.selectTarget.value=s)},10)}update(s){let t=s.target.value;localStorage.setItem("grylli-font-size",t),this.applyFontSize(t)}applyFontSize(s){document.documentElement.style.fontSize=`${s}%`}};a(G,"targets",["select"]);var Z=class extends o{connect(){let s=localStorage.getItem("grylli-rounded")||"default";setTimeout(()=>{this.applyRoundedness(s),this.hasSelectTarget&&(this.selectTarget.value=s)},10)}update(s){let t=s.target.value;localStorage.setItem("grylli-rounded",t),this.applyRoundedness(t)}applyRoundedness(s){let t=document.documentElement;t.classList.remove("rounded-none","rounded-lg","rounded-xl"),s==="none"?t.classList.add("rounded-none"):s==="xl"&&t.classList.add("rounded-xl")}};a(Z,"targets",["select"]);var Y=class extends o{connect(){let s=localStorage.getItem("grylli-contrast")||"default";this.applyContrast(s),this.hasSelectTarget&&(this.selectTarget.value=s)}change(s){let t=s.target.value;localStorage.setItem("grylli-contrast",t),this.applyContrast(t)}applyContrast(s){let t=document.documentElement;t.classList.remove("contrast-low","contrast-high"),s==="low"?t.classList.add("contrast-low"):s==="high"&&t.classList.add("contrast-high")}};a(Y,"targets",["select"]);var L=class extends o{connect(){let s=localStorage.getItem(this.keyValue);s&&(this.applyTracking(s),this.hasSelectorTarget&&(this.selectorTarget.value=s))}update(s){let t=s.target.value;localStorage.setItem(this.keyValue,t),this.applyTracking(t)}applyTracking(s){let t=document.documentElement;t.classList.remove("tracking-tight","tracking-normal","tracking-wide"),t.classList.add(s)}};a(L,"targets",["selector"]),a(L,"values",{key:{type:String,default:"trackingLevel"}});var S=class extends o{connect(){let s=localStorage.getItem(this.keyValue);s&&(this.applyLineHeight(s),this.hasSelectorTarget&&(this.selectorTarget.value=s))}update(s){let t=s.target.value;localStorage.setItem(this.keyValue,t),this.applyLineHeight(t)}applyLineHeight(s){let t=document.documentElement;t.classList.remove("leading-tight","leading-normal","leading-loose"),t.classList.add(s)}};a(S,"targets",["selector"]),a(S,"values",{key:{type:String,default:"lineHeightLevel"}});import{Controller as Oe}from"https://cdn.jsdelivr.net/npm/@hotwired/stimulus@3.0.0/dist/stimulus.js";var at=class extends Oe{connect(){this.element.addEventListener("htmx:afterOnLoad",s=>{let e=s.detail.elt?.getAttribute("data-profile-title");e&&(document.title=e)})}};async function $e(){if(!window.isSecureContext||!crypto?.subtle)return console.info("Insecure context. Skipping fingerprint."),"insecure-context";let s=[navigator.userAgent,navigator.language,navigator.platform,Intl.DateTimeFormat().resolvedOptions().timeZone,navigator.deviceMemory||"unknown",screen.colorDepth,navigator.hardwareConcurrency||"unknown"].join("::"),t=new TextEncoder().encode(s),e=await crypto.subtle.digest("SHA-256",t);return[...new Uint8Array(e)].map(i=>i.toString(16).padStart(2,"0")).join("").slice(0,12)}var lt=class extends o{constructor(){super(...arguments);a(this,"suppressErrors",!1);a(this,"seenErrors",new Set)}connect(){let e=`${window.BASE_URL||""}/admin/tools/log_js_error`;$e().then(r=>{this.fingerprint=r,this._send(e,{type:"fingerprint",fingerprint:r,comment:"Generated from browser+OS+timezone+memory. See logger_controller.js for details."}),this._logInitialEvents(e)})}_logInitialEvents(t){this._send(t,{type:"environment",userAgent:navigator.userAgent,userAgentData:navigator.userAgentData||null,platform:navigator.platform,language:navigator.language,languages:navigator.languages,standalone:window.navigator.standalone||!1,isSecureContext:window.isSecureContext,referrer:document.referrer});let e=new Date;this._send(t,{type:"client-time",time:e.toISOString(),timezone:Intl.DateTimeFormat().resolvedOptions().timeZone,offsetMinutes:e.getTimezoneOffset()}),this._send(t,{type:"viewport",width:window.innerWidth,height:window.innerHeight,orientation:screen.orientation?.type||"unknown"}),navigator.connection&&this._send(t,{type:"network-info",downlink:navigator.connection.downlink,effectiveType:navigator.connection.effectiveType,rtt:navigator.connection.rtt,saveData:navigator.connection.saveData});let r=[];window.fetch||r.push("fetch"),window.Promise||r.push("Promise"),window.IntersectionObserver||r.push("IntersectionObserver"),window.ResizeObserver||r.push("ResizeObserver"),(!window.CSS||!CSS.supports("display: grid"))&&r.push("CSS Grid"),r.length&&this._send(t,{type:"missing-features",features:r}),this._send(t,{type:"ui-preference",darkMode:window.matchMedia("(prefers-color-scheme: dark)").matches});let i=!0;try{localStorage.setItem("logger_test","1"),localStorage.removeItem("logger_test")}catch{i=!1}this._send(t,{type:"storage",localStorageAvailable:i}),window.addEventListener("load",()=>{let n=performance.getEntriesByType("navigation")[0];n&&this._send(t,{type:"performance",timing:{domContentLoaded:n.domContentLoadedEventEnd-n.startTime,loadEvent:n.loadEventEnd-n.startTime,timeToFirstByte:n.responseStart-n.requestStart}})}),document.addEventListener("visibilitychange",()=>{this._send(t,{type:"visibility",state:document.visibilityState,timestamp:new Date().toISOString()})}),document.body.addEventListener("htmx:sendError",n=>{this._send(t,{type:"htmx-send-error",error:n.detail.error?.message||"Unknown send error",url:n.detail.pathInfo.requestPath})}),document.body.addEventListener("htmx:responseError",n=>{let l=n.detail.xhr;this._send(t,{type:"htmx-response-error",status:l.status,url:n.detail.pathInfo.requestPath,snippet:l?.responseText?.slice(0,500)||""})}),window.addEventListener("error",n=>{let l=n.target||n.srcElement;l&&(l.src||l.href)&&this._send(t,{type:"resource-error",tag:l.tagName,url:l.src||l.href,outerHTML:l.outerHTML})},!0),window.onerror=(n,l,h,g,d)=>{this._send(t,{type:"error",message:n,source:l,lineno:h,colno:g,stack:d?.stack||null})},window.onunhandledrejection=n=>{this._send(t,{type:"unhandledrejection",reason:n.reason})},["log","info","warn","error"].forEach(n=>{let l=console[n];console[n]=(...h)=>{l.apply(console,h),this._send(t,{type:"console",level:n,message:h.map(g=>String(g)).join(" "),timestamp:new Date().toISOString()})}})}_send(t,e){let r=JSON.stringify({type:e?.type,message:e?.message,source:e?.source,status:e?.status,reason:e?.reason});this.seenErrors.has(r)||fetch(t,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({fingerprint:this.fingerprint||null,...e})}).then(i=>{let n=i.headers.get("content-type")||"";(!i.ok||i.status!==204&&!n.includes("application/json"))&&(console.warn("Log response not JSON. Suppressing this error from future logs."),this.seenErrors.add(r))}).catch(i=>{console.warn("Logger failed. Suppressing this error from future logs.",i),this.seenErrors.add(r)})}};var c=tt.start();c.register("logger",lt);c.register("sidebar",A);c.register("collapse",p);c.register("theme",k);c.register("lang",B);c.register("role-modal",_);c.register("list-toggle",f);c.register("collapsible-item",b);c.register("confirm",D);c.register("reveal-password",st);c.register("redirect-button",O);c.register("flash-message",$);c.register("profile-dropdown",I);c.register("user-form",M);c.register("bootstrap-form",V);c.register("signup-form",F);c.register("reset-password",N);c.register("forgot-password",P);c.register("forgot-username",j);c.register("email-status",rt);c.register("apprise-list-toggle",y);c.register("apprise-form",R);c.register("apprise-validate",K);c.register("webhook-list-toggle",v);c.register("webhook-form",U);c.register("smtp-form",T);c.register("rate-limit-redirect",W);c.register("redirect",it);c.register("layout-debug",nt);c.register("toggle-help",w);c.register("version-check",H);c.register("insecure-warning",ot);c.register("sidebar-active",q);c.register("tabs",x);c.register("action-title",z);c.register("background",J);c.register("font",C);c.register("font-size",G);c.register("roundedness",Z);c.register("contrast",Y);c.register("tracking",L);c.register("line-height",S);var Qe=class extends o{disconnect(){this.stop()}toggle(){this.source?this.stop():this.start()}start(){let s=new URL(this.urlValue,window.location.origin);this.hasLevelTarget&&this.levelTarget.value&&s.searchParams.set("level",this.levelTarget.value),this.hasTextTarget&&this.textTarget.value&&s.searchParams.set("text",this.textTarget.value),this.source=new EventSource(s),this.source.addEventListener("lines",t=>this._prepend(JSON.parse(t.data))),this.source.addEventListener("dropped",t=>{this._setStatus(`${this.droppedLabelValue} ${t.data}`)}),this.source.onerror=()=>{this.source&&this.source.readyState===EventSource.CLOSED&&(this.stop(),this._setStatus(this.unavailableLabelValue))},this._setStatus(""),this.hasToggleTarget&&(this.toggleTarget.textContent=this.stopLabelValue)}stop(){this.source&&(this.source.close(),this.source=null),this.hasToggleTarget&&(this.toggleTarget.textContent=this.startLabelValue)}_prepend(s){if(!this.hasRowsTarget)return;let t=document.createDocumentFragment();for(let e=s.length-1;e>=0;e--)t.appendChild(this._row(s[e]));for(this.rowsTarget.prepend(t);this.rowsTarget.rows.length>this.maxRowsValue;)this.rowsTarget.deleteRow(-1)}_row([s,t,e]){let r=document.createElement("tr");r.className="hover:bg-base-200 dark:hover:bg-base-700";let i=[[s,"py-2 px-4 font-mono text-xs border-l border-t border-base-300 dark:border-base-700"],[t,"py-2 px-4 text-xs border-l border-t border-base-300 dark:border-base-700"],[e,"py-2 px-4 break-words text-xs border-l border-t border-base-300 dark:border-base-700"]];for(let[n,l]of i){let h=document.createElement("td");h.className=l,h.textContent=n,r.appendChild(h)}return r}_setStatus(s){this.hasStatusTarget&&(this.statusTarget.textContent=s)}};a(Qe,"targets",["rows","level","text","toggle","status"]),a(Qe,"values",{url:String,maxRows:{type:Number,default:500},startLabel:String,stopLabel:String,droppedLabel:String,unavailableLabel:String});c.register("profile-title",at);c.register("log-stream",Qe);window.Stimulus=c;
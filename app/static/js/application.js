@@ -45,6 +45,7 @@ import TrackingController from "./controllers/tracking_controller.js";
 import LineHeightController from "./controllers/line_height_controller.js";
 import ProfileTitleController from "./controllers/profile_title_controller.js"
 import LoggerController from "./controllers/logger_controller.js";
+import LogStreamController from "./controllers/log_stream_controller.js";
 
 const application = Application.start();
 application.register("logger", LoggerController);
@@ -90,6 +91,7 @@ application.register("contrast", ContrastController);
 application.register("tracking", TrackingController);
 application.register("line-height", LineHeightController);
 application.register("profile-title", ProfileTitleController)
+application.register("log-stream", LogStreamController);
 
 window.Stimulus = application;
 // console.log("✅ Stimulus boot finished");
\ No newline at end of file
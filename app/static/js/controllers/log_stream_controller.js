@@ -0,0 +1,107 @@
+// static/js/controllers/log_stream_controller.js
+import { Controller } from "../vendor/stimulus.js";
+
+// ─────────────────────────────────────────────────────────────
+// Live tail for the admin Logs tab
+// ─────────────────────────────────────────────────────────────
+/**
+ * Subscribes to the reports log stream (Server-Sent Events) with the filter
+ * form's level and text, and prepends new entries to the log table.
+ * Rows beyond maxRows are trimmed from the bottom. The stream closes when the
+ * table is swapped out (filters applied) or the tail is stopped.
+ */
+export default class extends Controller {
+  static targets = ["rows", "level", "text", "toggle", "status"];
+  static values = {
+    url: String,
+    maxRows: { type: Number, default: 500 },
+    startLabel: String,
+    stopLabel: String,
+    droppedLabel: String,
+    unavailableLabel: String,
+  };
+
+  disconnect() {
+    this.stop();
+  }
+
+  toggle() {
+    if (this.source) {
+      this.stop();
+    } else {
+      this.start();
+    }
+  }
+
+  start() {
+    const url = new URL(this.urlValue, window.location.origin);
+    if (this.hasLevelTarget && this.levelTarget.value) {
+      url.searchParams.set("level", this.levelTarget.value);
+    }
+    if (this.hasTextTarget && this.textTarget.value) {
+      url.searchParams.set("text", this.textTarget.value);
+    }
+
+    this.source = new EventSource(url);
+    this.source.addEventListener("lines", (event) => this._prepend(JSON.parse(event.data)));
+    this.source.addEventListener("dropped", (event) => {
+      this._setStatus(`${this.droppedLabelValue} ${event.data}`);
+    });
+    this.source.onerror = () => {
+      // CLOSED: the server refused (viewer cap) or the session ended; otherwise
+      // the browser reconnects by itself
+      if (this.source && this.source.readyState === EventSource.CLOSED) {
+        this.stop();
+        this._setStatus(this.unavailableLabelValue);
+      }
+    };
+
+    this._setStatus("");
+    if (this.hasToggleTarget) this.toggleTarget.textContent = this.stopLabelValue;
+  }
+
+  stop() {
+    if (this.source) {
+      this.source.close();
+      this.source = null;
+    }
+    if (this.hasToggleTarget) this.toggleTarget.textContent = this.startLabelValue;
+  }
+
+  _prepend(entries) {
+    if (!this.hasRowsTarget) return;
+
+    // Entries arrive oldest first; the table is newest first
+    const fragment = document.createDocumentFragment();
+    for (let i = entries.length - 1; i >= 0; i--) {
+      fragment.appendChild(this._row(entries[i]));
+    }
+    this.rowsTarget.prepend(fragment);
+
+    while (this.rowsTarget.rows.length > this.maxRowsValue) {
+      this.rowsTarget.deleteRow(-1);
+    }
+  }
+
+  _row([timestamp, level, message]) {
+    const row = document.createElement("tr");
+    row.className = "hover:bg-base-200 dark:hover:bg-base-700";
+
+    const cells = [
+      [timestamp, "py-2 px-4 font-mono text-xs border-l border-t border-base-300 dark:border-base-700"],
+      [level, "py-2 px-4 text-xs border-l border-t border-base-300 dark:border-base-700"],
+      [message, "py-2 px-4 break-words text-xs border-l border-t border-base-300 dark:border-base-700"],
+    ];
+    for (const [text, className] of cells) {
+      const cell = document.createElement("td");
+      cell.className = className;
+      cell.textContent = text;
+      row.appendChild(cell);
+    }
+    return row;
+  }
+
+  _setStatus(text) {
+    if (this.hasStatusTarget) this.statusTarget.textContent = text;
+  }
+}
@@ -0,0 +1,39 @@
+"""
+# ---------------------------------------------------------------------
+# admin_presence.py
+# app/utils/admin_presence.py
+# Cached "an admin account exists" flag for the bootstrap guard.
+# ---------------------------------------------------------------------
+"""
+
+from sqlalchemy import text
+
+from app.extensions import db
+
+# Flips to True once an admin is seen and stays there; only a role change or a
+# user deletion (invalidate_admin_exists) makes the next check query again.
+# "No admin" is never cached, so the bootstrap admin is picked up at once.
+_admin_exists = False
+
+
+# ---------------------------------------------------------------------
+# admin_exists
+# ---------------------------------------------------------------------
+def admin_exists():
+    """True if at least one user has the admin role (queried until it is)."""
+    global _admin_exists
+    if not _admin_exists:
+        _admin_exists = (
+            db.session.execute(text("SELECT 1 FROM users WHERE role = 'admin' LIMIT 1")).first()
+            is not None
+        )
+    return _admin_exists
+
+
+# ---------------------------------------------------------------------
+# invalidate_admin_exists
+# ---------------------------------------------------------------------
+def invalidate_admin_exists():
+    """Re-check admin presence on the next request (after role changes and user deletions)."""
+    global _admin_exists
+    _admin_exists = False
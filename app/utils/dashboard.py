@@ -6,9 +6,20 @@
 # ---------------------------------------------------------------------
 """
 
-from app.models import Message, EmailMessage
+import time
 from datetime import datetime, timezone, timedelta
 
+from sqlalchemy import func, or_, select
+
+from app.config import DUE_CHECKIN_CACHE_SECONDS
+from app.extensions import db
+from app.models import NEXT_ACTION_EXPIRE, Message, EmailMessage
+
+DUE_COUNT_CACHE_MAX_USERS = 1000
+
+# user_id -> (count, monotonic expiry); see invalidate_due_checkin_count
+_due_counts = {}
+
 def is_checkin_due(last_checkin, interval_minutes, grace_minutes):
     """
     True if check-in is within grace window (past due but not executed).
@@ -22,18 +33,56 @@ def is_checkin_due(last_checkin, interval_minutes, grace_minutes):
 
     return due_at <= now < grace_until
 
+def _due_count_query(model, user_id, now):
+    """
+    COUNT of the user's items inside their check-in window, on the
+    (user_id, next_action_at) index. next_action_at is only set for enabled,
+    unexecuted items with a schedule; an item is past due once its check-in
+    deadline passed (or its reminder went out) and stays due until
+    last_checkin + interval + grace.
+    """
+    window_end = func.datetime(
+        model.last_checkin,
+        func.printf("+%d minutes", model.checkin_interval_minutes + model.grace_period_minutes),
+    )
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(
+            model.user_id == user_id,
+            model.next_action_at.is_not(None),
+            or_(model.next_action_phase == NEXT_ACTION_EXPIRE, model.next_action_at <= now),
+            model.grace_period_minutes > 0,
+            window_end > now.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        .scalar_subquery()
+    )
+
+
 def get_due_checkin_count(user_id):
     """
     Returns the number of enabled messages/emails that are currently due for check-in.
+    One aggregate query, cached per user for DUE_CHECKIN_CACHE_SECONDS.
     """
-    messages = Message.query.filter_by(user_id=user_id, is_enabled=True).all()
-    emails = EmailMessage.query.filter_by(user_id=user_id, is_enabled=True).all()
+    cached = _due_counts.get(user_id)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    now = datetime.now(timezone.utc)
+    count = db.session.execute(
+        select(_due_count_query(Message, user_id, now) + _due_count_query(EmailMessage, user_id, now))
+    ).scalar()
 
-    count = 0
-    for m in messages:
-        if is_checkin_due(m.last_checkin, m.checkin_interval_minutes, m.grace_period_minutes):
-            count += 1
-    for e in emails:
-        if is_checkin_due(e.last_checkin, e.checkin_interval_minutes, e.grace_period_minutes):
-            count += 1
+    expires = time.monotonic() + DUE_CHECKIN_CACHE_SECONDS
+    if len(_due_counts) >= DUE_COUNT_CACHE_MAX_USERS:
+        _due_counts.clear()  # Bounded; the next render per user recounts once
+    _due_counts[user_id] = (count, expires)
     return count
+
+
+def invalidate_due_checkin_count(user_id):
+    """
+    Recount on the user's next render. Call after a check-in, toggle or
+    schedule edit commits.
+    """
+    _due_counts.pop(user_id, None)
@@ -0,0 +1,241 @@
+"""
+# ---------------------------------------------------------------------
+# log_archive.py
+# app/utils/log_archive.py
+# Rotated log segments: gzip compression in the background, a one-line
+# header index per segment, and parallel search across segments.
+# ---------------------------------------------------------------------
+"""
+
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import LOG_SEARCH_WORKERS
+
+# First line of every compressed segment:
+#   #grylli-segment {"first": ts, "last": ts, "lines": n, "levels": {"INFO": n, ...}}
+# Being part of the file, it moves with it when the handler shifts .1 -> .2 ...
+SEGMENT_HEADER_PREFIX = "#grylli-segment "
+
+_JSON_LEVEL = re.compile(r'"level":"(\w+)"')
+
+_compressor = None  # Latest background compression thread
+
+
+# ---------------------------------------------------------------------
+# _line_meta
+# ---------------------------------------------------------------------
+def _line_meta(line):
+    """
+    (timestamp, level) of a human log line ("ts - LEVEL - ...") or an audit
+    JSON line ({"ts":...,"level":...}); (None, None) for continuation lines.
+    """
+    if line[:4].isdigit():
+        parts = line.split(" - ", 2)
+        if len(parts) == 3:
+            return parts[0], parts[1]
+    elif line.startswith('{"ts":"'):
+        level = _JSON_LEVEL.search(line)
+        return line[7:30], level.group(1) if level else None
+    return None, None
+
+
+# ---------------------------------------------------------------------
+# compress_segment
+# ---------------------------------------------------------------------
+def compress_segment(source, dest):
+    """
+    Gzip `source` into `dest` behind a header line, then delete `source`.
+    Written to a temporary file first, so `dest` is always complete. The header
+    and the data come from the same open handle, so they describe the same file.
+    """
+    header = {"first": None, "last": None, "lines": 0, "levels": {}}
+    tmp_path = f"{dest}.tmp"
+    with open(source, "rb") as src:
+        for raw in src:
+            header["lines"] += 1
+            ts, level = _line_meta(raw.decode("utf-8", errors="replace"))
+            if ts is None:
+                continue
+            header["first"] = header["first"] or ts
+            header["last"] = ts
+            if level:
+                header["levels"][level] = header["levels"].get(level, 0) + 1
+
+        src.seek(0)
+        with gzip.open(tmp_path, "wb", compresslevel=6) as out:
+            out.write(f"{SEGMENT_HEADER_PREFIX}{json.dumps(header, separators=(',', ':'))}\n".encode("utf-8"))
+            while chunk := src.read(1024 * 1024):
+                out.write(chunk)
+    os.replace(tmp_path, dest)
+    os.remove(source)
+
+
+def _compress_in_background(pairs):
+    def run():
+        for source, dest in pairs:
+            try:
+                compress_segment(source, dest)
+            except Exception as e:
+                sys.stderr.write(f"Log segment compression failed for {source}: {e}\n")
+
+    global _compressor
+    wait_for_compression()  # Keep segment renames and compressions in order
+    _compressor = threading.Thread(target=run, name="grylli-log-compress", daemon=True)
+    _compressor.start()
+
+
+def wait_for_compression():
+    """
+    Block until the background compression, if any, has finished. A rollover
+    must call this before shifting segment names: a segment still waiting under
+    its uncompressed name is not shifted and would be overwritten by the next one.
+    """
+    compressor = _compressor
+    if compressor is not None and compressor.is_alive():
+        compressor.join()
+
+
+# ---------------------------------------------------------------------
+# segment_namer / segment_rotator (RotatingFileHandler hooks)
+# ---------------------------------------------------------------------
+def segment_namer(default_name):
+    """Rotated segments are named grylli.log.1.gz, grylli.log.2.gz, ..."""
+    return f"{default_name}.gz"
+
+
+def segment_rotator(source, dest):
+    """
+    Move the full log aside under its uncompressed name (cheap, on the writer
+    thread) and gzip it into `dest` in the background. Until that finishes,
+    readers find the uncompressed segment instead. The handler has already
+    waited for the previous compression (see wait_for_compression).
+    """
+    pending = dest[: -len(".gz")]
+    os.replace(source, pending)
+    _compress_in_background([(pending, dest)])
+
+
+# ---------------------------------------------------------------------
+# compress_pending_segments
+# ---------------------------------------------------------------------
+def compress_pending_segments(base):
+    """
+    Compress uncompressed segments of `base` left by an interrupted compression
+    or by versions that did not compress (grylli.log.1 ... without .gz).
+    """
+    pairs = []
+    for number in range(1, 1000):
+        plain = f"{base}.{number}"
+        if os.path.exists(plain):
+            pairs.append((plain, f"{plain}.gz"))
+        elif not os.path.exists(f"{plain}.gz"):
+            break
+    if pairs:
+        _compress_in_background(pairs)
+
+
+# ---------------------------------------------------------------------
+# list_segments
+# ---------------------------------------------------------------------
+def list_segments(base):
+    """
+    Archived segments of `base`, newest first, as [(path, header)]. `header` is
+    None for a segment still waiting to be compressed.
+    """
+    segments = []
+    for number in range(1, 1000):
+        compressed = f"{base}.{number}.gz"
+        plain = f"{base}.{number}"
+        if os.path.exists(compressed):
+            segments.append((compressed, read_segment_header(compressed)))
+        elif os.path.exists(plain):
+            segments.append((plain, None))
+        else:
+            break
+    return segments
+
+
+def read_segment_header(path):
+    """The segment's header dict (only its first gzip block is decompressed)."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            line = f.readline()
+        if line.startswith(SEGMENT_HEADER_PREFIX):
+            return json.loads(line[len(SEGMENT_HEADER_PREFIX):])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# ---------------------------------------------------------------------
+# iter_segment_lines
+# ---------------------------------------------------------------------
+def iter_segment_lines(path):
+    """A segment's lines in file order (oldest first), header excluded."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith(SEGMENT_HEADER_PREFIX):
+                continue
+            yield line.rstrip("\r\n")
+
+
+def _scan_segment(path, match, limit, stop):
+    newest = deque(maxlen=limit)
+    for count, line in enumerate(iter_segment_lines(path)):
+        if not count % 4096 and stop.is_set():
+            break
+        entry = match(line)
+        if entry is not None:
+            newest.append(entry)
+    newest.reverse()
+    return list(newest)
+
+
+# ---------------------------------------------------------------------
+# search_segments
+# ---------------------------------------------------------------------
+def search_segments(base, match, max_entries, after=None, level=None):
+    """
+    Yield up to `max_entries` entries from the archived segments of `base`,
+    newest first. `match(line)` returns an entry or None.
+
+    Segments are skipped by their header: entirely older than `after` (a log
+    timestamp string), or without a single `level` line. The rest are scanned
+    in parallel (LOG_SEARCH_WORKERS threads) and their results streamed in
+    segment order; scans still running stop once enough entries were yielded.
+    """
+    if max_entries <= 0:
+        return
+
+    segments = []
+    for path, header in list_segments(base):
+        if header is not None:
+            if after and header["last"] and header["last"] < after:
+                break  # This and every older segment end before the window
+            if level and not header["levels"].get(level):
+                continue
+        segments.append(path)
+    if not segments:
+        return
+
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=LOG_SEARCH_WORKERS, thread_name_prefix="grylli-log-search")
+    try:
+        futures = [pool.submit(_scan_segment, path, match, max_entries, stop) for path in segments]
+        for future in futures:
+            for entry in future.result():
+                yield entry
+                max_entries -= 1
+                if not max_entries:
+                    return
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
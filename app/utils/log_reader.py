@@ -0,0 +1,174 @@
+"""
+# ---------------------------------------------------------------------
+# log_reader.py
+# app/utils/log_reader.py
+# Readers for the admin Logs report (human log) and the activity index
+# backfill (JSON-lines audit log), live file and rotated segments.
+# ---------------------------------------------------------------------
+"""
+
+import json
+import os
+
+from app.config import AUDIT_LOG_ENABLED, AUDIT_LOG_PATH, LOG_FILE_PATH, LOG_READER_BLOCK_SIZE
+from app.utils.log_archive import iter_segment_lines, list_segments, search_segments
+from app.utils.logging import ALLOWED_USER_ACTIONS
+
+# Topics of log_user_action() entries shown in a user's activity tab
+MODULE_NAMES = {
+    "Reminder",
+    "Email",
+    "Notification",
+    "Apprise",
+    "Webhook",
+    "SMTP",
+    "Account",
+}
+
+
+# ---------------------------------------------------------------------
+# read_lines_reversed
+# ---------------------------------------------------------------------
+def read_lines_reversed(path, block_size=LOG_READER_BLOCK_SIZE):
+    """
+    Yield the file's lines newest first (without line endings), reading fixed
+    size blocks backwards from EOF. Memory is one block plus one line; callers
+    that stop iterating early never touch the rest of the file.
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""  # Line whose beginning lies in the next block back
+        at_eof = True
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + tail
+
+            lines = block.split(b"\n")
+            tail = lines.pop(0)  # Possibly incomplete; completed by the next block
+            if at_eof and lines and lines[-1] == b"":
+                lines.pop()  # File ends with a newline
+            at_eof = False
+
+            for line in reversed(lines):
+                yield line.rstrip(b"\r").decode("utf-8", "replace")
+
+        if not at_eof:  # The file's first line (empty files have none)
+            yield tail.rstrip(b"\r").decode("utf-8", "replace")
+
+
+# ---------------------------------------------------------------------
+# tail_log_entries
+# ---------------------------------------------------------------------
+def parse_log_line(line):
+    """(timestamp, level, message) of a log entry line, or None."""
+    line = line.strip()
+    if not line[:4].isdigit() or line.count(" - ") < 2:
+        return None
+    parts = line.split(" - ", 2)
+    return tuple(parts) if len(parts) == 3 else None
+
+
+def tail_log_entries(max_entries, level=None, text=None, after=None):
+    """
+    Newest-first (timestamp, level, message) tuples from the human log, stopping
+    as soon as `max_entries` lines pass the filters. Reads the live file from
+    EOF, then continues into the rotated segments (see search_segments()).
+
+    Args:
+        max_entries: Cap on entries returned.
+        level: Optional exact level (e.g. "ERROR").
+        text: Optional lower-case substring of the message.
+        after: Optional datetime; the log is chronological, so reading stops at
+            the first entry older than it, and older segments are skipped.
+
+    Raises:
+        FileNotFoundError: If the log file does not exist.
+    """
+    # Log timestamps compare correctly as strings
+    after_ts = after.strftime("%Y-%m-%d %H:%M:%S,%f")[:23] if after else None
+
+    def match(line):
+        parts = parse_log_line(line)
+        if parts is None:
+            return None
+        timestamp, line_level, message = parts
+        if after_ts and timestamp < after_ts:
+            return None
+        if level and line_level.upper() != level:
+            return None
+        if text and text not in message.lower():
+            return None
+        return parts
+
+    entries = []
+    for line in read_lines_reversed(LOG_FILE_PATH):
+        parts = parse_log_line(line)
+        if parts is None:
+            continue
+        if after_ts and parts[0] < after_ts:
+            return entries  # Rotated segments are older still
+        if match(line) is not None:
+            entries.append(parts)
+            if len(entries) >= max_entries:
+                return entries
+
+    entries.extend(
+        search_segments(LOG_FILE_PATH, match, max_entries - len(entries), after=after_ts, level=level)
+    )
+    return entries
+
+
+# ---------------------------------------------------------------------
+# audit_log_available
+# ---------------------------------------------------------------------
+def audit_log_available():
+    """True when the audit log is enabled and has been written."""
+    return AUDIT_LOG_ENABLED and os.path.exists(AUDIT_LOG_PATH)
+
+
+# ---------------------------------------------------------------------
+# iter_audit_records_chronological
+# ---------------------------------------------------------------------
+def iter_audit_records_chronological(since=None):
+    """
+    Yield audit records oldest first, across the rotated segments (skipping
+    those that end before `since`, a log timestamp string) and the live file.
+    """
+    segments = [
+        path for path, header in list_segments(AUDIT_LOG_PATH)
+        if not (since and header and header["last"] and header["last"] < since)
+    ]
+    for path in [*reversed(segments), AUDIT_LOG_PATH]:
+        try:
+            for line in iter_segment_lines(path):
+                if line.startswith("{"):
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            continue  # Rotated away while reading
+
+
+# ---------------------------------------------------------------------
+# activity_entry
+# ---------------------------------------------------------------------
+def activity_entry(fields):
+    """
+    (category, message) for an audit record shown in its user's activity tab,
+    or None for records the tab leaves out (no user, or an action outside
+    MODULE_NAMES / ALLOWED_USER_ACTIONS).
+    """
+    if not fields.get("user"):
+        return None
+
+    topic = fields.get("topic", "")
+    action = fields.get("action")
+    if action is None:
+        return topic, fields.get("detail", "")
+    if topic not in MODULE_NAMES or action not in ALLOWED_USER_ACTIONS:
+        return None
+    return topic, f"{action} - {fields.get('label', '')}"
@@ -0,0 +1,194 @@
+"""
+# ---------------------------------------------------------------------
+# log_tail.py
+# app/utils/log_tail.py
+# Follows LOG_FILE_PATH from its last offset (across rotations) and fans
+# new entries out to live log viewers.
+# ---------------------------------------------------------------------
+"""
+
+import os
+import queue
+import threading
+import time
+
+from app.config import (
+    LOG_FILE_PATH,
+    LOG_STREAM_BATCH_LINES,
+    LOG_STREAM_MAX_SUBSCRIBERS,
+    LOG_STREAM_POLL_SECONDS,
+    LOG_STREAM_QUEUE_SIZE,
+)
+from app.utils.log_reader import parse_log_line
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+_subscribers = set()
+_tailer = None
+_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------
+# LogStreamBusy
+# ---------------------------------------------------------------------
+class LogStreamBusy(Exception):
+    """Raised by subscribe() when LOG_STREAM_MAX_SUBSCRIBERS are connected."""
+
+
+# ---------------------------------------------------------------------
+# Subscription
+# ---------------------------------------------------------------------
+class Subscription:
+    """
+    One viewer: a bounded queue of (timestamp, level, message) entries passing
+    its filters. The tailer never waits for a viewer; entries that do not fit
+    are counted in `dropped` instead.
+    """
+
+    def __init__(self, level=None, text=None):
+        self.level = level
+        self.text = text
+        self.queue = queue.Queue(maxsize=LOG_STREAM_QUEUE_SIZE)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def offer(self, entry):
+        if self.level and entry[1].upper() != self.level:
+            return
+        if self.text and self.text not in entry[2].lower():
+            return
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def next_batch(self, timeout):
+        """
+        Up to LOG_STREAM_BATCH_LINES entries, oldest first, waiting at most
+        `timeout` seconds for the first one ([] when none arrived).
+        """
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < LOG_STREAM_BATCH_LINES:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def take_dropped(self):
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+
+# ---------------------------------------------------------------------
+# subscribe / unsubscribe
+# ---------------------------------------------------------------------
+def subscribe(level=None, text=None):
+    """
+    Register a viewer and make sure this process's tailer is running.
+
+    Args:
+        level: Optional exact level (e.g. "ERROR").
+        text: Optional lower-case substring of the message.
+
+    Raises:
+        LogStreamBusy: If the subscriber cap is reached.
+    """
+    global _tailer
+    with _lock:
+        if len(_subscribers) >= LOG_STREAM_MAX_SUBSCRIBERS:
+            raise LogStreamBusy()
+        subscription = Subscription(level, text)
+        _subscribers.add(subscription)
+        if _tailer is None:
+            _tailer = _LogTailer()
+            _tailer.start()
+    return subscription
+
+
+def unsubscribe(subscription):
+    """Remove a viewer; the tailer stops once the last one is gone."""
+    with _lock:
+        _subscribers.discard(subscription)
+
+
+# ---------------------------------------------------------------------
+# _LogTailer
+# ---------------------------------------------------------------------
+class _LogTailer(threading.Thread):
+    """
+    Polls the log every LOG_STREAM_POLL_SECONDS and reads only what was
+    appended since the last poll. When the path points at a new file (the
+    handler rotated: different inode) or the file shrank, the old file is
+    read to its end before following the new one from the start.
+    """
+
+    def __init__(self):
+        super().__init__(name="grylli-log-tail", daemon=True)
+        self.file = None
+        self.inode = None
+        self.partial = b""
+
+    def run(self):
+        global _tailer
+        try:
+            self._open(from_start=False)
+            while True:
+                with _lock:
+                    if not _subscribers:
+                        _tailer = None
+                        return
+                    subscribers = list(_subscribers)
+
+                self._follow(subscribers)
+                time.sleep(LOG_STREAM_POLL_SECONDS)
+        finally:
+            if self.file:
+                self.file.close()
+            with _lock:
+                if _tailer is self:
+                    _tailer = None
+
+    def _open(self, from_start):
+        try:
+            self.file = open(LOG_FILE_PATH, "rb")
+        except FileNotFoundError:
+            self.file = None
+            return
+        self.inode = os.fstat(self.file.fileno()).st_ino
+        self.partial = b""
+        if not from_start:
+            self.file.seek(0, os.SEEK_END)  # Viewers only get lines written from now on
+
+    def _follow(self, subscribers):
+        if self.file is None:
+            self._open(from_start=True)
+            if self.file is None:
+                return
+
+        self._read_new(subscribers)
+
+        try:
+            stat = os.stat(LOG_FILE_PATH)
+        except FileNotFoundError:
+            return  # Between the rotation's rename and the new file's creation
+        if stat.st_ino != self.inode or stat.st_size < self.file.tell():
+            self._read_new(subscribers)  # Rest of the rotated (or truncated) file
+            self.file.close()
+            self._open(from_start=True)
+            self._read_new(subscribers)
+
+    def _read_new(self, subscribers):
+        while chunk := self.file.read(READ_CHUNK_SIZE):
+            lines = (self.partial + chunk).split(b"\n")
+            self.partial = lines.pop()  # Incomplete until its newline is written
+            for line in lines:
+                entry = parse_log_line(line.decode("utf-8", "replace"))
+                if entry is not None:
+                    for subscription in subscribers:
+                        subscription.offer(entry)
@@ -10,9 +10,36 @@ import logging
 import sys
 from datetime import datetime
 
-from flask import has_app_context
-
 from app.config import LOG_FILE_PATH
+from app.utils.settings_cache import debug_enabled
+from app.utils.setup_logging import (
+    AUDIT_ATTR,
+    CONSOLE_ATTR,
+    flush_logs,
+    pipeline_running,
+    submit_record,
+)
+
+# Marks records for the coloured console echo done by the log writer thread
+_CONSOLE = {CONSOLE_ATTR: True}
+_root_logger = logging.getLogger()
+
+
+# ---------------------------------------------------------------------
+# _log
+# ---------------------------------------------------------------------
+def _log(level, message, audit=None):
+    """
+    Queue a console-echoed record for the log writer. Builds the record directly:
+    the log format has no caller info, so skip logging's stack walk. `audit`
+    (dict of fields) also sends the record to the JSON-lines audit log.
+    """
+    extra = _CONSOLE if audit is None else {CONSOLE_ATTR: True, AUDIT_ATTR: audit}
+    record = _root_logger.makeRecord(_root_logger.name, level, "", 0, message, None, None, extra=extra)
+    if pipeline_running():
+        submit_record(record)
+    elif _root_logger.isEnabledFor(level):
+        _root_logger.handle(record)
 
 # ---------------------------------------------------------------------
 # Configuration: ANSI color codes for terminal output
@@ -39,14 +66,16 @@ def _timestamp():
 # ---------------------------------------------------------------------
 # log_info_message
 # ---------------------------------------------------------------------
-def log_info_message(message: str):
+def log_info_message(message: str, audit: dict = None):
     """
-    Logs a blue INFO-level message to stdout.
+    Logs a blue INFO-level message to stdout (queued; written by the log writer).
+    `audit` adds a structured copy to the audit log (see log_user_action).
     """
-    print(
-        f"{COLOR_BLUE}{_timestamp()} - INFO - {message}{COLOR_RESET}", file=sys.stdout, flush=True
-    )
-    logging.info(message)
+    if not pipeline_running():
+        print(
+            f"{COLOR_BLUE}{_timestamp()} - INFO - {message}{COLOR_RESET}", file=sys.stdout, flush=True
+        )
+    _log(logging.INFO, message, audit)
 
 
 # ---------------------------------------------------------------------
@@ -54,22 +83,18 @@ def log_info_message(message: str):
 # ---------------------------------------------------------------------
 def log_debug_message(message: str):
     """
-    Logs a cyan DEBUG-level message to stdout if DEBUG = True in system_config.
+    Logs a cyan DEBUG-level message to stdout if DEBUG = True in system_config
+    (read from the cached settings snapshot, not the database).
     """
     try:
-        if not has_app_context():
-            return
-
-        from app.models import SystemConfig
-
-        row = SystemConfig.query.filter_by(key="DEBUG").first()
-        if row and str(row.value).strip().lower() in ["1", "true", "yes"]:
-            print(
-                f"{COLOR_CYAN}{_timestamp()} - DEBUG - {message}{COLOR_RESET}",
-                file=sys.stdout,
-                flush=True,
-            )
-            logging.debug(message)
+        if debug_enabled():
+            if not pipeline_running():
+                print(
+                    f"{COLOR_CYAN}{_timestamp()} - DEBUG - {message}{COLOR_RESET}",
+                    file=sys.stdout,
+                    flush=True,
+                )
+            _log(logging.DEBUG, message)
     except Exception as e:
         logging.warning("Failed to log debug message: %s", str(e))
 
@@ -78,17 +103,19 @@ def log_debug_message(message: str):
 # ---------------------------------------------------------------------
 # log_error_message
 # ---------------------------------------------------------------------
-def log_error_message(message: str):
+def log_error_message(message: str, audit: dict = None):
     """
-    Logs a red ERROR-level message to stderr.
+    Logs a red ERROR-level message to stderr (queued; written by the log writer).
 
     Args:
         message (str): The error message to log.
+        audit (dict): Optional structured copy for the audit log.
     """
-    print(
-        f"{COLOR_RED}{_timestamp()} - ERROR - {message}{COLOR_RESET}", file=sys.stderr, flush=True
-    )
-    logging.error(message)
+    if not pipeline_running():
+        print(
+            f"{COLOR_RED}{_timestamp()} - ERROR - {message}{COLOR_RESET}", file=sys.stderr, flush=True
+        )
+    _log(logging.ERROR, message, audit)
 
 
 # ---------------------------------------------------------------------
@@ -101,6 +128,7 @@ def log_step(title: str):
     Args:
         title (str): A short label for the step (e.g., 'Initializing App').
     """
+    flush_logs()  # Keep the separator after lines queued before it
     print(f"\n{COLOR_BLUE}{'-' * 60}\n{title.upper()}\n{'-' * 60}{COLOR_RESET}")
 
 
@@ -119,14 +147,10 @@ def log_exception_with_traceback(prefix: str, exception: Exception):
     log_error_message(full_message)
     logging.exception(full_message)  # includes traceback
 
-    if has_app_context():
-        from app.models import SystemConfig
-
-        row = SystemConfig.query.filter_by(key="DEBUG").first()
-        if row and str(row.value).strip().lower() in ["1", "true", "yes"]:
-            import traceback
+    if debug_enabled():
+        import traceback
 
-            traceback.print_exc()
+        traceback.print_exc()
 
 
 # ---------------------------------------------------------------------
@@ -193,7 +217,54 @@ def log_user_action(
     if extra:
         parts.append(extra)
 
-    log_info_message(" - ".join(parts))
+    audit = {"topic": topic, "action": action, "user": user, "object_id": obj_id, "label": label}
+    if extra:
+        audit["detail"] = extra
+    log_info_message(" - ".join(parts), audit=audit)
+
+
+# ---------------------------------------------------------------------
+# log_user_event
+# ---------------------------------------------------------------------
+def log_user_event(topic: str, username: str, detail: str, error: bool = False):
+    """
+    Logs "Topic - username - detail" (page access, sign-in events, ...) with the
+    same fields in the audit log.
+
+    Args:
+        topic (str): The category (e.g., 'Access', 'Auth').
+        username (str): The user concerned.
+        detail (str): What happened.
+        error (bool): Log at ERROR instead of INFO.
+    """
+    audit = {"topic": topic, "user": username, "detail": detail}
+    log = log_error_message if error else log_info_message
+    log(f"{topic} - {username} - {detail}", audit=audit)
+
+
+# ---------------------------------------------------------------------
+# log_scheduler_message
+# ---------------------------------------------------------------------
+def log_scheduler_message(job: str, status: str, detail: str, duration_ms: float = None):
+    """
+    Logs "Scheduler [Job] - Status - detail" ("ERROR - ..." at ERROR level when
+    the status is "Failure") with the same fields in the audit log.
+
+    Args:
+        job (str): Job name, e.g. 'DailyBackup'.
+        status (str): 'Success' or 'Failure'.
+        detail (str): What happened.
+        duration_ms (float): Optional run time of the step.
+    """
+    audit = {"topic": "Scheduler", "job": job, "status": status, "detail": detail}
+    if duration_ms is not None:
+        audit["duration_ms"] = round(duration_ms, 1)
+
+    message = f"Scheduler [{job}] - {status} - {detail}"
+    if status == "Failure":
+        log_error_message(f"ERROR - {message}", audit=audit)
+    else:
+        log_info_message(message, audit=audit)
 
 # ---------------------------------------------------------------------
 # Configure third-party loggers (e.g., APScheduler)
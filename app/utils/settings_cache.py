@@ -0,0 +1,150 @@
+"""
+# ---------------------------------------------------------------------
+# settings_cache.py
+# app/utils/settings_cache.py
+# Process-level snapshot of the system_config table.
+# ---------------------------------------------------------------------
+"""
+
+import logging
+import threading
+import time
+
+from flask import has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.config import SETTINGS_CACHE_TTL_SECONDS
+
+SYSTEM_CONFIG_TABLE = "system_config"
+TRUTHY_VALUES = ("1", "true", "yes")
+
+# settings_version holds one row; its counter moves with every system_config
+# commit from any process (see _note_settings_change)
+_READ_VERSION = text("SELECT version FROM settings_version WHERE id = 1")
+_BUMP_VERSION = text("UPDATE settings_version SET version = version + 1 WHERE id = 1")
+
+
+# ---------------------------------------------------------------------
+# SettingsSnapshot
+# ---------------------------------------------------------------------
+class SettingsSnapshot:
+    """
+    View of every system_config row, as stored (sensitive values stay encrypted;
+    `plain` memoises their decrypted form for the snapshot's lifetime). `debug`
+    is pre-computed so debug checks are an attribute read.
+    """
+
+    __slots__ = ("local_version", "db_version", "values", "sensitive", "plain", "debug", "check_after")
+
+    def __init__(self, local_version, db_version, rows):
+        self.local_version = local_version
+        self.db_version = db_version
+        self.values = {key: value for key, value, _ in rows}
+        self.sensitive = frozenset(key for key, _, is_sensitive in rows if is_sensitive)
+        self.plain = {}
+        self.debug = str(self.values.get("DEBUG", "")).strip().lower() in TRUTHY_VALUES
+        self.check_after = time.monotonic() + SETTINGS_CACHE_TTL_SECONDS
+
+
+# Empty until the first load; an expired snapshot is still served when no app
+# context is available to refresh it.
+_snapshot = SettingsSnapshot(-1, None, [])
+_snapshot.check_after = 0
+_local_version = 0  # Bumped after every commit in this process that touched system_config
+_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------
+# Version tracking (session events)
+# ---------------------------------------------------------------------
+@event.listens_for(Session, "after_flush")
+def _note_settings_change(session, flush_context):
+    if session.info.get("settings_changed"):
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if getattr(obj, "__tablename__", None) == SYSTEM_CONFIG_TABLE:
+            # Same transaction as the change, so other processes see both or neither
+            session.connection().execute(_BUMP_VERSION)
+            session.info["settings_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop("settings_changed", False):
+        bump_settings_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("settings_changed", None)
+
+
+# ---------------------------------------------------------------------
+# bump_settings_version
+# ---------------------------------------------------------------------
+def bump_settings_version():
+    """
+    Invalidate this process's snapshot. Called automatically on ORM commits;
+    call it directly after a Core-level write to system_config (and bump the
+    settings_version row in that transaction so other processes notice too).
+    """
+    global _local_version
+    with _lock:
+        _local_version += 1
+
+
+# ---------------------------------------------------------------------
+# get_settings_snapshot
+# ---------------------------------------------------------------------
+def get_settings_snapshot():
+    """
+    Return the current snapshot. Between checks (SETTINGS_CACHE_TTL_SECONDS)
+    this is a plain attribute read; a check costs one single-row query, and the
+    table is only reloaded when a commit (from any process) changed it.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot.local_version == _local_version and snapshot.check_after > time.monotonic():
+        return snapshot
+    if not has_app_context():
+        return snapshot
+
+    from app.extensions import db
+    from app.models import SystemConfig
+
+    local_version = _local_version
+    try:
+        # Own connection: never autoflushes or joins the caller's transaction
+        with db.engine.connect() as conn:
+            db_version = conn.execute(_READ_VERSION).scalar()
+            if snapshot.local_version == local_version and db_version == snapshot.db_version:
+                snapshot.check_after = time.monotonic() + SETTINGS_CACHE_TTL_SECONDS
+                return snapshot
+
+            table = SystemConfig.__table__
+            rows = conn.execute(
+                table.select().with_only_columns(table.c.key, table.c.value, table.c.is_sensitive)
+            ).all()
+    except Exception as e:
+        # Keep serving the old snapshot; retry after another TTL
+        logging.warning("Failed to load system settings snapshot: %s", str(e))
+        snapshot.check_after = time.monotonic() + SETTINGS_CACHE_TTL_SECONDS
+        return snapshot
+
+    _snapshot = SettingsSnapshot(local_version, db_version, rows)
+    return _snapshot
+
+
+# ---------------------------------------------------------------------
+# debug_enabled
+# ---------------------------------------------------------------------
+def debug_enabled():
+    """
+    True when system_config DEBUG is set, without a query on the fast path.
+    """
+    snapshot = _snapshot
+    if snapshot.local_version == _local_version and snapshot.check_after > time.monotonic():
+        return snapshot.debug
+    return get_settings_snapshot().debug
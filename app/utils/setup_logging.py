@@ -1,37 +1,368 @@
 """
 setup_logging.py
-Sets up file-based log rotation for Grylli at app startup.
+Sets up Grylli's logging pipeline at app startup: callers only enqueue records;
+one writer thread per process formats them and writes the rotating log file and
+the console in batches, flushing once per batch.
 """
 
+import atexit
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
 
-from app.config import LOG_FILE_PATH
+from app.config import (
+    AUDIT_LOG_ENABLED,
+    AUDIT_LOG_PATH,
+    LOG_BACKUP_COUNT,
+    LOG_BATCH_MAX_RECORDS,
+    LOG_FILE_PATH,
+    LOG_MAX_BYTES,
+    LOG_QUEUE_MAX_SIZE,
+    LOG_QUEUE_OVERFLOW_POLICY,
+    LOG_QUEUE_SAMPLE_RATE,
+)
+from app.utils.log_archive import (
+    compress_pending_segments,
+    segment_namer,
+    segment_rotator,
+    wait_for_compression,
+)
 
+# Records carrying this attribute (set by app.utils.logging helpers) are also
+# echoed, coloured, to the console; everything goes to the log file.
+CONSOLE_ATTR = "grylli_console"
 
+# Records carrying this attribute (a dict of audit fields) are also written as
+# one JSON object per line to AUDIT_LOG_PATH: {"ts", "level", **fields}
+AUDIT_ATTR = "grylli_audit"
+
+COLOR_RESET = "\033[0m"
+CONSOLE_COLORS = {
+    logging.DEBUG: "\033[96m",
+    logging.INFO: "\033[94m",
+    logging.ERROR: "\033[91m",
+}
+
+_STOP = object()
+
+# Callables receiving each batch's audit records as [(record, fields), ...] on the
+# writer thread (e.g. the activity index); see register_audit_sink()
+_audit_sinks = []
+
+_queue = None
+_queue_handler = None
+_writer = None
+_pid = None
+_dropped = 0
+_sample_counter = 0
+_state_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------
+# _BatchedRotatingFileHandler
+# ---------------------------------------------------------------------
+class _BatchedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler whose per-record flush is a no-op; the writer thread
+    calls flush_batch() once per batch instead. Rotated segments are gzipped in
+    the background (see app/utils/log_archive.py).
+    """
+
+    def __init__(self, filename):
+        super().__init__(filename, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True)
+        self.namer = segment_namer
+        self.rotator = segment_rotator
+
+    def doRollover(self):
+        # Let the previous segment reach its .gz name before the names shift
+        wait_for_compression()
+        super().doRollover()
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+# ---------------------------------------------------------------------
+# _AuditFormatter
+# ---------------------------------------------------------------------
+class _AuditFormatter(logging.Formatter):
+    """
+    One compact JSON object per record. "ts" uses the human log's timestamp
+    format, so both files sort and compare the same way.
+    """
+
+    def format(self, record):
+        entry = {"ts": self.formatTime(record), "level": record.levelname}
+        entry.update(getattr(record, AUDIT_ATTR))
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+# ---------------------------------------------------------------------
+# _OverflowQueueHandler
+# ---------------------------------------------------------------------
+class _OverflowQueueHandler(QueueHandler):
+    """
+    Enqueue without blocking while the queue has room. When it is full, apply
+    LOG_QUEUE_OVERFLOW_POLICY:
+      - "block":      wait for the writer;
+      - "drop-debug": drop DEBUG records, wait for anything else;
+      - "sample":     keep 1 in LOG_QUEUE_SAMPLE_RATE records below WARNING,
+                      wait for WARNING and above.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        # Render message and traceback now (args may change after the call
+        # returns); the root logger has no other handler, so skip the copy.
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{self._exc_formatter.formatException(record.exc_info)}"
+        record.msg, record.args, record.exc_info, record.exc_text = message, None, None, None
+        return record
+
+    def enqueue(self, record):
+        global _dropped, _sample_counter
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        policy = LOG_QUEUE_OVERFLOW_POLICY
+        if policy == "drop-debug" and record.levelno <= logging.DEBUG:
+            _dropped += 1
+            return
+        if policy == "sample" and record.levelno < logging.WARNING:
+            _sample_counter += 1
+            if _sample_counter % LOG_QUEUE_SAMPLE_RATE:
+                _dropped += 1
+                return
+        self.queue.put(record)
+
+
+# ---------------------------------------------------------------------
+# _LogWriter
+# ---------------------------------------------------------------------
+class _LogWriter(threading.Thread):
+    """
+    Drains the queue: blocks for one record, then takes whatever else is queued
+    (up to LOG_BATCH_MAX_RECORDS), writes the batch and flushes each sink once.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(name="grylli-log-writer", daemon=True)
+        self.queue = log_queue
+        self.file_handler = _BatchedRotatingFileHandler(LOG_FILE_PATH)
+        self.file_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        )
+        self.console_time = logging.Formatter(datefmt="%Y-%m-%d %H:%M:%S")
+
+        self.audit_handler = None
+        if AUDIT_LOG_ENABLED:
+            self.audit_handler = _BatchedRotatingFileHandler(AUDIT_LOG_PATH)
+            self.audit_handler.setFormatter(_AuditFormatter())
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < LOG_BATCH_MAX_RECORDS:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._write(batch)
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        global _dropped
+        stop = False
+        stdout_used = stderr_used = False
+
+        records = batch
+        if _dropped:
+            dropped, _dropped = _dropped, 0
+            records = batch + [logging.makeLogRecord({
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Logging queue full: {dropped} record(s) dropped",
+                CONSOLE_ATTR: True,
+            })]
+
+        audited = []
+        for record in records:
+            if record is _STOP:
+                stop = True
+                continue
+            if _audit_sinks and getattr(record, AUDIT_ATTR, None) is not None:
+                audited.append((record, getattr(record, AUDIT_ATTR)))
+            try:
+                self.file_handler.emit(record)
+                if self.audit_handler and getattr(record, AUDIT_ATTR, None) is not None:
+                    self.audit_handler.emit(record)
+                if getattr(record, CONSOLE_ATTR, False):
+                    stream = sys.stderr if record.levelno >= logging.ERROR else sys.stdout
+                    color = CONSOLE_COLORS.get(record.levelno, CONSOLE_COLORS[logging.ERROR])
+                    stream.write(
+                        f"{color}{self.console_time.formatTime(record, self.console_time.datefmt)}"
+                        f" - {record.levelname} - {record.getMessage()}{COLOR_RESET}\n"
+                    )
+                    stdout_used |= stream is sys.stdout
+                    stderr_used |= stream is sys.stderr
+            except Exception:
+                self.file_handler.handleError(record)
+
+        try:
+            self.file_handler.flush_batch()
+            if self.audit_handler:
+                self.audit_handler.flush_batch()
+            if stdout_used:
+                sys.stdout.flush()
+            if stderr_used:
+                sys.stderr.flush()
+        except Exception:
+            pass
+
+        for sink in _audit_sinks if audited else ():
+            try:
+                sink(audited)
+            except Exception as e:
+                sys.stderr.write(f"Audit sink {sink!r} failed: {e}\n")
+        return stop
+
+
+# ---------------------------------------------------------------------
+# _start_pipeline
+# ---------------------------------------------------------------------
+def _start_pipeline():
+    """
+    (Re)create the queue, root QueueHandler and writer thread for this process.
+    """
+    global _queue, _queue_handler, _writer, _pid, _dropped
+    log = logging.getLogger()
+    for handler in [h for h in log.handlers if isinstance(h, _OverflowQueueHandler)]:
+        log.removeHandler(handler)
+
+    _queue = queue.Queue(maxsize=LOG_QUEUE_MAX_SIZE)
+    _queue_handler = _OverflowQueueHandler(_queue)
+    _dropped = 0
+    _writer = _LogWriter(_queue)
+    _writer.start()
+    _pid = os.getpid()
+    log.addHandler(_queue_handler)
+
+
+def _after_fork_in_child():
+    # The parent's writer thread does not exist here; records copied with the
+    # queue were already the parent's to write.
+    if _pid is not None:
+        _start_pipeline()
+
+
+# ---------------------------------------------------------------------
+# configure_file_logging
+# ---------------------------------------------------------------------
 def configure_file_logging():
     log = logging.getLogger()
 
-    # Only configure ONCE per process
+    # Only configure ONCE per process (forked children restart the writer themselves)
     if getattr(log, "_grylli_configured", False):
         return
 
     os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
 
-    handler = RotatingFileHandler(
-        LOG_FILE_PATH,
-        maxBytes=10_000_000,
-        backupCount=7
-    )
-
-    handler.setFormatter(
-        logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    )
-
     log.setLevel(logging.DEBUG)
-    log.addHandler(handler)
     log.propagate = False
+    with _state_lock:
+        _start_pipeline()
+
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+    atexit.register(shutdown_logging)
+
+    # Segments rotated before compression existed, or whose compression was cut short
+    compress_pending_segments(LOG_FILE_PATH)
+    if AUDIT_LOG_ENABLED:
+        compress_pending_segments(AUDIT_LOG_PATH)
 
     # 🔒 Mark as configured
     log._grylli_configured = True
+
+
+# ---------------------------------------------------------------------
+# pipeline_running
+# ---------------------------------------------------------------------
+def pipeline_running():
+    """
+    True once this process's writer thread is up (console output then goes
+    through it rather than straight to stdout/stderr).
+    """
+    return _pid == os.getpid() and _writer is not None and _writer.is_alive()
+
+
+# ---------------------------------------------------------------------
+# register_audit_sink
+# ---------------------------------------------------------------------
+def register_audit_sink(sink):
+    """
+    Have `sink(batch)` called on the writer thread after each batch is written,
+    with the batch's audit records as [(record, fields), ...]. Registering the
+    same sink twice is a no-op.
+    """
+    if sink not in _audit_sinks:
+        _audit_sinks.append(sink)
+
+
+# ---------------------------------------------------------------------
+# submit_record
+# ---------------------------------------------------------------------
+def submit_record(record):
+    """
+    Queue a record from Grylli's own log helpers directly, independent of the
+    root logger's level and handlers (Alembic's fileConfig() resets both when
+    migrations run in-process).
+    """
+    _queue_handler.handle(record)
+
+
+# ---------------------------------------------------------------------
+# flush_logs
+# ---------------------------------------------------------------------
+def flush_logs():
+    """
+    Block until every record queued so far has been written and flushed.
+    """
+    if pipeline_running():
+        _queue.join()
+
+
+# ---------------------------------------------------------------------
+# shutdown_logging
+# ---------------------------------------------------------------------
+def shutdown_logging(timeout=5):
+    """
+    Write out everything still queued and stop the writer (atexit, worker exit).
+    """
+    global _writer
+    if not pipeline_running():
+        return
+    writer, _writer = _writer, None
+    log = logging.getLogger()
+    for handler in [h for h in log.handlers if isinstance(h, _OverflowQueueHandler)]:
+        log.removeHandler(handler)
+    writer.queue.put(_STOP)
+    writer.join(timeout)
+    writer.file_handler.close()
+    if writer.audit_handler:
+        writer.audit_handler.close()
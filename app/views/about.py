@@ -11,7 +11,7 @@
 from flask import Blueprint, render_template, request
 from flask_login import current_user, login_required
 
-from app.utils.logging import log_info_message
+from app.utils.logging import log_user_event
 
 # ---------------------------------------------------------------------
 # Blueprint Configuration
@@ -29,7 +29,7 @@ def show_about():
     """
     Renders the About page with HTMX-aware full and partial support.
     """
-    log_info_message(f"Access - {current_user.username} - About")
+    log_user_event("Access", current_user.username, "About")
 
     template = "about_partial.html" if request.headers.get("HX-Request") else "about_full.html"
     return render_template(template)
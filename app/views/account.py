@@ -48,12 +48,13 @@ from app.models import (
 )
 from app.services.mail import send_email
 from app.services.security_questions import save_security_questions
+from app.utils.admin_presence import invalidate_admin_exists
 from app.utils.logging import (
     log_debug_message,
-    log_error_message,
     log_exception_with_traceback,
     log_info_message,
     log_user_action,
+    log_user_event,
 )
 from app.utils.serialization import model_to_dict
 
@@ -73,7 +74,7 @@ def manage_account():
     - Renders 'account/partials/manage_account.html' if HX-Request.
     - Renders 'account/manage_account_full.html' otherwise.
     """
-    log_info_message(f"Access - {current_user.username} - Account Management")
+    log_user_event("Access", current_user.username, "Account Management")
 
     form = AccountForm(obj=current_user)
 
@@ -144,7 +145,7 @@ def manage_account():
 @login_required
 def translations_info():
     try:
-        log_info_message(f"Access - {current_user.username} - Translations Info")
+        log_user_event("Access", current_user.username, "Translations Info")
 
         context = {
             "github_url": GITHUB_URL,
@@ -178,7 +179,7 @@ def delete_account():
     and redirect to the home page with a success message.
     """
 
-    log_info_message(f"Access - {current_user.username} - Account Delete")
+    log_user_event("Access", current_user.username, "Account Delete")
 
     username = current_user.username
     user_id = current_user.id
@@ -196,6 +197,7 @@ def delete_account():
 
         db.session.delete(current_user)
         db.session.commit()
+        invalidate_admin_exists()
         logout_user()
         flash(_("Your account has been permanently deleted."), "success")
         log_user_action(
@@ -256,7 +258,7 @@ def export_account_data():
     as decrypted JSON for user reference.
     """
 
-    log_info_message(f"Access - {current_user.username} - Account Export")
+    log_user_event("Access", current_user.username, "Account Export")
 
     user_id = current_user.id
 
@@ -400,9 +402,9 @@ def set_security_questions():
     from app.extensions import db
     from app.forms.security_questions_form import SecurityQuestionsForm
     from app.services.security_questions import hash_answer, save_security_questions
-    from app.utils.logging import log_exception_with_traceback, log_info_message
+    from app.utils.logging import log_exception_with_traceback
 
-    log_info_message(f"Access - {current_user.username} - Account Security Questions")
+    log_user_event("Access", current_user.username, "Account Security Questions")
 
     form = SecurityQuestionsForm()
     existing = current_user.security_questions
@@ -469,7 +471,7 @@ def set_security_questions():
 @login_required
 def customization():
     try:
-        log_info_message(f"Access - {current_user.username} - Customization Settings")
+        log_user_event("Access", current_user.username, "Customization Settings")
 
         if "HX-Request" in request.headers:
             return render_template("account/customization_partial.html")
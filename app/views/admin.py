@@ -14,7 +14,8 @@ from flask_login import current_user, login_required
 
 from app.extensions import db
 from app.models import User
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.utils.admin_presence import invalidate_admin_exists
+from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_event
 from app.views.auth import admin_required
 
 bp = Blueprint("admin", __name__)
@@ -32,7 +33,7 @@ def admin_landing():
     Renders full layout for normal requests, partial for HTMX.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Admin Overview")
+        log_user_event("Access", current_user.username, "Admin Overview")
         if request.headers.get("HX-Request"):
             return render_template("admin/index_partial.html")
         return render_template("admin/index_full.html")
@@ -69,6 +70,7 @@ def change_user_role(user_id):
 
         try:
             db.session.commit()
+            invalidate_admin_exists()
             flash(_(f"Role updated for {user.username}."), "success")
             log_info_message(
                 f"Admin '{current_user.username}' changed role for user '{user.username}' "
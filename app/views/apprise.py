@@ -21,12 +21,12 @@ from flask_login import current_user, login_required
 
 from app.forms.apprise_form import AppriseForm
 from app.models import AppriseURL, db
-from app.services.apprise_utils import send_test_apprise_notification
+from app.services.apprise_utils import invalidate_destination, send_test_apprise_notification
 from app.utils.logging import (
     log_debug_message,
     log_exception_with_traceback,
-    log_info_message,
     log_user_action,
+    log_user_event,
 )
 
 bp = Blueprint("apprise_routes", __name__)
@@ -42,7 +42,7 @@ def test_apprise(id):
     Sends a test notification for the specified Apprise destination.
     """
 
-    log_info_message(f"Access - {current_user.username} - Apprise Test")
+    log_user_event("Access", current_user.username, "Apprise Test")
 
     apprise = db.session.execute(db.select(AppriseURL).filter_by(id=id)).scalar_one_or_none()
 
@@ -75,7 +75,7 @@ def create_apprise():
     Handle creation of a new Apprise destination.
     """
 
-    log_info_message(f"Access - {current_user.username} - Apprise Create")
+    log_user_event("Access", current_user.username, "Apprise Create")
 
     form = AppriseForm()
 
@@ -127,7 +127,7 @@ def config():
     Displays the Apprise configuration page with full or partial rendering.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Apprise Config")
+        log_user_event("Access", current_user.username, "Apprise Config")
         apprise_urls = (
             AppriseURL.query.filter_by(user_id=current_user.id)
             .order_by(AppriseURL.created_at.desc())
@@ -157,7 +157,7 @@ def edit_apprise(id):
     Edits an existing Apprise destination.
     """
 
-    log_info_message(f"Access - {current_user.username} - Apprise Edit")
+    log_user_event("Access", current_user.username, "Apprise Edit")
 
     apprise = db.session.execute(
         db.select(AppriseURL).filter_by(id=id, user_id=current_user.id)
@@ -175,6 +175,7 @@ def edit_apprise(id):
             apprise.url = form.url.data.strip()
             apprise.enabled = form.enabled.data
             db.session.commit()
+            invalidate_destination(apprise.id)
             flash(_("Apprise destination updated successfully."), "success")
             log_user_action("Apprise", "Edit", apprise)
 
@@ -213,7 +214,7 @@ def delete_apprise(id):
     Deletes an Apprise destination.
     """
 
-    log_info_message(f"Access - {current_user.username} - Apprise Delete")
+    log_user_event("Access", current_user.username, "Apprise Delete")
 
     apprise = db.session.execute(
         db.select(AppriseURL).filter_by(id=id, user_id=current_user.id)
@@ -226,6 +227,7 @@ def delete_apprise(id):
     try:
         db.session.delete(apprise)
         db.session.commit()
+        invalidate_destination(id)
         log_user_action("Apprise", "Delete", apprise)
         flash(_("Apprise destination deleted."), "success")
     except Exception as e:
@@ -44,7 +44,13 @@ from app.services.security_questions import (
 )
 from app.services.settings import get_setting  # <-- Needed for signup PIN retrieval
 from app.services.system_settings_email import send_email
-from app.utils.logging import log_error_message, log_exception_with_traceback, log_info_message, log_debug_message
+from app.utils.logging import (
+    log_debug_message,
+    log_error_message,
+    log_exception_with_traceback,
+    log_info_message,
+    log_user_event,
+)
 from app.utils.rate_limit import (
     get_delay_seconds,
     get_failure_count,
@@ -103,7 +109,7 @@ def bootstrap():
             )
             db.session.add(new_user)
             db.session.commit()
-            log_info_message(f"Auth - {username} - Bootstrap admin account created")
+            log_user_event("Auth", username, "Bootstrap admin account created")
             flash(_("Admin account created successfully."), "success")
 
             user = User.query.filter_by(username=username).first()
@@ -117,12 +123,12 @@ def bootstrap():
                     flash(
                         _("Your account is temporarily locked. Please try again later."), "danger"
                     )
-                    log_info_message(f"Auth - {username} - Attempted login during active lockout")
+                    log_user_event("Auth", username, "Attempted login during active lockout")
                     return render_template("auth/login.html", form=form)
 
             login_user(user)
             session.permanent = True
-            log_info_message(f"Auth - {user.username} - Logged in")
+            log_user_event("Auth", user.username, "Logged in")
             return redirect(url_for("home.index"))
         except Exception as e:
             db.session.rollback()
@@ -179,7 +185,7 @@ def login():
                 locked_until = locked_until.replace(tzinfo=timezone.utc)
             if locked_until > datetime.now(timezone.utc):
                 flash(_("Your account is temporarily locked. Please try again later."), "danger")
-                log_info_message(f"Auth - {username} - Attempted login during active lockout")
+                log_user_event("Auth", username, "Attempted login during active lockout")
                 # keep next so the template can round-trip it again
                 return render_template("auth/login.html", form=form, next=next_page)
 
@@ -190,7 +196,7 @@ def login():
             # Verify email hash integrity
             expected_hash = hashlib.sha256(user.email.strip().lower().encode()).hexdigest()
             if user.email_integrity_hash != expected_hash:
-                log_info_message(f"Auth - {username} - Email hash mismatch detected")
+                log_user_event("Auth", username, "Email hash mismatch detected")
                 flash(_("Account data integrity issue detected. Please contact support."), "danger")
                 return render_template("auth/login.html", form=form, next=next_page)
 
@@ -214,7 +220,7 @@ If this was not you, please reset your password or contact support immediately.
 - Grylli Team
 """,
                     )
-                    log_info_message(f"Auth - {user.username} - Auto-unlock email sent")
+                    log_user_event("Auth", user.username, "Auto-unlock email sent")
                 except Exception as e:
                     log_exception_with_traceback(f"Auth - {user.username} - Failed to send auto-unlock email", e)
 
@@ -233,7 +239,7 @@ If this was not you, please reset your password or contact support immediately.
             # Normal login
             login_user(user)
             flash(_("Logged in successfully."), "success")
-            log_info_message(f"Auth - {username} - Logged in")
+            log_user_event("Auth", username, "Logged in")
 
             # First try session-stored next (from GET before login), then ?next=, else home
             next_page = session.pop("post_login_next", None) or unquote(request.args.get("next", ""))
@@ -261,12 +267,12 @@ If this was not you, we recommend resetting your password or contacting support.
 - Grylli Team
 """,
                 )
-                log_info_message(f"Auth - {username} - Lockout email sent to {user.email}")
+                log_user_event("Auth", username, f"Lockout email sent to {user.email}")
             except Exception as e:
                 log_exception_with_traceback(f"Auth - {username} - Failed to send lockout email", e)
 
             flash(_("Too many failed login attempts. Your account is locked for 15 minutes."), "danger")
-            log_info_message(f"Auth - {username} - Locked out after {attempts} failed attempts")
+            log_user_event("Auth", username, f"Locked out after {attempts} failed attempts")
             return render_template("auth/login.html", form=form, next=next_page)
 
         # ----------------------------
@@ -274,18 +280,18 @@ If this was not you, we recommend resetting your password or contacting support.
         # ----------------------------
         delay = round(get_delay_seconds(username))
         if delay > 0:
-            log_info_message(f"Auth - {username} - Rate limited with delay {delay}s")
+            log_user_event("Auth", username, f"Rate limited with delay {delay}s")
             return redirect(url_for("auth.rate_limit_delay", username=username))
 
         # ----------------------------
         # 5. Invalid login fallback
         # ----------------------------
         flash(_("Invalid username or password."), "danger")
-        log_info_message(f"Auth - {username} - Failed login attempt")
+        log_user_event("Auth", username, "Failed login attempt")
 
     if request.method == "POST" and form.errors:
         username = (form.username.data or "").strip()
-        log_info_message(f"Auth - {username} - Login form validation error")
+        log_user_event("Auth", username, "Login form validation error")
 
     # Make sure template receives `next` for hidden field
     return render_template("auth/login.html", form=form, next=next_page)
@@ -308,7 +314,7 @@ def logout():
     username = current_user.username  # Save before logout
     logout_user()
     flash(_("You have been logged out."), "success")
-    log_info_message(f"Auth - {username} - Logged out")
+    log_user_event("Auth", username, "Logged out")
     return redirect(url_for("auth.login"))
 
 
@@ -362,8 +368,8 @@ def forgot_username():
                     body=f"Hello,\n\nYour username is: {user.username}\n\n- Grylli Team",
                 )
                 reset_failures(email)
-                log_info_message(
-                    f"Auth - {user.username} - Requested username reminder (sent to {user.email})"
+                log_user_event(
+                    "Auth", user.username, f"Requested username reminder (sent to {user.email})"
                 )
             else:
                 record_failure(email)
@@ -456,7 +462,7 @@ def forgot_password():
     # Rate limit check (based on username)
     delay = get_delay_seconds(user.username)
     if delay > 0:
-        log_info_message(f"RateLimit - {user.username} - Delay {delay}s on security answers")
+        log_user_event("RateLimit", user.username, f"Delay {delay}s on security answers")
 
         return redirect(url_for("auth.rate_limit_delay", username=user.username))
 
@@ -464,7 +470,7 @@ def forgot_password():
     if session["reset_attempts"] > 3:
         record_failure(user.username)
         flash(_("Too many failed attempts. Please try again later."), "danger")
-        log_error_message(f"Auth - {user.username} - Locked out after failed security answers")
+        log_user_event("Auth", user.username, "Locked out after failed security answers", error=True)
         return redirect(url_for("auth.rate_limit_delay", username=user.username))
 
     try:
@@ -485,8 +491,8 @@ def forgot_password():
             )
             reset_failures(user.username)
             flash(_("A password reset link has been sent to your email."), "success")
-            log_info_message(
-                f"Auth - {user.username} - Requested password reset (sent to {user.email})"
+            log_user_event(
+                "Auth", user.username, f"Requested password reset (sent to {user.email})"
             )
 
             session.pop("reset_user_id", None)
@@ -498,7 +504,7 @@ def forgot_password():
         else:
             record_failure(user.username)
             flash(_("One or more answers were incorrect."), "danger")
-            log_info_message(f"Auth - {user.username} - Failed security answers")
+            log_user_event("Auth", user.username, "Failed security answers")
             return render_template(
                 "auth/forgot_password.html",
                 form=form,
@@ -564,7 +570,7 @@ def reset_password(token):
 
             db.session.commit()
 
-            log_info_message(f"Auth - {user.username} - Reset password via token")
+            log_user_event("Auth", user.username, "Reset password via token")
 
             send_email(
                 to=user.email,
@@ -620,7 +626,7 @@ def signup():
             if form.registration_pin.data.strip() != signup_code:
                 record_failure(email_key)
                 flash(_("Invalid registration PIN."), "danger")
-                log_error_message(f"Auth - {email_key} - Invalid registration PIN during signup")
+                log_user_event("Auth", email_key, "Invalid registration PIN during signup", error=True)
                 return render_template("auth/signup.html", form=form)
 
             # Check if username or email already exists
@@ -629,7 +635,7 @@ def signup():
             ).first():
                 record_failure(email_key)
                 flash(_("Username or email already exists."), "danger")
-                log_error_message(f"Auth - {email_key} - Signup failed: username or email exists")
+                log_user_event("Auth", email_key, "Signup failed: username or email exists", error=True)
                 return render_template("auth/signup.html", form=form)
 
             # Create new user (inactive)
@@ -643,7 +649,7 @@ def signup():
             db.session.add(new_user)
             db.session.commit()
 
-            log_info_message(f"Auth - {new_user.username} - Registered via signup")
+            log_user_event("Auth", new_user.username, "Registered via signup")
             reset_failures(email_key)
 
             # Generate activation token
@@ -711,7 +717,7 @@ def activate_account(token):
 
         db.session.commit()
 
-        log_info_message(f"Auth - {user.username} - Activated account")
+        log_user_event("Auth", user.username, "Activated account")
         flash(_("Your account has been activated! You can now log in."), "success")
     except Exception as e:
         db.session.rollback()
@@ -737,7 +743,7 @@ def rate_limit_delay(username):
     else:
         delay = round(get_delay_seconds(username))
 
-    log_info_message(f"Auth - {username} - Rate limit delay: {delay} seconds")
+    log_user_event("Auth", username, f"Rate limit delay: {delay} seconds")
     return render_template("auth/rate_limit.html", delay=delay)
 
 
@@ -757,12 +763,12 @@ def verify_security_question():
             token = generate_password_reset_token(user)
             send_password_reset_email(user.email, token)
             flash(_("Password reset email sent."), "info")
-            log_info_message(
-                f"Auth - {user.username} - Verified security question and sent password reset"
+            log_user_event(
+                "Auth", user.username, "Verified security question and sent password reset"
             )
             return redirect(url_for("auth.login"))
         else:
-            log_info_message(f"Auth - {user.username} - Failed security question verification")
+            log_user_event("Auth", user.username, "Failed security question verification")
             flash(_("Incorrect answer."), "error")
 
     return render_template("auth/verify_security_question.html", form=form)
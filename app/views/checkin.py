@@ -11,7 +11,9 @@ from flask_babel import _
 from flask_login import current_user, login_required
 
 from app.models import EmailMessage, Message, db
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.services.scheduler.scheduler_job import rearm_wakeup
+from app.utils.dashboard import invalidate_due_checkin_count
+from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_event
 from app.utils.security import get_safe_redirect
 
 bp = Blueprint("checkin", __name__)
@@ -86,10 +88,13 @@ def handle_checkin():
         # Proceed with check-in
         record.last_checkin = now
         record.reminder_sent_at = None
+        record.refresh_next_action()
         db.session.commit()
+        rearm_wakeup()
+        invalidate_due_checkin_count(current_user.id)
 
-        log_info_message(
-            f"CheckIn - {current_user.username} - {message_type} | ID={message_id}, label={record.label}, from_ui={from_ui}"
+        log_user_event(
+            "CheckIn", current_user.username, f"{message_type} | ID={message_id}, label={record.label}, from_ui={from_ui}"
         )
         return render_template("checkin/thank_you.html", label=record.label)
 
@@ -182,6 +187,11 @@ def toggle_enabled(type, id):
                     record.occurrences_sent = 0
                 log_info_message(f"User '{current_user.username}' disabled {type} ID={id}.")
                 flash(_("⛔ Disabled."), "info")
+
+            if type == "reminder":
+                record.refresh_next_run()
+            else:
+                record.refresh_next_action()
         else:
             flash(_("⚠️ Cannot toggle — missing schedule or destination."), "warning")
             log_info_message(
@@ -189,6 +199,8 @@ def toggle_enabled(type, id):
             )
 
         db.session.commit()
+        rearm_wakeup()
+        invalidate_due_checkin_count(current_user.id)
 
     except Exception as e:
         log_exception_with_traceback(f"Unhandled error in toggle_enabled({type}, {id})", e)
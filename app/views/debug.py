@@ -9,7 +9,7 @@
 from flask import Blueprint, render_template
 from flask_login import current_user, login_required
 
-from app.utils.logging import log_info_message
+from app.utils.logging import log_user_event
 from app.views.auth import admin_required
 
 bp = Blueprint("debug", __name__)
@@ -19,5 +19,5 @@ bp = Blueprint("debug", __name__)
 @admin_required
 @login_required
 def layout_debug():
-    log_info_message(f"Access - {current_user.username} - Layout Debug Tool")
+    log_user_event("Access", current_user.username, "Layout Debug Tool")
     return render_template("debug/layout_debug.html", current_user=current_user)
@@ -7,7 +7,6 @@
 """
 
 import os
-import subprocess
 from datetime import datetime
 
 from cryptography.fernet import InvalidToken
@@ -30,9 +29,13 @@ from app.forms.email_form import (
     EmailMessageForm,
     UserMailSettingsForm,
 )
+from app.config import UPLOADS_DIR
 from app.forms.message_form import ScheduleForm
 from app.models import EmailFileLink, EmailMessage, UserMailSettings, db
+from app.services.apprise_utils import notify
 from app.services.encryption import decrypt, encrypt
+from app.services.scheduler.scheduler_job import rearm_wakeup
+from app.utils.dashboard import invalidate_due_checkin_count
 from app.utils.duration import load_minutes_into_form_parts, total_minutes_from_form_parts
 from app.utils.file_utils import list_available_files
 from app.utils.logging import (
@@ -40,6 +43,7 @@ from app.utils.logging import (
     log_exception_with_traceback,
     log_info_message,
     log_user_action,
+    log_user_event,
 )
 
 bp = Blueprint("email", __name__)
@@ -55,7 +59,7 @@ def index():
             .order_by(EmailMessage.created_at.desc())
             .all()
         )
-        log_info_message(f"Access - {current_user.username} - Emails")
+        log_user_event("Access", current_user.username, "Emails")
 
         template = (
             "email/list_emails_partial.html"
@@ -216,19 +220,16 @@ def send_test_email(email_id):
 
         apprise_url = f"mailtos://{current_user.email}?smtp={smtp.smtp_host}&user={smtp.smtp_username}&pass={decrypted_password}&secure=starttls"
 
-        cmd = ["apprise", "--title", email.subject, "--body", email.body]
-        for f in email.files:
-            cmd += ["--attach", os.path.join("uploads", f.file_path)]
-        cmd.append(apprise_url)
+        attachments = [os.path.join(UPLOADS_DIR, f.file_path) for f in email.files]
+        ok, reason = notify(apprise_url, email.subject, email.body, attachments=attachments)
 
-        result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-        log_user_action("Email", "Send Test", email, current_user.username)
-        flash(_("Test email sent successfully."), "success")
+        if ok:
+            log_user_action("Email", "Send Test", email, current_user.username)
+            flash(_("Test email sent successfully."), "success")
+        else:
+            flash(_("Email failed: %(reason)s", reason=reason), "danger")
+            log_info_message(f"Test email failed for '{current_user.username}': {reason}")
 
-    except subprocess.CalledProcessError as e:
-        reason = e.stderr or e.stdout or _("Unknown error")
-        flash(_("Email failed: %(reason)s", reason=reason), "danger")
-        log_info_message(f"Test email failed for '{current_user.username}': {reason}")
     except Exception as e:
         flash(_("An unexpected error occurred while sending test email."), "danger")
         log_exception_with_traceback("Unhandled error in send_test_email()", e)
@@ -255,7 +256,10 @@ def schedule_email(email_id):
         if form.validate_on_submit():
             email.checkin_interval_minutes = total_minutes_from_form_parts(form, "checkin")
             email.grace_period_minutes = total_minutes_from_form_parts(form, "grace")
+            email.refresh_next_action()
             db.session.commit()
+            rearm_wakeup()
+            invalidate_due_checkin_count(current_user.id)
             log_user_action(
                 "Email",
                 "Set Schedule",
@@ -10,7 +10,7 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_babel import _
 from flask_login import current_user, login_required
 
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.utils.logging import log_exception_with_traceback, log_user_event
 
 bp = Blueprint("help", __name__)
 
@@ -28,7 +28,7 @@ def show_help():
         str: Rendered HTML for the Help page.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Help")
+        log_user_event("Access", current_user.username, "Help")
 
         template = "help_partial.html" if request.headers.get("HX-Request") else "help_full.html"
         return render_template(template)
@@ -6,7 +6,6 @@
 # ---------------------------------------------------------------------
 """
 
-import os
 from datetime import datetime, timezone, timedelta
 import traceback
 
@@ -23,7 +22,8 @@ from app.models import (
     UserMailSettings,
     Webhook,
 )
-from app.utils.logging import ALLOWED_USER_ACTIONS, log_exception_with_traceback, log_info_message
+from app.services.activity_index import get_activity_page
+from app.utils.logging import log_exception_with_traceback, log_user_event
 from app.utils.duration import format_minutes_as_duration_parts
 
 bp = Blueprint("home", __name__)
@@ -40,7 +40,7 @@ def root_redirect():
 @login_required
 def index():
     try:
-        log_info_message(f"Access - {current_user.username} - Dashboard")
+        log_user_event("Access", current_user.username, "Dashboard")
         stats = get_dashboard_stats()
 
         if request.headers.get("HX-Request"):
@@ -102,7 +102,7 @@ def config_tab():
     or just the Config partial if requested via HTMX.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Dashboard Config")
+        log_user_event("Access", current_user.username, "Dashboard Config")
         stats = get_dashboard_stats()
 
         if request.headers.get("HX-Request"):
@@ -119,7 +119,7 @@ def config_tab():
 def schedule_tab():
     try:
         stats = decorate_schedule_stats(get_dashboard_stats())
-        log_info_message(f"Access - {current_user.username} - Dashboard Schedule")
+        log_user_event("Access", current_user.username, "Dashboard Schedule")
 
         if request.headers.get("HX-Request"):
             return render_template("dashboard/partials/_schedule_partial.html", stats=stats)
@@ -169,83 +169,28 @@ def activity_tab():
     """
     Renders the full dashboard view with the Activity tab active,
     or just the Activity partial if requested via HTMX.
+    ?before=<id> returns the next (older) page of entries.
     """
     try:
-        entries = get_user_activity_log(current_user.username)
-        stats = get_dashboard_stats()
-        log_info_message(f"Access - {current_user.username} - Dashboard Activity")
+        before = request.args.get("before", type=int)
+        entries, next_before = get_activity_page(current_user.username, before_id=before)
+        if before is None:
+            log_user_event("Access", current_user.username, "Dashboard Activity")
 
         if request.headers.get("HX-Request"):
-            return render_template("dashboard/partials/_activity_partial.html", entries=entries)
-
-        return render_template(
-            "dashboard/dashboard_full.html", stats=stats, entries=entries, active_tab="activity"
-        )
+            template = (
+                "dashboard/partials/_activity_rows.html"
+                if before is not None
+                else "dashboard/partials/_activity_partial.html"
+            )
+            return render_template(template, entries=entries, next_before=next_before)
+
+        return render_template("dashboard/dashboard_full.html", active_tab="activity")
     except Exception as e:
         log_exception_with_traceback("Failed to render activity tab", e)
         return "", 204
 
 
-MODULE_NAMES = {
-    "Reminder",
-    "Email",
-    "Notification",
-    "Apprise",
-    "Webhook",
-    "SMTP",
-    "Account",
-}
-
-
-def get_user_activity_log(username, max_lines=500):
-    log_path = current_app.config.get("LOG_FILE_PATH", "logs/grylli.log")
-    if not os.path.exists(log_path):
-        return []
-
-    entries = []
-    quoted = f"{username}"
-
-    with open(log_path, "r", encoding="utf-8") as f:
-        for line in reversed(f.readlines()):
-            if f" - {quoted} - " not in line:
-                continue
-
-            # Try to split 6-part structured logs first
-            parts = line.strip().split(" - ", 5)
-
-            if len(parts) == 6:
-                timestamp, level, category, action, user, message = parts
-                if user != username:
-                    continue
-                if category in MODULE_NAMES and action in ALLOWED_USER_ACTIONS:
-                    label = message.split(" | ", 1)[-1].strip()
-                    entries.append(
-                        {
-                            "timestamp": timestamp.strip(),
-                            "category": category.strip(),
-                            "user": user.strip(),
-                            "message": f"{action} - {label}",
-                        }
-                    )
-            elif len(parts) == 5:
-                timestamp, level, category, user, message = parts
-                if user != username:
-                    continue
-                entries.append(
-                    {
-                        "timestamp": timestamp.strip(),
-                        "category": category.strip(),
-                        "user": user.strip(),
-                        "message": message.strip(),
-                    }
-                )
-
-            if len(entries) >= max_lines:
-                break
-
-    return entries
-
-
 @bp.route("overview/linked_items/", strict_slashes=False)
 @login_required
 def linked_items_tab():
@@ -256,7 +201,7 @@ def linked_items_tab():
     try:
         # Fetch the dashboard stats (linked items and other stats)
         stats = get_dashboard_stats()
-        log_info_message(f"Access - {current_user.username} - Dashboard Linked Items")
+        log_user_event("Access", current_user.username, "Dashboard Linked Items")
 
         if request.headers.get("HX-Request"):
             # Return only the linked items table partial if requested via HTMX
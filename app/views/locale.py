@@ -19,7 +19,7 @@ from flask_babel import _, gettext
 from flask_login import current_user, login_required
 
 from app.utils.locale import get_locale
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_event
 from app.utils.security import get_safe_redirect
 
 bp = Blueprint("locale", __name__)
@@ -90,8 +90,8 @@ def set_language(lang_code):
             secure=current_app.config.get("SESSION_COOKIE_SECURE", False),
             samesite="Lax",
         )
-        log_info_message(
-            f"Access - {current_user.username if current_user.is_authenticated else 'anonymous'} - Locale set to '{lang_code}'"
+        log_user_event(
+            "Access", current_user.username if current_user.is_authenticated else 'anonymous', f"Locale set to '{lang_code}'"
         )
         return resp
     except Exception as e:
@@ -114,7 +114,7 @@ def langcheck():
             abort(403)
 
         lang = get_locale()
-        log_info_message(f"Access - {current_user.username} - Locale Diagnostics")
+        log_user_event("Access", current_user.username, "Locale Diagnostics")
         return jsonify({"manual_locale": lang, "babel_locale": str(gettext("Welcome to Grylli"))})
     except Exception as e:
         log_exception_with_traceback("Failed to check language locale", e)
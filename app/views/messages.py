@@ -6,7 +6,6 @@
 # ---------------------------------------------------------------------
 """
 
-import subprocess
 from datetime import timedelta
 
 import requests
@@ -29,11 +28,16 @@ from flask_wtf import FlaskForm
 from app.extensions import db
 from app.forms.message_form import MessageForm, ScheduleForm
 from app.models import AppriseURL, Message, Webhook
+from app.services.apprise_utils import notify
+from app.services.http_client import post_json
+from app.services.scheduler.scheduler_job import rearm_wakeup
+from app.utils.dashboard import invalidate_due_checkin_count
 from app.utils.logging import (
     log_debug_message,
     log_exception_with_traceback,
     log_info_message,
     log_user_action,
+    log_user_event,
 )
 
 bp = Blueprint("messages_bp", __name__)
@@ -60,7 +64,7 @@ def overview():
             .order_by(Message.created_at.desc())
             .all()
         )
-        log_info_message(f"Access - {current_user.username} - Messages")
+        log_user_event("Access", current_user.username, "Messages")
 
         template = (
             "messages/list_messages_partial.html"
@@ -376,8 +380,11 @@ def schedule_message(message_id):
 
             message.checkin_interval_minutes = checkin_seconds // 60
             message.grace_period_minutes = grace_seconds // 60
+            message.refresh_next_action()
 
             db.session.commit()
+            rearm_wakeup()
+            invalidate_due_checkin_count(current_user.id)
 
             log_user_action(
                 "Message",
@@ -594,22 +601,17 @@ def _send_test_via_apprise_and_webhooks(message, username):
     errors = []
 
     for apprise in message.apprise_destinations:
-        cmd = [
-            "apprise",
-            "--title",
-            message.subject or "Notification",
-            "--body",
-            message.content,
-            apprise.url.strip(),
-        ]
         try:
-            subprocess.run(cmd, capture_output=True, check=True, text=True)
+            ok, error_msg = notify(apprise.url, message.subject or "Notification", message.content)
+        except Exception as exc:
+            ok, error_msg = False, str(exc)
+
+        if ok:
             log_info_message(
                 f"User '{username}' sent Apprise test for message ID={message.id} via '{apprise.label}'."
             )
-        except subprocess.CalledProcessError as exc:
+        else:
             success = False
-            error_msg = exc.stderr or exc.stdout or "Unknown error"
             errors.append(f"Apprise ({apprise.label}): {error_msg}")
             log_info_message(
                 f"User '{username}' failed Apprise test for message ID={message.id} via '{apprise.label}': {error_msg}"
@@ -617,9 +619,9 @@ def _send_test_via_apprise_and_webhooks(message, username):
 
     for hook in message.webhooks:
         try:
-            response = requests.post(
+            response = post_json(
                 hook.endpoint.strip(),
-                json={"subject": message.subject, "content": message.content},
+                {"subject": message.subject, "content": message.content},
                 timeout=10,
             )
 
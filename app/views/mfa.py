@@ -29,7 +29,12 @@ from app.extensions import db
 from app.forms.mfa_form import MFAChallengeForm, MFASettingsForm
 from app.models import User
 from app.services.encryption import decrypt, encrypt
-from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_action
+from app.utils.logging import (
+    log_exception_with_traceback,
+    log_info_message,
+    log_user_action,
+    log_user_event,
+)
 
 bp = Blueprint("mfa", __name__, url_prefix="/mfa")
 
@@ -119,7 +124,7 @@ def mfa_settings():
 
     if request.method == "GET":
         form.enabled.data = initial_enabled
-        log_info_message(f"Access - {current_user.username} - MFA Settings")
+        log_user_event("Access", current_user.username, "MFA Settings")
 
     template = (
         "mfa/settings_partial.html"
@@ -157,7 +162,7 @@ def show_recovery_codes():
 
     try:
         codes = json.loads(decrypt(current_user.mfa_recovery_codes))
-        log_info_message(f"Access - {current_user.username} - MFA Recovery Codes")
+        log_user_event("Access", current_user.username, "MFA Recovery Codes")
         log_user_action("Account", "View", "Viewed MFA recovery codes")
     except Exception as exc:
         log_exception_with_traceback(
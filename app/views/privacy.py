@@ -8,7 +8,7 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_babel import _
 from flask_login import current_user, login_required
 
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.utils.logging import log_exception_with_traceback, log_user_event
 
 bp = Blueprint("privacy", __name__)
 
@@ -26,7 +26,7 @@ def show_privacy():
         str: Rendered HTML for the Privacy Notice page.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Privacy Notice")
+        log_user_event("Access", current_user.username, "Privacy Notice")
         template = (
             "privacy_partial.html" if request.headers.get("HX-Request") else "privacy_full.html"
         )
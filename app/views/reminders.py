@@ -5,7 +5,6 @@
 # ---------------------------------------------------------------------
 
 import os
-import subprocess
 from datetime import datetime, timedelta, timezone
 
 from flask import (
@@ -23,17 +22,20 @@ from flask_babel import _
 from flask_login import current_user, login_required
 from flask_wtf import FlaskForm
 
+from app.config import UPLOADS_DIR
 from app.extensions import db
 from app.forms.reminder_form import EmailReminderLinkForm, ReminderForm, ScheduleReminderForm
 from app.models import AppriseURL, EmailMessage, Reminder, UserMailSettings, Webhook
-from app.services.apprise_utils import send_test_apprise_notification
+from app.services.apprise_utils import notify, send_test_apprise_notification
 from app.services.mail import send_email
+from app.services.scheduler.scheduler_job import rearm_wakeup
 from app.services.webhook import send_test_webhook_notification
 from app.utils.logging import (
     log_debug_message,
     log_exception_with_traceback,
     log_info_message,
     log_user_action,
+    log_user_event,
 )
 
 bp = Blueprint("reminders_bp", __name__)
@@ -57,7 +59,7 @@ def overview():
             .all()
         )
         now = datetime.now()
-        log_info_message(f"Access - {current_user.username} - Reminders")
+        log_user_event("Access", current_user.username, "Reminders")
         log_debug_message(f"Loaded {len(reminders)} reminders for {current_user.username}")
 
         template = (
@@ -79,7 +81,7 @@ def overview():
 @bp.route("create/", methods=["GET", "POST"], strict_slashes=False)
 @login_required
 def create_reminder():
-    log_info_message(f"Access - {current_user.username} - Create Reminder")
+    log_user_event("Access", current_user.username, "Create Reminder")
 
     form = ReminderForm()
     try:
@@ -132,7 +134,7 @@ def create_reminder():
 @bp.route("<int:reminder_id>/edit/", methods=["GET", "POST"], strict_slashes=False)
 @login_required
 def edit_reminder(reminder_id):
-    log_info_message(f"Access - {current_user.username} - Edit Reminder")
+    log_user_event("Access", current_user.username, "Edit Reminder")
 
     try:
         reminder = db.session.get(Reminder, reminder_id)
@@ -181,7 +183,7 @@ def edit_reminder(reminder_id):
 @bp.route("<int:reminder_id>/delete/", methods=["POST"], strict_slashes=False)
 @login_required
 def delete_reminder(reminder_id):
-    log_info_message(f"Access - {current_user.username} - Delete Reminder")
+    log_user_event("Access", current_user.username, "Delete Reminder")
 
     try:
         reminder = db.session.get(Reminder, reminder_id)
@@ -209,7 +211,7 @@ def delete_reminder(reminder_id):
 @bp.route("<int:reminder_id>/destinations/", methods=["GET", "POST"], strict_slashes=False)
 @login_required
 def assign_destinations(reminder_id):
-    log_info_message(f"Access - {current_user.username} - Assign Destinations")
+    log_user_event("Access", current_user.username, "Assign Destinations")
 
     try:
         reminder = db.session.get(Reminder, reminder_id)
@@ -283,7 +285,7 @@ def assign_destinations(reminder_id):
 @bp.route("<int:reminder_id>/send-test", methods=["POST"], strict_slashes=False)
 @login_required
 def send_test_reminder(reminder_id):
-    log_info_message(f"Access - {current_user.username} - Send Test Reminder")
+    log_user_event("Access", current_user.username, "Send Test Reminder")
 
     try:
         reminder = Reminder.query.filter_by(id=reminder_id, user_id=current_user.id).first_or_404()
@@ -330,26 +332,17 @@ def send_test_reminder(reminder_id):
                     f"&secure=starttls"
                 )
 
-                cmd = [
-                    "apprise",
-                    "--title",
-                    "[TEST] " + email_msg.subject,
-                    "--body",
-                    email_msg.body,
-                ]
-                for f in email_msg.files:
-                    cmd += ["--attach", os.path.join("uploads", f.file_path)]
-
-                cmd.append(apprise_url)
-                subprocess.run(cmd, capture_output=True, check=True, text=True)
-
-            except subprocess.CalledProcessError as e:
-                error_msg = e.stderr or e.stdout or "Unknown error"
-                errors.append(f"SMTP ({smtp.label}): {error_msg}")
-                log_info_message(
-                    f"User '{current_user.username}' failed SMTP Apprise test for reminder ID={reminder.id} via '{smtp.label}': {error_msg}"
+                attachments = [os.path.join(UPLOADS_DIR, f.file_path) for f in email_msg.files]
+                ok, error_msg = notify(
+                    apprise_url, "[TEST] " + email_msg.subject, email_msg.body, attachments=attachments
                 )
-                success = False
+                if not ok:
+                    errors.append(f"SMTP ({smtp.label}): {error_msg}")
+                    log_info_message(
+                        f"User '{current_user.username}' failed SMTP Apprise test for reminder ID={reminder.id} via '{smtp.label}': {error_msg}"
+                    )
+                    success = False
+
             except Exception as e:
                 errors.append(f"SMTP ({smtp.label}): {str(e)}")
                 log_info_message(
@@ -379,7 +372,7 @@ def send_test_reminder(reminder_id):
 @bp.route("view/<int:reminder_id>", strict_slashes=False)
 @login_required
 def view_reminder(reminder_id):
-    log_info_message(f"Access - {current_user.username} - View Reminder")
+    log_user_event("Access", current_user.username, "View Reminder")
 
     try:
         reminder = db.session.get(Reminder, reminder_id)
@@ -408,7 +401,7 @@ def view_reminder(reminder_id):
 @bp.route("<int:reminder_id>/schedule/", methods=["GET", "POST"], strict_slashes=False)
 @login_required
 def schedule_reminder(reminder_id):
-    log_info_message(f"Access - {current_user.username} - Schedule Reminder")
+    log_user_event("Access", current_user.username, "Schedule Reminder")
 
     try:
         reminder = db.session.get(Reminder, reminder_id)
@@ -422,7 +415,9 @@ def schedule_reminder(reminder_id):
             reminder.recurrence_rule = form.recurrence_rule.data
             reminder.end_at = form.end_at.data
             reminder.max_occurrences = form.max_occurrences.data
+            reminder.refresh_next_run()
             db.session.commit()
+            rearm_wakeup()
             log_user_action("Reminder", "Set Schedule", reminder)
             flash(_("Reminder schedule updated successfully."), "success")
 
@@ -455,7 +450,7 @@ def schedule_reminder(reminder_id):
 @bp.route("<int:reminder_id>/email/", methods=["GET", "POST"], strict_slashes=False)
 @login_required
 def assign_email_to_reminder(reminder_id):
-    log_info_message(f"Access - {current_user.username} - Assign Email to Reminder")
+    log_user_event("Access", current_user.username, "Assign Email to Reminder")
 
     try:
         reminder = db.session.get(Reminder, reminder_id)
@@ -552,7 +547,7 @@ def reminder_status():
     only the reminder ID and whether the reminder is enabled or not.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Reminder Status JSON")
+        log_user_event("Access", current_user.username, "Reminder Status JSON")
 
         reminders = Reminder.query.filter_by(user_id=current_user.id).all()
         log_debug_message(f"Returning reminder status JSON with {len(reminders)} reminders")
@@ -4,17 +4,21 @@
 # Admin reports view (tabbed layout for user account and scheduler info)
 # ---------------------------------------------------------------------
 
+import json
 import os
 from datetime import datetime
 
-from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
+from flask import Blueprint, Response, flash, redirect, render_template, request, stream_with_context, url_for
 from flask_babel import _
 from flask_login import current_user, login_required
 
 from app.extensions import db
 from app.models import User
-from app.config import LOG_FILE_PATH, UI_LOG_LINE_LIMIT
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.config import LOG_FILE_PATH, LOG_STREAM_HEARTBEAT_SECONDS, SCHEDULER_TREND_DAYS, UI_LOG_LINE_LIMIT
+from app.services.scheduler.run_ledger import get_job_trends, get_run_events, get_run_page
+from app.utils.log_reader import tail_log_entries
+from app.utils.log_tail import LogStreamBusy, subscribe, unsubscribe
+from app.utils.logging import log_exception_with_traceback, log_user_event
 from app.views.auth import admin_required
 
 bp = Blueprint("reports", __name__)
@@ -27,7 +31,7 @@ LOG_PATH = LOG_FILE_PATH
 @login_required
 def reports_full():
     try:
-        log_info_message(f"Access - {current_user.username} - User Reports")
+        log_user_event("Access", current_user.username, "User Reports")
         active_tab = request.args.get("tab", "accounts")
 
         if request.headers.get("HX-Request"):
@@ -89,17 +93,31 @@ def report_accounts_full():
 @admin_required
 @login_required
 def report_scheduler_full():
+    """
+    Scheduler Activity tab: per-job daily trends and a paginated run ledger.
+    ?job=<id> filters the runs; ?before=<run id> returns the next (older) page.
+    """
     try:
-        log_info_message(f"Access - {current_user.username} - Scheduler Activity Report")
+        job_id = request.args.get("job", "").strip() or None
+        before = request.args.get("before", type=int)
 
-        logs = get_scheduler_logs()
-        max_entries = current_app.config["SCHEDULER_LOG_DISPLAY_LIMIT"]
-
-        # If HTMX request, return just the tab content
         if request.headers.get("HX-Request"):
+            runs, next_before = get_run_page(job_id=job_id, before_id=before)
+            if before is not None:
+                return render_template(
+                    "admin/reports/report_scheduler_rows.html",
+                    runs=runs, next_before=next_before, job_id=job_id,
+                )
+
+            log_user_event("Access", current_user.username, "Scheduler Activity Report")
+            trends = get_job_trends()
             return render_template("admin/reports/report_scheduler_partial.html",
-                                   logs=logs,
-                                   max_entries=max_entries)
+                                   runs=runs,
+                                   next_before=next_before,
+                                   job_id=job_id,
+                                   job_ids=sorted({row["job_id"] for row in trends} | ({job_id} if job_id else set())),
+                                   trends=trends,
+                                   trend_days=SCHEDULER_TREND_DAYS)
 
         # Otherwise return the full page with correct tab active
         return render_template("admin/reports/reports_full.html", active_tab="scheduler")
@@ -108,42 +126,19 @@ def report_scheduler_full():
         log_exception_with_traceback("Failed to load scheduler report tab", e)
         return "", 204
 
-def get_scheduler_logs():
-    """
-    Extracts scheduler activity lines from the grylli log file.
-    Format:
-    TIMESTAMP - LEVEL - Scheduler [Job] - Status - Detail
-    """
-    import os
-
-    log_path = os.path.join(os.getcwd(), "data", "grylli.log")
-    logs = []
-    max_entries = current_app.config.get("SCHEDULER_LOG_DISPLAY_LIMIT", 350)
 
+# Route to display one run's events (HTMX row expansion)
+@bp.route("/scheduler/runs/<int:run_id>/", strict_slashes=False)
+@admin_required
+@login_required
+def report_scheduler_run_events(run_id):
     try:
-        if os.path.exists(log_path):
-            with open(log_path, "r", encoding="utf-8") as file:
-                for line in file:
-                    if "Scheduler [" in line and " - " in line:
-                        parts = line.strip().split(" - ", 4)
-                        if len(parts) != 5:
-                            continue  # Skip malformed lines
-
-                        logs.append({
-                            "timestamp": parts[0].strip(),
-                            "level": parts[1].strip(),
-                            "job_name": parts[2].strip(),
-                            "status": parts[3].strip(),
-                            "detail": parts[4].strip(),
-                        })
-
-        # Sort by timestamp descending and cap
-        return list(reversed(logs))[:max_entries]
-
+        return render_template(
+            "admin/reports/report_scheduler_events.html", run_id=run_id, events=get_run_events(run_id)
+        )
     except Exception as e:
-        from app.utils.logging import log_exception_with_traceback
-        log_exception_with_traceback("Error reading scheduler logs", e)
-        return []
+        log_exception_with_traceback("Failed to load scheduler run events", e)
+        return "", 204
 
 
 @bp.route("/logs/", strict_slashes=False)
@@ -153,7 +148,7 @@ def report_logs_full():
     """
     Displays the Application Logs tab under Admin Reports.
     """
-    log_info_message(f"Access - {current_user.username} - Logs")
+    log_user_event("Access", current_user.username, "Logs")
 
     level_filter = request.args.get("level", "").strip().upper()
     text_filter = request.args.get("text", "").strip().lower()
@@ -167,39 +162,10 @@ def report_logs_full():
         except ValueError:
             pass
 
-    log_entries = []
-    log_path = LOG_FILE_PATH
-
     try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            for raw_line in reversed(f.readlines()):
-                line = raw_line.strip()
-
-                if not line[:4].isdigit() or " - " not in line or line.count(" - ") < 2:
-                    continue
-
-                parts = line.split(" - ", 2)
-                if len(parts) < 3:
-                    continue
-
-                timestamp, level, message = parts
-                if level_filter and level.upper() != level_filter:
-                    continue
-                if text_filter and text_filter not in message.lower():
-                    continue
-                if after_dt:
-                    try:
-                        log_time = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S,%f")
-                        if log_time < after_dt:
-                            continue
-                    except Exception as e:
-                        from app.utils.logging import log_exception_with_traceback
-                        log_exception_with_traceback("Skipping log entry due to timestamp parse failure", e)
-                        continue
-
-                log_entries.append((timestamp, level, message))
-                if len(log_entries) >= UI_LOG_LINE_LIMIT * 2:
-                    break
+        log_entries = tail_log_entries(
+            UI_LOG_LINE_LIMIT * 2, level=level_filter, text=text_filter, after=after_dt
+        )
 
         reverse = False
         if sort_key.startswith("-"):
@@ -229,3 +195,45 @@ def report_logs_full():
             "admin/reports/reports_full.html",
             active_tab="logs"
         )
+
+
+@bp.route("/logs/stream/", strict_slashes=False)
+@login_required
+@admin_required
+def report_logs_stream():
+    """
+    Server-Sent Events feed of new log entries matching ?level= and ?text=
+    (same filters as the Logs tab). Sends "lines" events (JSON list of
+    [timestamp, level, message]), a "dropped" event when this viewer fell
+    behind, and a comment as keep-alive. 503 when the viewer cap is reached.
+    """
+    level_filter = request.args.get("level", "").strip().upper() or None
+    text_filter = request.args.get("text", "").strip().lower() or None
+
+    try:
+        subscription = subscribe(level=level_filter, text=text_filter)
+    except LogStreamBusy:
+        return "", 503
+
+    log_user_event("Access", current_user.username, "Live Logs")
+
+    def events():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                batch = subscription.next_batch(LOG_STREAM_HEARTBEAT_SECONDS)
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield f"event: dropped\ndata: {dropped}\n\n"
+                if batch:
+                    yield f"event: lines\ndata: {json.dumps(batch, ensure_ascii=False)}\n\n"
+                elif not dropped:
+                    yield ": keep-alive\n\n"
+        finally:
+            unsubscribe(subscription)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -15,7 +15,7 @@ import app.config as project_config
 from app.models import SystemConfig
 from app.services.encryption import decrypt
 from app.services.system_settings_email import send_email
-from app.utils.logging import log_info_message, log_exception_with_traceback
+from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_event
 from app.views.auth import admin_required
 
 bp = Blueprint("settings_bp", __name__, url_prefix="/admin/settings")
@@ -30,7 +30,7 @@ def settings_index():
     """
     tab = request.args.get("tab", "system")
     try:
-        log_info_message(f"Access - {current_user.username} - Admin Settings (tab={tab})")
+        log_user_event("Access", current_user.username, f"Admin Settings (tab={tab})")
 
         if request.headers.get("HX-Request"):
             return render_template("admin/settings/settings_tabs.html", active_tab=tab)
@@ -51,7 +51,7 @@ def system_tab():
     Serves the System tab content — returns either the full tab layout or partial only for HTMX.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Settings Tab - System")
+        log_user_event("Access", current_user.username, "Settings Tab - System")
 
         EXCLUDED_KEYS = {"FERRET_KEY"}
         keys = [
@@ -98,7 +98,7 @@ def smtp_tab():
     Serves the SMTP tab content — returns either the full tab layout or partial only for HTMX.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - Settings Tab - SMTP")
+        log_user_event("Access", current_user.username, "Settings Tab - SMTP")
 
         settings = SystemConfig.query.order_by(SystemConfig.key).all()
 
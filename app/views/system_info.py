@@ -19,6 +19,7 @@ from app.utils.logging import (
     log_debug_message,
     log_exception_with_traceback,
     log_info_message,
+    log_user_event,
 )
 
 bp = Blueprint("system_info", __name__)
@@ -73,7 +74,7 @@ def index():
     Renders a full or partial template based on HTMX headers.
     """
     try:
-        log_info_message(f"Access - {current_user.username} - System Info")
+        log_user_event("Access", current_user.username, "System Info")
 
         stack = {
             "Python": platform.python_version(),
@@ -18,7 +18,7 @@ from flask import (
 from flask_babel import _
 from flask_login import current_user, login_required
 
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_event
 from app.services.scheduler.backup_utils import get_backup_files
 from werkzeug.utils import secure_filename
 from app.views.auth import admin_required
@@ -41,7 +41,7 @@ TEST_HOOKS = {
 @login_required
 def tools_full():
     try:
-        log_info_message(f"Access - {current_user.username} - Tools")
+        log_user_event("Access", current_user.username, "Tools")
         active_tab = request.args.get("tab", "backups")
 
         if request.headers.get("HX-Request"):
@@ -89,7 +89,7 @@ def create_backup_view():
 @login_required
 def tools_backups():
     try:
-        log_info_message(f"Access - {current_user.username} - Tools > Backups")
+        log_user_event("Access", current_user.username, "Tools > Backups")
         backups = TEST_HOOKS["override_backups"] or get_backup_files()
 
         if request.headers.get("HX-Request"):
@@ -109,7 +109,7 @@ def tools_backups():
 @login_required
 def tools_tasks():
     try:
-        log_info_message(f"Access - {current_user.username} - Tools > Tasks")
+        log_user_event("Access", current_user.username, "Tools > Tasks")
 
         if request.headers.get("HX-Request"):
             return render_template("admin/tools/tools_tasks_partial.html")
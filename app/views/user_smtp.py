@@ -11,7 +11,8 @@ from flask_login import current_user, login_required
 from app.forms.user_smtp_form import SmtpForm
 from app.models import UserMailSettings, db
 from app.services.encryption import encrypt
-from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_action
+from app.services.smtp.pool import close_connections
+from app.utils.logging import log_exception_with_traceback, log_user_action, log_user_event
 
 bp = Blueprint("user_smtp", __name__, url_prefix="/email")
 
@@ -24,7 +25,7 @@ bp = Blueprint("user_smtp", __name__, url_prefix="/email")
 def overview():
     try:
         smtp_list = UserMailSettings.query.filter_by(user_id=current_user.id).all()
-        log_info_message(f"Access - {current_user.username} - User SMTP Configs")
+        log_user_event("Access", current_user.username, "User SMTP Configs")
         template = (
             "user_smtp/list_smtp_partial.html"
             if request.headers.get("HX-Request")
@@ -102,6 +103,7 @@ def edit(smtp_id):
             form = SmtpForm(obj=smtp)
 
         if form.validate_on_submit():
+            account = (smtp.smtp_host, smtp.smtp_port, smtp.smtp_username)
             form.populate_obj(smtp)
 
             # Only update password if non-empty input is provided
@@ -109,6 +111,7 @@ def edit(smtp_id):
                 smtp.smtp_password = form.smtp_password.data.strip()
 
             db.session.commit()
+            close_connections(*account)
             log_user_action("SMTP", "Edit", current_user, smtp.id, smtp.label)
             flash(_("SMTP destination updated."), "success")
 
@@ -141,6 +144,7 @@ def delete(smtp_id):
         smtp = UserMailSettings.query.filter_by(id=smtp_id, user_id=current_user.id).first_or_404()
         db.session.delete(smtp)
         db.session.commit()
+        close_connections(smtp.smtp_host, smtp.smtp_port, smtp.smtp_username)
         log_user_action("SMTP", "Delete", current_user, smtp.id, smtp.label)
         flash(_("SMTP destination deleted."), "info")
     except Exception as e:
@@ -16,7 +16,8 @@ from werkzeug.security import generate_password_hash
 from app.forms.create_user_form import CreateUserForm
 from app.forms.edit_user_form import EditUserForm
 from app.models import User, db
-from app.utils.logging import log_exception_with_traceback, log_info_message
+from app.utils.admin_presence import invalidate_admin_exists
+from app.utils.logging import log_exception_with_traceback, log_info_message, log_user_event
 from app.views.auth import admin_required
 from app.services.system_settings_email import send_email
 
@@ -45,7 +46,7 @@ def list_users():
             User.locked_until,
         ).all()
         roles = ["user", "admin"]
-        log_info_message(f"Access - {current_user.username} - User List")
+        log_user_event("Access", current_user.username, "User List")
 
         template = (
             "admin/list_users_partial.html"
@@ -209,6 +210,7 @@ def delete_user(user_id):
     try:
         from app.models import (
             AppriseURL,
+            DeliveryOutbox,
             EmailMessage,
             Message,
             UserMailSettings,
@@ -250,8 +252,10 @@ def delete_user(user_id):
         for email in EmailMessage.query.filter_by(user_id=user_id).all():
             db.session.delete(email)
         UserMailSettings.query.filter_by(user_id=user_id).delete()
+        DeliveryOutbox.query.filter_by(user_id=user_id).delete()
         db.session.delete(user)
         db.session.commit()
+        invalidate_admin_exists()
 
         flash(_("User deleted."), "success")
         log_info_message(
@@ -303,7 +307,7 @@ If this was unexpected, please contact support.
 - Grylli Team
 """,
             )
-            log_info_message(f"Users - {user.username} - {state.capitalize()} email sent")
+            log_user_event("Users", user.username, f"{state.capitalize()} email sent")
         except Exception as e:
             log_exception_with_traceback(f"Users - {user.username} - Failed to send {state} email", e)
 
@@ -361,7 +365,7 @@ If you did not request this, please contact support immediately.
 - Grylli Team
 """,
             )
-            log_info_message(f"Users - {user.username} - MFA reset email notification sent")
+            log_user_event("Users", user.username, "MFA reset email notification sent")
         except Exception as e:
             log_exception_with_traceback(f"Users - {user.username} - Failed to send MFA reset email", e)
 
@@ -398,6 +402,7 @@ def change_role(user_id):
     try:
         user.role = new_role
         db.session.commit()
+        invalidate_admin_exists()
 
         try:
             send_email(
@@ -456,7 +461,7 @@ If this was unexpected, please contact support.
 - Grylli Team
 """,
             )
-            log_info_message(f"Users - {user.username} - Unlock email sent")
+            log_user_event("Users", user.username, "Unlock email sent")
         except Exception as e:
             log_exception_with_traceback(f"Users - {user.username} - Failed to send unlock email", e)
 
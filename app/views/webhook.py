@@ -24,8 +24,8 @@ from app.models import Webhook, db
 from app.utils.logging import (
     log_debug_message,
     log_exception_with_traceback,
-    log_info_message,
     log_user_action,
+    log_user_event,
 )
 
 bp = Blueprint("webhook", __name__)
@@ -35,7 +35,7 @@ bp = Blueprint("webhook", __name__)
 @login_required
 def create_webhook():
 
-    log_info_message(f"Access - {current_user.username} - Webhook Create")
+    log_user_event("Access", current_user.username, "Webhook Create")
 
     form = WebhookForm()
 
@@ -46,6 +46,7 @@ def create_webhook():
                 endpoint=form.endpoint.data.strip(),
                 description=form.description.data.strip(),
                 enabled=form.enabled.data,
+                batch_mode=form.batch_mode.data,
                 user_id=current_user.id,
                 created_at=datetime.now(timezone.utc),
             )
@@ -82,7 +83,7 @@ def create_webhook():
 @login_required
 def config():
     try:
-        log_info_message(f"Access - {current_user.username} - Webhook Config")
+        log_user_event("Access", current_user.username, "Webhook Config")
         webhooks = (
             Webhook.query.filter_by(user_id=current_user.id)
             .order_by(Webhook.created_at.desc())
@@ -106,7 +107,7 @@ def config():
 @login_required
 def edit_webhook(id):
     try:
-        log_info_message(f"Access - {current_user.username} - Webhook Edit")
+        log_user_event("Access", current_user.username, "Webhook Edit")
         webhook = db.session.get(Webhook, id)
         if webhook is None:
             log_debug_message(f"Webhook edit failed: ID={id} not found")
@@ -120,6 +121,7 @@ def edit_webhook(id):
                 webhook.endpoint = form.endpoint.data.strip()
                 webhook.description = form.description.data.strip()
                 webhook.enabled = form.enabled.data
+                webhook.batch_mode = form.batch_mode.data
                 db.session.commit()
                 flash(_("Webhook updated successfully."), "success")
                 log_user_action("Webhook", "Edit", webhook)
@@ -158,7 +160,7 @@ def edit_webhook(id):
 @bp.route("delete/<int:id>", methods=["POST"], strict_slashes=False)
 @login_required
 def delete_webhook(id):
-    log_info_message(f"Access - {current_user.username} - Webhook Delete")
+    log_user_event("Access", current_user.username, "Webhook Delete")
     webhook = db.session.get(Webhook, id)
     if webhook is None:
         log_debug_message(f"Webhook delete failed: ID={id} not found")
@@ -181,7 +183,7 @@ def delete_webhook(id):
 @login_required
 def test_webhook(id):
 
-    log_info_message(f"Access - {current_user.username} - Webhook Test")
+    log_user_event("Access", current_user.username, "Webhook Test")
 
     from app.services.webhook import send_test_webhook_notification
 
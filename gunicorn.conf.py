@@ -6,11 +6,10 @@ Gunicorn configuration for Grylli
 # pylint: disable=invalid-name, import-outside-toplevel
 
 import os
-import logging
-from logging.handlers import RotatingFileHandler
-from app.config import LOG_FILE_PATH
+from app.config import GUNICORN_THREADS, LOG_FILE_PATH
 from app.utils.banner import print_banner_and_github
 from app.utils.logging import log_step, log_info_message
+from app.utils.setup_logging import configure_file_logging, shutdown_logging
 
 # Ensure log directory exists
 os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
@@ -25,6 +24,10 @@ ERRORLOG = "-"
 CAPTURE_OUTPUT = True
 preload_app = True
 WORKERS = 1
+# Threads per worker (gthread), shared by every request. Live log viewers each hold
+# one for as long as they watch; app/config.py caps them so that
+# LOG_STREAM_RESERVED_THREADS always stay free.
+THREADS = GUNICORN_THREADS
 
 bind = BIND
 reload = RELOAD
@@ -33,6 +36,7 @@ accesslog = ACCESSLOG
 errorlog = ERRORLOG
 capture_output = CAPTURE_OUTPUT
 workers = WORKERS
+threads = THREADS
 
 def when_ready(_server):
     """
@@ -45,19 +49,11 @@ def when_ready(_server):
 
 def post_fork(_server, _worker):
     """
-    Attach file logger and start scheduler after worker fork.
+    Start scheduler after worker fork. The log writer thread restarts itself in
+    the child (see app/utils/setup_logging.py); this is a no-op if it already has.
     """
     print("✅ post_fork reached")  # TEMP: confirm this executes
-    file_handler = RotatingFileHandler(LOG_FILE_PATH, maxBytes=10_000_000, backupCount=7)
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    ))
-
-    root_logger = logging.getLogger()
-    if not any(isinstance(h, RotatingFileHandler) for h in root_logger.handlers):
-        root_logger.addHandler(file_handler)
-        root_logger.propagate = False
+    configure_file_logging()
 
     from app import create_app
     from app.services.scheduler.scheduler_job import start_scheduler
@@ -65,3 +61,9 @@ def post_fork(_server, _worker):
     app = create_app()
     start_scheduler(app)
     log_info_message("✅ APScheduler started in post_fork")
+
+def worker_exit(_server, _worker):
+    """
+    Write out queued log records before the worker process exits.
+    """
+    shutdown_logging()
@@ -0,0 +1,31 @@
+"""Add (user_id, next_action_at) indexes to messages and email_messages
+
+Revision ID: 3c9a6e2f8b15
+Revises: d41b7c9e3f06
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a6e2f8b15'
+down_revision = 'd41b7c9e3f06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.create_index('ix_messages_user_id_next_action_at', ['user_id', 'next_action_at'], unique=False)
+
+    with op.batch_alter_table('email_messages', schema=None) as batch_op:
+        batch_op.create_index('ix_email_messages_user_id_next_action_at', ['user_id', 'next_action_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('email_messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_email_messages_user_id_next_action_at')
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_messages_user_id_next_action_at')
@@ -0,0 +1,27 @@
+"""Add updated_at to apprise_urls
+
+Revision ID: 5f2a8c6e1d47
+Revises: e4b9d17c3a60
+Create Date: 2026-10-18 11:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f2a8c6e1d47'
+down_revision = 'e4b9d17c3a60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows stay NULL; created_at stands in as their version until the first edit.
+    with op.batch_alter_table('apprise_urls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('apprise_urls', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
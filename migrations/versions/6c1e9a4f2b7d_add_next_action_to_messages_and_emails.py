@@ -0,0 +1,41 @@
+"""Add next_action_at and next_action_phase to messages and email_messages
+
+Revision ID: 6c1e9a4f2b7d
+Revises: 3d5b2fad735d
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1e9a4f2b7d'
+down_revision = '3d5b2fad735d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are left NULL; the scheduler backfills enabled items on its first tick.
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_action_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('next_action_phase', sa.String(length=16), nullable=True))
+        batch_op.create_index(batch_op.f('ix_messages_next_action_at'), ['next_action_at'], unique=False)
+
+    with op.batch_alter_table('email_messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_action_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('next_action_phase', sa.String(length=16), nullable=True))
+        batch_op.create_index(batch_op.f('ix_email_messages_next_action_at'), ['next_action_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('email_messages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_email_messages_next_action_at'))
+        batch_op.drop_column('next_action_phase')
+        batch_op.drop_column('next_action_at')
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_messages_next_action_at'))
+        batch_op.drop_column('next_action_phase')
+        batch_op.drop_column('next_action_at')
@@ -0,0 +1,29 @@
+"""Add settings_version table
+
+Revision ID: 7b3e5d9a2c14
+Revises: 5f2a8c6e1d47
+Create Date: 2026-10-18 13:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e5d9a2c14'
+down_revision = '5f2a8c6e1d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    settings_version = op.create_table('settings_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(settings_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade():
+    op.drop_table('settings_version')
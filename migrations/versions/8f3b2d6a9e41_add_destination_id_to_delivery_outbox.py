@@ -0,0 +1,26 @@
+"""Add destination_id to delivery_outbox
+
+Revision ID: 8f3b2d6a9e41
+Revises: 3c9a6e2f8b15
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3b2d6a9e41'
+down_revision = '3c9a6e2f8b15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('delivery_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('destination_id', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('delivery_outbox', schema=None) as batch_op:
+        batch_op.drop_column('destination_id')
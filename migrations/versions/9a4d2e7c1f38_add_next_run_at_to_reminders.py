@@ -0,0 +1,29 @@
+"""Add next_run_at to reminders
+
+Revision ID: 9a4d2e7c1f38
+Revises: 6c1e9a4f2b7d
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d2e7c1f38'
+down_revision = '6c1e9a4f2b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are left NULL; the scheduler backfills enabled reminders on its first run.
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index(batch_op.f('ix_reminders_next_run_at'), ['next_run_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reminders_next_run_at'))
+        batch_op.drop_column('next_run_at')
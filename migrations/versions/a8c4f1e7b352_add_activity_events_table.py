@@ -0,0 +1,39 @@
+"""Add activity_events table
+
+Revision ID: a8c4f1e7b352
+Revises: 7b3e5d9a2c14
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c4f1e7b352'
+down_revision = '7b3e5d9a2c14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('activity_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=150), nullable=False),
+    sa.Column('category', sa.String(length=32), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('level', sa.String(length=8), nullable=False),
+    sa.Column('logged_at', sa.String(length=23), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('activity_events', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_events_username_id', ['username', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_activity_events_logged_at'), ['logged_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('activity_events', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_activity_events_logged_at'))
+        batch_op.drop_index('ix_activity_events_username_id')
+
+    op.drop_table('activity_events')
@@ -0,0 +1,51 @@
+"""Add delivery_outbox table
+
+Revision ID: c7e3b18a5d92
+Revises: 9a4d2e7c1f38
+Create Date: 2026-10-18 10:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3b18a5d92'
+down_revision = '9a4d2e7c1f38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('delivery_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('source_type', sa.String(length=16), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=True),
+    sa.Column('source_label', sa.String(length=100), nullable=True),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('destination_label', sa.String(length=100), nullable=True),
+    # Host only (per-host cap); URLs and credentials stay in the encrypted payload
+    sa.Column('target', sa.String(length=255), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('delivery_outbox', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_delivery_outbox_user_id'), ['user_id'], unique=False)
+        batch_op.create_index('ix_delivery_outbox_status_next_attempt', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('delivery_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_delivery_outbox_status_next_attempt')
+        batch_op.drop_index(batch_op.f('ix_delivery_outbox_user_id'))
+
+    op.drop_table('delivery_outbox')
@@ -0,0 +1,61 @@
+"""Add scheduler_runs and scheduler_events tables
+
+Revision ID: d41b7c9e3f06
+Revises: a8c4f1e7b352
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41b7c9e3f06'
+down_revision = 'a8c4f1e7b352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scheduler_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('duration_ms', sa.Integer(), nullable=False),
+    sa.Column('items_scanned', sa.Integer(), nullable=False),
+    sa.Column('items_acted', sa.Integer(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('scheduler_runs', schema=None) as batch_op:
+        batch_op.create_index('ix_scheduler_runs_job_id_id', ['job_id', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_scheduler_runs_started_at'), ['started_at'], unique=False)
+
+    op.create_table('scheduler_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('item_type', sa.String(length=16), nullable=True),
+    sa.Column('item_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=32), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('detail', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['scheduler_runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('scheduler_events', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scheduler_events_run_id'), ['run_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('scheduler_events', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scheduler_events_run_id'))
+
+    op.drop_table('scheduler_events')
+    with op.batch_alter_table('scheduler_runs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scheduler_runs_started_at'))
+        batch_op.drop_index('ix_scheduler_runs_job_id_id')
+
+    op.drop_table('scheduler_runs')
@@ -0,0 +1,26 @@
+"""Add batch_mode to webhooks
+
+Revision ID: e4b9d17c3a60
+Revises: c7e3b18a5d92
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9d17c3a60'
+down_revision = 'c7e3b18a5d92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('webhooks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('batch_mode', sa.Boolean(), nullable=False, server_default=sa.text('0')))
+
+
+def downgrade():
+    with op.batch_alter_table('webhooks', schema=None) as batch_op:
+        batch_op.drop_column('batch_mode')
@@ -0,0 +1,145 @@
+# ---------------------------------------------------------------------
+# check_apprise_key_rotation.py
+# Queues an Apprise delivery, rotates FERRET_KEY with the re-encryption pass,
+# removes the old key and drains the outbox against a local JSON sink. Each
+# step runs in its own process (the keys are read at import time) on a
+# throwaway database. Exits non-zero on failure.
+#
+#   python scripts/check_apprise_key_rotation.py
+# ---------------------------------------------------------------------
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from cryptography.fernet import Fernet
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Add app path if needed for relative import
+sys.path.append(PROJECT_ROOT)
+
+
+# ---------------------------------------------------------------------
+# Steps (run in child processes)
+# ---------------------------------------------------------------------
+def build_app():
+    """Minimal app on the throwaway database (no scheduler, no migrations)."""
+    from flask import Flask
+
+    from app import config
+    from app.extensions import db
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = config.SQLALCHEMY_DATABASE_URI
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    return app
+
+
+def step_enqueue():
+    from app.extensions import db
+    from app.models import AppriseURL, Message, User
+    from app.services.scheduler.apprise_utils import prepare_apprise_deliveries
+    from app.services.scheduler.outbox import enqueue_deliveries
+
+    with build_app().app_context():
+        db.create_all()
+        user = User(username="rotation", email="rotation@example.com", password_hash="-", role="user")
+        db.session.add(user)
+        db.session.flush()
+
+        destination = AppriseURL(label="sink", user_id=user.id, enabled=True)
+        destination.url = f"json://127.0.0.1:{os.environ['SINK_PORT']}/hook"
+        message = Message(user_id=user.id, label="rotation check", subject="Key rotation", content="Queued before")
+        message.apprise_destinations.append(destination)
+        db.session.add_all([destination, message])
+        db.session.flush()
+
+        queued = enqueue_deliveries(prepare_apprise_deliveries(message), "message", message)
+        db.session.commit()
+    return 0 if queued == 1 else 1
+
+
+def step_rotate():
+    from app.services.scheduler.reencrypt import reencrypt_batch, reencrypt_failures
+
+    with build_app().app_context():
+        while not reencrypt_batch(throttle=0):
+            pass
+        return 1 if reencrypt_failures() else 0
+
+
+def step_drain():
+    from app.extensions import db
+    from app.models import DeliveryOutbox
+    from app.services.scheduler.outbox import drain_delivery_outbox
+
+    received = []
+
+    class Sink(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", int(os.environ["SINK_PORT"])), Sink)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with build_app().app_context():
+        drain_delivery_outbox()
+        row = db.session.query(DeliveryOutbox).one()
+        print(f"outbox row: status={row.status} attempts={row.attempts} error={row.last_error}")
+    server.shutdown()
+    return 0 if row.status == "sent" and len(received) == 1 else 1
+
+
+STEPS = {"enqueue": step_enqueue, "rotate": step_rotate, "drain": step_drain}
+
+
+# ---------------------------------------------------------------------
+# Main Script Logic
+# ---------------------------------------------------------------------
+def main():
+    old_key, new_key = Fernet.generate_key().decode(), Fernet.generate_key().decode()
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(
+            os.environ,
+            GRYLLI_DATA_DIR=data_dir,
+            GRYLLI_DB_PATH=os.path.join(data_dir, "grylli.db"),
+            GRYLLI_LOG_FILE=os.path.join(data_dir, "grylli.log"),
+            FQDN=os.environ.get("FQDN", "http://localhost:5069"),
+            SINK_PORT=str(port),
+        )
+        plan = [
+            ("enqueue under the old key", "enqueue", {"FERRET_KEY": old_key, "FERRET_KEYS_PREVIOUS": ""}),
+            ("re-encrypt under the new key", "rotate", {"FERRET_KEY": new_key, "FERRET_KEYS_PREVIOUS": old_key}),
+            ("drain with the old key removed", "drain", {"FERRET_KEY": new_key, "FERRET_KEYS_PREVIOUS": ""}),
+        ]
+        for name, step, keys in plan:
+            result = subprocess.run(
+                [sys.executable, __file__, step], env={**env, **keys}, capture_output=True, text=True
+            )
+            status = "PASS" if result.returncode == 0 else "FAIL"
+            print(f"{status} - {name}")
+            if result.returncode != 0:
+                print(result.stdout[-2000:] + result.stderr[-2000:])
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(STEPS[sys.argv[1]]())
+    sys.exit(main())
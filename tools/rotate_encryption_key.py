@@ -0,0 +1,116 @@
+"""
+tools/rotate_encryption_key.py
+Path: rotate_encryption_key.py (relative to project root)
+Utility script to re-encrypt every stored secret under the current FERRET_KEY.
+
+Key rotation procedure:
+  1. Generate a new key and set it as FERRET_KEY.
+  2. Move the old key to FERRET_KEYS_PREVIOUS (comma-separated if several).
+  3. Restart Grylli. Old values stay readable; the scheduler's re-encryption
+     job starts rewriting them in small batches, or run this script to finish
+     the pass in one go (it resumes from the same checkpoint as the job). The
+     server may keep running: the script takes the checkpoint lock (waiting
+     for a batch in progress to end) and the job skips its runs until the
+     script exits. The lock file lives next to the checkpoint, so run the
+     script with the server's GRYLLI_DATA_DIR (inside its container).
+  4. When this script reports completion without failures, remove
+     FERRET_KEYS_PREVIOUS. Values it could not re-encrypt are listed; fix the
+     key set and run it again to retry only those.
+"""
+
+# ======================
+# Standard Library Imports
+# ======================
+import os
+import sys
+import time
+
+# ======================
+# Third-Party Imports
+# ======================
+from flask import Flask
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# pylint: disable=wrong-import-position
+from app import config
+from app.extensions import db
+from app.services.encryption import FERRET_KEYS_PREVIOUS
+from app.services.scheduler.reencrypt import (
+    checkpoint_lock,
+    reencrypt_batch,
+    reencrypt_failures,
+    reencrypt_pending,
+    reencrypt_progress,
+)
+
+
+# ---------------------------------------------------------------------
+# Utility Functions
+# ---------------------------------------------------------------------
+def build_app():
+    """
+    Minimal app bound to the Grylli database. create_app() is avoided on purpose:
+    it would start the scheduler, whose own re-encryption job would compete
+    with this script.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = config.SQLALCHEMY_DATABASE_URI
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    return app
+
+
+# ---------------------------------------------------------------------
+# Main Script Logic
+# ---------------------------------------------------------------------
+def main():
+    """
+    Run re-encryption batches until every column has been scanned.
+
+    Returns:
+        int: Exit code, 1 when some values could not be re-encrypted.
+    """
+    if not FERRET_KEYS_PREVIOUS:
+        print("FERRET_KEYS_PREVIOUS is empty: values are only upgraded to the current cipher format.")
+
+    app = build_app()
+    with app.app_context(), checkpoint_lock():
+        if not reencrypt_pending():
+            print("Nothing to do: a pass has already completed under the current key set.")
+            return 0
+
+        started = time.monotonic()
+        while not reencrypt_batch(
+            batch_size=config.REENCRYPT_BATCH_SIZE,
+            throttle=config.REENCRYPT_THROTTLE_SECONDS,
+        ):
+            progress = ", ".join(f"{column}={row_id}" for column, row_id in sorted(reencrypt_progress().items()))
+            print(f"Progress: {progress}")
+        failures = reencrypt_failures()
+
+    print(f"Re-encryption pass finished in {time.monotonic() - started:.1f}s.")
+    if failures:
+        print("These values could not be re-encrypted (see the error log for details):")
+        for column, row_ids in sorted(failures.items()):
+            print(f"  {column}: id {', '.join(str(row_id) for row_id in row_ids)}")
+        print("Do NOT remove FERRET_KEYS_PREVIOUS yet. Fix the key set and run this script again.")
+        return 1
+
+    if FERRET_KEYS_PREVIOUS:
+        print("Every value now uses the current key. You can remove FERRET_KEYS_PREVIOUS.")
+    return 0
+
+
+# ---------------------------------------------------------------------
+# Script Entrypoint
+# ---------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\nInterrupted. Progress is checkpointed; run the script again to resume.")
+        sys.exit(130)